@@ -0,0 +1,5 @@
+"""Benchmarks of NeuroTS that can be run with airspeed velocity (asv)."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
@@ -0,0 +1,102 @@
+"""Benchmarks of the growth of astrocytes."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=attribute-defined-outside-init
+import numpy as np
+
+from neurots import AstrocyteGrower
+
+from .common import ASTROCYTE_DATA
+from .common import load_json
+from .common import quiet
+
+PARAMETERS = {
+    "basal_dendrite": {
+        "metric": "path_distances",
+        "randomness": 0.0,
+        "targeting": 0.2,
+        "orientation": None,
+        "growth_method": "tmd_space_colonization",
+        "branching_method": "bio_oriented",
+        "modify": None,
+        "tree_type": 3,
+        "step_size": {"norm": {"mean": 1.0, "std": 0.2}},
+        "modify_target": None,
+        "barcode_scaling": False,
+    },
+    "axon": {
+        "metric": "path_distances",
+        "randomness": 0.0,
+        "targeting": 0.2,
+        "target_ids": [0, 1],
+        "growth_method": "tmd_space_colonization_target",
+        "branching_method": "bio_oriented",
+        "modify": None,
+        "tree_type": 2,
+        "step_size": {"norm": {"mean": 1.0, "std": 0.2}},
+        "modify_target": None,
+        "barcode_scaling": False,
+        "bias": 0.9,
+    },
+    "origin": [0.0, 0.0, 0.0],
+    "grow_types": ["basal_dendrite", "axon"],
+    "diameter_params": {
+        "method": "uniform",
+        "basal_dendrite": 0.6,
+        "axon": 0.6,
+    },
+}
+
+
+# Number of points and radius (in um) of the domain of the astrocyte
+POINT_CLOUDS = {
+    "2000_points": (2000, 40),
+    "10000_points": (10000, 60),
+}
+
+
+def _point_cloud(n_points, radius, seed=0):
+    """Draw points uniformly in a ball centered on the origin."""
+    rng = np.random.default_rng(seed)
+    points = rng.normal(size=(n_points, 3))
+    points /= np.linalg.norm(points, axis=1)[:, np.newaxis]
+    return points * radius * rng.uniform(size=(n_points, 1)) ** (1.0 / 3.0)
+
+
+class AstrocyteGrowerSuite:
+    """Benchmarks of :class:`neurots.astrocyte.grower.AstrocyteGrower`."""
+
+    params = list(POINT_CLOUDS)
+    param_names = ["point_cloud"]
+    # The growth consumes the grower, so a new one is created by setup() for each sample
+    number = 1
+    repeat = 3
+    warmup_time = 0
+    timeout = 300
+
+    def setup(self, point_cloud):
+        """Create a grower with a point cloud."""
+        quiet()
+        context = {
+            "field": {"type": "logit", "slope": 0.11832134, "intercept": 0.36720545},
+            "collision_handle": lambda *args: False,
+            "space_colonization": {
+                "point_cloud": _point_cloud(*POINT_CLOUDS[point_cloud]),
+                "kill_distance_factor": 15.0,
+                "influence_distance_factor": 25.0,
+            },
+            "endfeet_targets": [[20.0, 20.0, 20.0], [-30.0, 0.0, 30.0]],
+        }
+        self.grower = AstrocyteGrower(
+            PARAMETERS,
+            load_json(ASTROCYTE_DATA / "bio_path_distribution.json"),
+            context,
+            rng_or_seed=0,
+        )
+
+    def time_grow(self, _):
+        """Grow an astrocyte."""
+        self.grower.grow()
@@ -0,0 +1,64 @@
+"""Benchmarks of the barcodes used by the TMD growth algorithms."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=attribute-defined-outside-init
+import copy
+
+import numpy as np
+
+from neurots.generate.algorithms.barcode import Barcode
+
+from .common import TEST_DATA
+from .common import load_json
+
+
+def _consume(barcode):
+    """Query and remove all the bars of a barcode as the growth algorithms do."""
+    max_term = barcode.get_persistence_length()
+    while barcode.bifs:
+        bif_id, bif = barcode.min_bif()
+        barcode.get_term_between(bif_id, bif, max_term)
+        barcode.select_compatible_bif(bif, max_term, 0, max_term)
+        barcode.remove_bif(bif_id)
+    while barcode.terms:
+        term_id, _ = barcode.min_term()
+        barcode.get_term(term_id)
+        barcode.max_term()
+        barcode.remove_term(term_id)
+
+
+class BarcodeSuite:
+    """Benchmarks of :class:`neurots.generate.algorithms.barcode.Barcode`."""
+
+    params = ["basal_dendrite", "apical_dendrite"]
+    param_names = ["neurite_type"]
+    # The queries consume the barcodes, so new ones are created by setup() for each sample
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup(self, neurite_type):
+        """Load the persistence diagrams and build the barcodes."""
+        distributions = load_json(TEST_DATA / "bio_rat_L5_TPC_B_distribution.json")
+        self.ph_angles = [
+            [list(tmd_bar) for tmd_bar in diagram]
+            for diagram in distributions[neurite_type]["persistence_diagram"]
+        ]
+        self.barcodes = [Barcode(copy.deepcopy(diagram)) for diagram in self.ph_angles]
+
+    def time_init(self, _):
+        """Build the barcodes."""
+        for diagram in self.ph_angles:
+            Barcode(list(diagram))
+
+    def time_queries(self, _):
+        """Query and consume the barcodes."""
+        for barcode in self.barcodes:
+            _consume(barcode)
+
+    def track_n_bars(self, _):
+        """Number of bars in the barcodes."""
+        return int(np.sum([len(diagram) for diagram in self.ph_angles]))
@@ -0,0 +1,27 @@
+"""Helpers shared by the benchmarks."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+TEST_DATA = ROOT / "tests" / "data"
+BIO_DATA = ROOT / "test_data" / "bio"
+ASTROCYTE_DATA = ROOT / "tests" / "astrocyte" / "data"
+
+
+def load_json(path):
+    """Load a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def quiet():
+    """Ignore the warnings and the log messages emitted during the benchmarks."""
+    warnings.simplefilter("ignore")
+    logging.getLogger("neurots").setLevel(logging.ERROR)
@@ -0,0 +1,51 @@
+"""Benchmarks of the internal diametrizers."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=attribute-defined-outside-init
+import numpy as np
+from morphio.mut import Morphology
+from neurom import load_morphologies
+
+from neurots.extract_input.from_diameter import model
+from neurots.generate import diametrizer
+
+from .common import BIO_DATA
+from .common import TEST_DATA
+from .common import quiet
+
+MORPHOLOGY = TEST_DATA / "expected_bio_rat_L5_TPC_B_with_params1.h5"
+
+
+class DiametrizerSuite:
+    """Benchmarks of :func:`neurots.generate.diametrizer.build`."""
+
+    params = list(diametrizer.diam_methods)
+    param_names = ["method"]
+    # The morphology is updated in place, so a new one is loaded by setup() for each sample
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup_cache(self):
+        """Compute the diameter model of a population of reconstructed morphologies."""
+        return model(load_morphologies(BIO_DATA))
+
+    def setup(self, diameter_model, _):
+        """Load the morphology to diametrize."""
+        quiet()
+        self.model = diameter_model
+        self.neuron = Morphology(MORPHOLOGY)
+
+    def time_build(self, _, method):
+        """Diametrize the basal and apical dendrites of a morphology."""
+        diametrizer.build(
+            self.neuron,
+            self.model,
+            neurite_types=["basal_dendrite", "apical_dendrite"],
+            diam_method=method,
+            diam_params={"basal_dendrite": 0.6, "apical_dendrite": 0.6},
+            random_generator=np.random.default_rng(0),
+        )
@@ -0,0 +1,34 @@
+"""Benchmarks of the extraction of the input distributions."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from neurots import extract_input
+
+from .common import BIO_DATA
+from .common import quiet
+
+
+class ExtractInputSuite:
+    """Benchmarks of :func:`neurots.extract_input.distributions`."""
+
+    params = ["radial_distances", "path_distances", "trunk_length"]
+    param_names = ["feature"]
+    repeat = 5
+
+    def setup(self, _):
+        """Silence the warnings."""
+        quiet()
+
+    def time_distributions(self, feature):
+        """Extract the distributions from a population."""
+        extract_input.distributions(BIO_DATA, feature=feature)
+
+
+def time_distributions_diameter_model():
+    """Extract the distributions and the diameter model from a population."""
+    extract_input.distributions(BIO_DATA, diameter_input_morph=BIO_DATA, diameter_model="M5")
+
+
+time_distributions_diameter_model.setup = quiet
@@ -0,0 +1,79 @@
+"""Benchmarks of the growth of neurons."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=attribute-defined-outside-init
+from neurots import NeuronGrower
+from neurots import PreparedInputs
+from neurots.morphmath.sample import SAMPLING_MODES
+
+from .common import TEST_DATA
+from .common import load_json
+from .common import quiet
+
+INPUTS = {
+    "bio_path": ("bio_path_distribution.json", "bio_path_params.json"),
+    "L5_TPC_params1": ("bio_rat_L5_TPC_B_distribution.json", "params1.json"),
+    "L5_TPC_params2": ("bio_rat_L5_TPC_B_distribution.json", "params2.json"),
+    "L5_TPC_params3": ("bio_rat_L5_TPC_B_distribution.json", "params3.json"),
+    "L5_TPC_params4": ("bio_rat_L5_TPC_B_distribution.json", "params4.json"),
+}
+
+
+class NeuronGrowerSuite:
+    """Benchmarks of :class:`neurots.generate.grower.NeuronGrower`."""
+
+    params = [list(INPUTS), list(SAMPLING_MODES)]
+    param_names = ["inputs", "sampling"]
+    # The growth consumes the grower, so a new one is created by setup() for each sample
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def setup(self, inputs, sampling):
+        """Load the inputs and create a grower."""
+        quiet()
+        distributions, parameters = INPUTS[inputs]
+        self.distributions = load_json(TEST_DATA / distributions)
+        self.parameters = load_json(TEST_DATA / parameters)
+        self.prepared = PreparedInputs(self.parameters, self.distributions)
+        self.grower = NeuronGrower(self.prepared, rng_or_seed=0, sampling=sampling)
+
+    def time_init(self, *_):
+        """Load and preprocess the inputs and initialize a grower."""
+        NeuronGrower(self.parameters, self.distributions, rng_or_seed=0)
+
+    def time_grow(self, *_):
+        """Grow a neuron."""
+        self.grower.grow()
+
+    def peakmem_grow(self, *_):
+        """Grow a neuron."""
+        self.grower.grow()
+
+
+class TreeGrowerSuite:
+    """Benchmarks of the loop calling :meth:`neurots.generate.tree.TreeGrower.next_point`."""
+
+    params = list(INPUTS)
+    param_names = ["inputs"]
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def setup(self, inputs):
+        """Create a grower and its trunks."""
+        quiet()
+        distributions, parameters = INPUTS[inputs]
+        self.grower = NeuronGrower(
+            load_json(TEST_DATA / parameters), load_json(TEST_DATA / distributions), rng_or_seed=0
+        )
+        self.grower._grow_soma()  # pylint: disable=protected-access
+
+    def time_next_point(self, _):
+        """Grow all the trees of a neuron."""
+        for tree in self.grower.active_neurites:
+            while not tree.end():
+                tree.next_point()
@@ -0,0 +1,82 @@
+"""Benchmarks of the growth of the sections."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=attribute-defined-outside-init
+import numpy as np
+
+from neurots import NeuronGrower
+from neurots import PreparedInputs
+from neurots.generate.algorithms.common import TMDStop
+from neurots.generate.section import SectionGrowerPath
+from neurots.generate.tree import SectionParameters
+from neurots.morphmath.sample import Distr
+
+from .common import TEST_DATA
+from .common import load_json
+from .common import quiet
+
+N_STEPS = 10000
+
+
+class SectionStopSuite:
+    """Benchmarks of the stop criteria checked at each step of a section."""
+
+    params = [False, True]
+    param_names = ["analytic_stop"]
+
+    def setup(self, analytic_stop):
+        """Create a section whose criteria are never reached."""
+        rng = np.random.default_rng(0)
+        params = SectionParameters(
+            randomness=0.0,
+            targeting=1.0,
+            scale_prob=1.0,
+            history=0.0,
+            analytic_stop=analytic_stop,
+        )
+        self.section = SectionGrowerPath(
+            None,
+            None,
+            [0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            params,
+            "major",
+            {"TMD": TMDStop(1, 1e9, 0, 2e9, 0.0)},
+            Distr({"norm": {"mean": 1.0, "std": 0.2}}, random_generator=rng),
+            0.0,
+            random_generator=rng,
+        )
+        self.section.first_point()
+
+    def time_check_stop(self, _):
+        """Check the stop criteria of a section at each step."""
+        for step in range(N_STEPS):
+            self.section.pathlength = float(step)
+            self.section.check_stop()
+
+
+class StopModeSuite:
+    """Benchmarks of the growth of neurons with the stop criteria checked in each mode."""
+
+    params = [False, True]
+    param_names = ["analytic_stop"]
+    # The growth consumes the grower, so a new one is created by setup() for each sample
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup(self, analytic_stop):
+        """Create a grower."""
+        quiet()
+        prepared = PreparedInputs(
+            load_json(TEST_DATA / "bio_path_params.json"),
+            load_json(TEST_DATA / "bio_path_distribution.json"),
+        )
+        self.grower = NeuronGrower(prepared, rng_or_seed=0, analytic_stop=analytic_stop)
+
+    def time_grow(self, _):
+        """Grow a neuron."""
+        self.grower.grow()
@@ -0,0 +1,46 @@
+# noqa
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Synthesize a population of neurons in parallel
+==============================================
+
+This example shows how to synthesize a population of cells with the same parameters for all of
+them, using a pool of worker processes. The cells are written in batches into a single HDF5
+container instead of one file per cell.
+"""
+
+from pathlib import Path
+
+import neurots
+from neurots.population import ContainerWriter
+from neurots.population import write_population
+
+
+def run(output_dir, data_dir):
+    """Run the example for generating a population of cells in parallel."""
+    num_cells = 10
+
+    # The inputs are preprocessed once and the cells are lazily grown by 2 worker processes
+    cells = neurots.synthesize_population(
+        input_distributions=data_dir / "bio_distr.json",
+        input_parameters=data_dir / "bio_params.json",
+        n_cells=num_cells,
+        workers=2,
+        seed=0,
+    )
+
+    # Export the synthesized cells into a container from a background thread, they can then be
+    # loaded with morphio.Collection(output_dir / "generated_cells.h5").load("generated_cell_0")
+    with ContainerWriter(output_dir / "generated_cells.h5", batch_size=5) as writer:
+        write_population(cells, writer, name_format="generated_cell_{}", max_queue_size=4)
+
+
+if __name__ == "__main__":
+    result_dir = Path("results_population")
+    result_dir.mkdir(parents=True, exist_ok=True)
+
+    run(result_dir, Path("data"))
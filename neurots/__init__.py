@@ -11,6 +11,8 @@ import importlib.metadata
 
 from neurots.astrocyte.grower import AstrocyteGrower  # noqa
 from neurots.generate.grower import NeuronGrower  # noqa
+from neurots.generate.grower import PreparedInputs  # noqa
+from neurots.population import synthesize_population  # noqa
 from neurots.utils import NeuroTSError  # noqa
 
 __version__ = importlib.metadata.version("NeuroTS")
@@ -90,6 +90,9 @@ class AstrocyteGrower(NeuronGrower):
         skip_preprocessing=True,
         external_diametrizer=None,
         rng_or_seed=np.random,
+        collect_stats=False,
+        sampling="exact",
+        analytic_stop=False,
     ):
         super().__init__(
             input_parameters,
@@ -98,6 +101,9 @@ class AstrocyteGrower(NeuronGrower):
             external_diametrizer=external_diametrizer,
             skip_preprocessing=skip_preprocessing,
             rng_or_seed=rng_or_seed,
+            collect_stats=collect_stats,
+            sampling=sampling,
+            analytic_stop=analytic_stop,
         )
 
     def validate_params(self):
@@ -108,6 +114,7 @@ class AstrocyteGrower(NeuronGrower):
 
     def _post_grow(self):
         """After the cell has grown ensure that endfeet targets have been reached."""
+        super()._post_grow()
         endfeet_targets = self.context.endfeet_targets
         if endfeet_targets is not None and np.any(endfeet_targets.active):
             _ensure_endfeet_are_reached(self.neuron, self.context.endfeet_targets)
@@ -117,13 +124,16 @@ class AstrocyteGrower(NeuronGrower):
         tree_direction = self.soma_grower.soma.orientation_from_point(initial_soma_point)
 
         obj = TreeGrowerSpaceColonization(
-            self.neuron,
+            self._builder,
             initial_direction=tree_direction,
             initial_point=initial_soma_point,
             parameters=parameters,
             distributions=distributions,
             context=self.context,
             random_generator=self._rng,
+            sampling=self.sampling,
+            analytic_stop=self.analytic_stop,
+            barcode_templates=self._barcode_templates,
         )
 
         self.active_neurites.append(obj)
@@ -11,7 +11,6 @@ import numpy as np
 
 from neurots.generate.section import SectionGrowerPath
 from neurots.morphmath.utils import from_to_direction
-from neurots.morphmath.utils import get_random_point
 from neurots.morphmath.utils import in_squared_proximity
 from neurots.morphmath.utils import normalize_inplace
 
@@ -116,7 +115,7 @@ class SectionSpatialGrower(SectionGrowerPath):
             is added in the active list. It guarantees at least two point sections.
         """
         new_direction = normalize_inplace(0.8 * self.direction + 0.2 * self.history())
-        segment_length = self.step_size_distribution.draw_positive()
+        segment_length = self.draw_step_size()
         new_point = self.last_point + segment_length * new_direction
         self._add_new_data(new_point, new_direction, segment_length)
 
@@ -133,7 +132,7 @@ class SectionSpatialGrower(SectionGrowerPath):
         if pcloud_direction is not None:
             return pcloud_direction
 
-        return get_random_point(random_generator=self._rng)
+        return self.random_direction()
 
     def next_direction(self, current_point):
         """Return the next direction.
@@ -162,7 +161,7 @@ class SectionSpatialGrower(SectionGrowerPath):
         In addition, if the section type is endfoot, grow all points until
         the endfoot target and return None, to terminate.
         """
-        segment_length = self.step_size_distribution.draw_positive()
+        segment_length = self.draw_step_size()
 
         new_direction = self.next_direction(current_point)
         new_point = current_point + segment_length * new_direction
@@ -190,6 +189,10 @@ class SectionSpatialGrower(SectionGrowerPath):
             self.morphology_points.append(p)
             self.point_cloud.remove_points_around(p, segment_length)
 
+    def next_chunk(self):
+        """Creates one point, the next points depending on the updated point cloud."""
+        return self.next()
+
     def next(self):
         """Creates one point and returns the next state: bifurcate, terminate or continue."""
         if not self._next_point(self.last_point):
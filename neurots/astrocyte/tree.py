@@ -4,7 +4,6 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import copy
 
 from neurots.astrocyte.section import SectionSpatialGrower
 from neurots.astrocyte.space_colonization import SpaceColonization
@@ -35,6 +34,7 @@ class TreeGrowerSpaceColonization(TreeGrower):
             start_point=self.point,
             context=self.context,
             random_generator=self._rng,
+            barcode_templates=self.barcode_templates,
         )
 
         stop, num_sec = growth_algo.initialize()
@@ -43,7 +43,7 @@ class TreeGrowerSpaceColonization(TreeGrower):
             parent=None,
             direction=self.direction,
             first_point=self.point,
-            stop=copy.deepcopy(stop),
+            stop=stop,
             process="major",
             pathlength=0.0,
             children=2 if num_sec > 1 else 0,
@@ -70,12 +70,13 @@ class TreeGrowerSpaceColonization(TreeGrower):
             direction=direction,
             parameters=self._section_parameters,
             process=process,
-            stop_criteria=copy.deepcopy(stop),
+            stop_criteria=dict(stop),
             step_size_distribution=self.seg_length_distr,
             pathlength=pathlength,
             context=self.context,
             random_generator=self._rng,
+            sampler=self.sampler,
         )
 
-        self.active_sections.append(sec_grower)
+        self._activate_section(sec_grower)
         return sec_grower
@@ -4,15 +4,121 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import copy
+import threading
 from collections import OrderedDict
+from collections.abc import Mapping
 
 import numpy as np
 
 from neurots.basic import round_num
+from neurots.generate.stats import current_stats
 from neurots.utils import NeuroTSError
 
 
+def _record_lookup():
+    """Record a barcode query in the statistics of the cell currently grown."""
+    stats = current_stats()
+    if stats is not None:
+        stats.record_barcode_lookup()
+
+
+def _find(parents, index):
+    """Return the root of an index in a disjoint-set forest and compress the path to it."""
+    root = index
+    while parents[root] != root:
+        root = parents[root]
+    while parents[index] != root:
+        parents[index], index = root, parents[index]
+    return root
+
+
+class _Availability:
+    """Availability of the positions of a sorted array.
+
+    The removed positions are linked to their neighbours in two disjoint-set forests, so the first
+    available position after a given one and the last available position are found in amortized
+    almost constant time.
+
+    Args:
+        size (int): The number of positions, which are all available at first.
+    """
+
+    __slots__ = ("mask", "count", "_next", "_previous")
+
+    def __init__(self, size):
+        self.mask = np.ones(size, dtype=bool)
+        self.count = size
+        # The position i is stored at the index i + 1 of the backward forest, 0 being a sentinel
+        self._next = list(range(size + 1))
+        self._previous = list(range(size + 1))
+
+    def remove(self, position):
+        """Remove an available position."""
+        self.mask[position] = False
+        self.count -= 1
+        self._next[position] = position + 1
+        self._previous[position + 1] = position
+
+    def first(self, position=0):
+        """Return the first available position from the given one (the size if there is none)."""
+        return _find(self._next, position)
+
+    def last(self):
+        """Return the last available position (-1 if there is none)."""
+        return _find(self._previous, len(self.mask)) - 1
+
+    def copy(self):
+        """Return a copy of the availability."""
+        # pylint: disable=protected-access
+        other = _Availability(0)
+        other.mask = self.mask.copy()
+        other.count = self.count
+        other._next = self._next.copy()
+        other._previous = self._previous.copy()
+        return other
+
+
+class _BarView(Mapping):
+    """Read-only mapping from the IDs of the available bars to their bifurcation or termination.
+
+    The bars are iterated in increasing order of value.
+
+    Args:
+        values (numpy.ndarray): The sorted values.
+        bar_ids (numpy.ndarray): The ID of the bar of each value.
+        positions (numpy.ndarray): The position of the value of each bar.
+        availability (_Availability): The availability of the values.
+    """
+
+    def __init__(self, values, bar_ids, positions, availability):
+        self._values = values
+        self._bar_ids = bar_ids
+        self._positions = positions
+        self._availability = availability
+
+    def _position(self, bar_id):
+        if isinstance(bar_id, (int, np.integer)) and 0 <= bar_id < len(self._positions):
+            position = self._positions[bar_id]
+            if self._availability.mask[position]:
+                return position
+        return None
+
+    def __getitem__(self, bar_id):
+        position = self._position(bar_id)
+        if position is None:
+            raise KeyError(bar_id)
+        return self._values[position]
+
+    def __contains__(self, bar_id):
+        return self._position(bar_id) is not None
+
+    def __iter__(self):
+        return (int(bar_id) for bar_id in self._bar_ids[self._availability.mask])
+
+    def __len__(self):
+        return self._availability.count
+
+
 class Barcode:
     """Class to generate the barcode structure.
 
@@ -41,13 +147,17 @@ class Barcode:
                 ]
 
     Returns:
-       The ph_angles will be decomposed in the following dictionaries::
+       The ph_angles will be decomposed in the following mappings::
 
            {
                angles: {ID: 4D_angles}
                bifs: {ID: start_point}
                terms: {ID, end_point}
            }
+
+       The bifurcations and terminations are stored in sorted arrays with an availability mask, so
+       the queries on the bars are binary searches and the removals take constant time. The
+       ``bifs`` and ``terms`` mappings are read-only views of the available bars, sorted by value.
     """
 
     def __init__(self, ph_angles):
@@ -55,19 +165,47 @@ class Barcode:
         # Sort persistence bars according to bifurcation
         ph_angles.sort(key=lambda x: x[1])
 
-        self.bifs = OrderedDict()
-        self.terms = OrderedDict()
-        self.angles = OrderedDict()
+        self.angles = OrderedDict(
+            (bar_index, tmd_bar[2:]) for bar_index, tmd_bar in enumerate(ph_angles)
+        )
 
-        for bar_index, tmd_bar in enumerate(ph_angles):
-            self.bifs[bar_index] = round_num(tmd_bar[1])
-            self.terms[bar_index] = round_num(tmd_bar[0])
-            self.angles[bar_index] = tmd_bar[2:]
+        # The bar IDs are sorted according to bifurcation so they are the positions of the values
+        self._bif_values = round_num(np.array([tmd_bar[1] for tmd_bar in ph_angles], dtype=float))
+        self._bif_availability = _Availability(len(ph_angles))
 
         # Sort the terminations according to value to optimize access
-        self.terms = OrderedDict(sorted(self.terms.items(), key=lambda x: x[1]))
+        self._bar_terms = round_num(np.array([tmd_bar[0] for tmd_bar in ph_angles], dtype=float))
+        self._term_ids = np.argsort(self._bar_terms, kind="stable")
+        self._term_values = self._bar_terms[self._term_ids]
+        self._term_positions = np.empty_like(self._term_ids)
+        self._term_positions[self._term_ids] = np.arange(len(ph_angles))
+        self._term_availability = _Availability(len(ph_angles))
+        self._create_views()
+
         # Bifurcation at 0 is trivial so it should be removed
-        del self.bifs[0]
+        self.remove_bif(0)
+
+    def _create_views(self):
+        """Create the mappings of the available bifurcations and terminations."""
+        bar_ids = np.arange(len(self._bif_values))
+        self.bifs = _BarView(self._bif_values, bar_ids, bar_ids, self._bif_availability)
+        self.terms = _BarView(
+            self._term_values, self._term_ids, self._term_positions, self._term_availability
+        )
+
+    def copy(self):
+        """Return a copy of the barcode.
+
+        The sorted values and the angles are shared with the copy, only the availability of the
+        bars is copied, so the bars removed from the copy are still available in this barcode.
+        """
+        # pylint: disable=protected-access
+        other = Barcode.__new__(Barcode)
+        other.__dict__.update(self.__dict__)
+        other._bif_availability = self._bif_availability.copy()
+        other._term_availability = self._term_availability.copy()
+        other._create_views()
+        return other
 
     @staticmethod
     def validate_persistence(ph_angles):
@@ -86,23 +224,29 @@ class Barcode:
 
         The trivial bifurcation of id=0 is not included.
         """
+        _record_lookup()
         if bar_id == 0:
             return (0, self.terms[bar_id])
         return (self.bifs[bar_id], self.terms[bar_id])
 
     def get_persistence_length(self):
         """Returns the maximum bar length."""
+        _record_lookup()
         return self.terms[0]
 
     def remove_bif(self, bar_id):
         """Remove a bifurcation that has been used if bif_id is not None."""
         if bar_id is not None:
-            del self.bifs[bar_id]
+            if bar_id not in self.bifs:
+                raise KeyError(bar_id)
+            self._bif_availability.remove(bar_id)
 
     def remove_term(self, bar_id):
         """Remove a termination that has been used, if term_id is not None."""
         if bar_id is not None:
-            del self.terms[bar_id]
+            if bar_id not in self.terms:
+                raise KeyError(bar_id)
+            self._term_availability.remove(self._term_positions[bar_id])
 
     def get_term(self, bar_id):
         """Returns a termination based on index if the input ID exists of infinity.
@@ -110,6 +254,7 @@ class Barcode:
         If it doesn't exist the branch will terminate
         as it gets term = -infinity.
         """
+        _record_lookup()
         try:
             return self.terms[bar_id]
         except KeyError:
@@ -123,6 +268,7 @@ class Barcode:
         is returned.
         If it doesn't exist the branch will terminate as it gets `term = -infinity`.
         """
+        _record_lookup()
         try:
             term = self.terms[bar_id]
             if above <= term <= below:
@@ -139,12 +285,14 @@ class Barcode:
 
         If no value is valid, returns infinity (np.inf) and therefore the index is None.
         """
+        _record_lookup()
         if np.isinf(bif_above):
             bif_above = 0.0
-        for bifurcation in self.bifs.items():
-            bifurcation_value = bifurcation[1]
-            if bif_below >= bifurcation_value >= bif_above:
-                return bifurcation
+        position = self._bif_availability.first(
+            int(np.searchsorted(self._bif_values, bif_above, side="left"))
+        )
+        if position < len(self._bif_values) and self._bif_values[position] <= bif_below:
+            return (position, self._bif_values[position])
         return (None, np.inf)
 
     def min_term(self, term_above=0.0, term_below=np.inf):
@@ -153,12 +301,14 @@ class Barcode:
         If no value is valid, returns zero, the section will terminate and therefore the index is
         None.
         """
+        _record_lookup()
         if np.isinf(term_above):
             term_above = 0.0
-        for termination in self.terms.items():
-            termination_value = termination[1]
-            if term_below >= termination_value >= term_above:
-                return termination
+        position = self._term_availability.first(
+            int(np.searchsorted(self._term_values, term_above, side="left"))
+        )
+        if position < len(self._term_values) and self._term_values[position] <= term_below:
+            return (int(self._term_ids[position]), self._term_values[position])
         return (None, 0)
 
     def max_term(self):
@@ -167,7 +317,11 @@ class Barcode:
         Termination list cannot be empty. This means the growth should have stopped, and therefore
         it will results in a 'StopIteration' error
         """
-        return next(reversed(self.terms.items()))
+        _record_lookup()
+        position = self._term_availability.last()
+        if position < 0:
+            raise StopIteration
+        return (int(self._term_ids[position]), self._term_values[position])
 
     def curate_stop_criterion(self, parent_stop, child_stop):
         """Checks if the children stop criterion is compatible with parent.
@@ -189,7 +343,7 @@ class Barcode:
             current one for both bif and term.
         """
         MAX_ref = parent_stop.term
-        target_stop = copy.deepcopy(child_stop)
+        target_stop = child_stop
 
         # Case 0. Incompatibility checks
         # One of the assumed conditions is wrong
@@ -210,8 +364,7 @@ class Barcode:
             below_term=parent_stop.ref,
             above_term=target_stop.term,
         )
-        target_stop.update_bif(bif_id, bif)
-        return target_stop
+        return target_stop.with_bif(bif_id, bif)
 
     def select_compatible_bif(self, below_bif, above_bif, below_term, above_term):
         """Finds a bifurcation within the barcode.
@@ -220,10 +373,71 @@ class Barcode:
         below_bif <= bif <= above_bif
         below_term <= term <= above_term
         """
-        # Search bar according to minimum bifurcation
-        for bif_id, bif in self.bifs.items():
-            corresp_term = self.get_term(bif_id)
-            if (below_bif <= bif <= above_bif) and (below_term <= corresp_term <= above_term):
+        _record_lookup()
+        # Search bar according to minimum bifurcation among the ones in the bifurcation range
+        start = int(np.searchsorted(self._bif_values, below_bif, side="left"))
+        end = int(np.searchsorted(self._bif_values, above_bif, side="right"))
+        if start < end:
+            bifs = self._bif_values[start:end]
+            corresp_terms = np.where(
+                self._term_availability.mask[self._term_positions[start:end]],
+                self._bar_terms[start:end],
+                -np.inf,
+            )
+            compatible = (
+                self._bif_availability.mask[start:end]
+                & (below_bif <= bifs)
+                & (bifs <= above_bif)
+                & (below_term <= corresp_terms)
+                & (corresp_terms <= above_term)
+            )
+            if compatible.any():
                 # Define new termination corresponding to bifurcation
-                return (bif_id, bif)
+                bif_id = start + int(np.argmax(compatible))
+                return (bif_id, self._bif_values[bif_id])
         return (None, np.inf)
+
+
+class BarcodeTemplates:
+    """Barcodes of the persistence diagrams of shared inputs.
+
+    The barcode of each diagram is built the first time it is requested and stored as a template,
+    which is then copied for each request with the same diagram object. The diagrams should thus
+    not be modified after they were given to this object. The templates are kept as long as this
+    object, which is owned by :class:`neurots.generate.grower.PreparedInputs`, and they are not
+    pickled, so each process builds its own templates.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of stored templates."""
+        return len(self._templates)
+
+    def __getstate__(self):
+        """The templates and the lock are not pickled."""
+        return {}
+
+    def __setstate__(self, state):
+        """Create an empty set of templates."""
+        self.__init__()
+
+    def barcode(self, ph_angles):
+        """Return a new barcode built from a persistence diagram.
+
+        Args:
+            ph_angles (list of lists): The persistence diagram (see :class:`Barcode`), which is not
+                modified.
+
+        Returns:
+            Barcode: A barcode which can be consumed by the growth algorithms.
+        """
+        with self._lock:
+            cached_ph_angles, template = self._templates.get(id(ph_angles), (None, None))
+            if cached_ph_angles is not ph_angles:
+                template = Barcode(list(ph_angles))
+                # The diagram is stored to ensure its ID is not reused by another object
+                self._templates[id(ph_angles)] = (ph_angles, template)
+            return template.copy()
@@ -4,6 +4,9 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import warnings
+from collections import namedtuple
+
 import numpy as np
 
 from neurots.morphmath import bifurcation as _bif
@@ -53,9 +56,12 @@ def section_data(direction, first_point, stop_criteria, process_type):
     }
 
 
-class TMDStop:
+class TMDStop(namedtuple("TMDStop", ["bif_id", "bif", "term_id", "term", "ref"])):
     """Class to define the data for stop criteria based on the TMD method.
 
+    The stop criteria are immutable, so they can be shared between sections without being copied.
+    Updated criteria are created with :meth:`with_bif`, :meth:`with_term` or ``_replace()``.
+
     Args:
         bif_id (int): The bifurcation ID.
         bif (float): The bifurcation value.
@@ -64,14 +70,7 @@ class TMDStop:
         ref (float): The reference value (i.e for path or radial distances).
     """
 
-    def __init__(self, bif_id, bif, term_id, term, ref):
-        """Initialization of TMDStop class with parameters."""
-        self.bif_id = bif_id
-        self.bif = bif
-        self.term_id = term_id
-        self.term = term
-        self.ref = ref
-        # self.verify()
+    __slots__ = ()
 
     def __str__(self):
         """Return the string representation of the TMDStop."""
@@ -100,15 +99,41 @@ class TMDStop:
             return True
         return False
 
+    def with_bif(self, bif_id, bif):
+        """Return a copy of the stop criteria with new values for the bifurcation."""
+        return TMDStop(bif_id, bif, self.term_id, self.term, self.ref)
+
+    def with_term(self, term_id, term):
+        """Return a copy of the stop criteria with new values for the termination."""
+        return TMDStop(self.bif_id, self.bif, term_id, term, self.ref)
+
     def update_bif(self, bif_id, bif):
-        """Set new values to bifurcation."""
-        self.bif_id = bif_id
-        self.bif = bif
+        """Return a copy of the stop criteria with new values for the bifurcation.
+
+        .. deprecated::
+            The stop criteria are immutable, use :meth:`with_bif` instead.
+        """
+        warnings.warn(
+            "TMDStop.update_bif() is deprecated and does not update the stop criteria in place, "
+            "please use TMDStop.with_bif() instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.with_bif(bif_id, bif)
 
     def update_term(self, term_id, term):
-        """Set new values to termination."""
-        self.term_id = term_id
-        self.term = term
+        """Return a copy of the stop criteria with new values for the termination.
+
+        .. deprecated::
+            The stop criteria are immutable, use :meth:`with_term` instead.
+        """
+        warnings.warn(
+            "TMDStop.update_term() is deprecated and does not update the stop criteria in place, "
+            "please use TMDStop.with_term() instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.with_term(term_id, term)
 
     def child_length(self):
         """Return the child length.
@@ -167,3 +192,7 @@ class TMDStop:
                 and np.allclose(self.ref, other.ref)
             )
         return False
+
+    def __ne__(self, other):
+        """Check for inequality with another object."""
+        return not self == other
@@ -4,7 +4,6 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import copy
 import logging
 
 import numpy as np
@@ -31,6 +30,8 @@ class TMDAlgo(AbstractAlgo):
             the "min_bar_length" parameter are validated.
         context (Any): An object containing contextual information.
         random_generator (numpy.random.Generator): The random number generator to use.
+        barcode_templates (neurots.generate.algorithms.barcode.BarcodeTemplates): The templates
+            used to build the barcodes of the input persistence diagrams.
     """
 
     def __init__(
@@ -40,13 +41,20 @@ class TMDAlgo(AbstractAlgo):
         start_point,
         context=None,
         random_generator=np.random,
+        barcode_templates=None,
         **_,
     ):
         """TMD basic grower."""
         super().__init__(input_data, params, start_point, context)
         self.bif_method = bif_methods[params["branching_method"]]
         self.ph_angles = self.select_persistence(input_data, random_generator)
-        self.barcode = Barcode(list(self.ph_angles))
+        if barcode_templates is not None and any(
+            self.ph_angles is diagram for diagram in input_data.get("persistence_diagram", [])
+        ):
+            # The input diagrams are shared by all the growers so their barcodes are built once
+            self.barcode = barcode_templates.barcode(self.ph_angles)
+        else:
+            self.barcode = Barcode(list(self.ph_angles))
         self.apical_section = None
         self.apical_point_distance_from_soma = 0.0
         self.persistence_length = self.barcode.get_persistence_length()
@@ -92,14 +100,16 @@ class TMDAlgo(AbstractAlgo):
             value is a :class:`neurots.generate.algorithms.common.TMDStop` object.
         """
         # Ensure that reference is correctly assigned
-        current_section.stop_criteria["TMD"].ref = self.metric_ref(current_section)
-        # Copy the values for the parent stop TMD to use
-        parent_tmd = copy.deepcopy(current_section.stop_criteria["TMD"])
+        current_section.stop_criteria["TMD"] = current_section.stop_criteria["TMD"]._replace(
+            ref=self.metric_ref(current_section)
+        )
+        # The values for the parent stop TMD to use
+        parent_tmd = current_section.stop_criteria["TMD"]
         # Save the values of bifurcation for parent
         parent_bif_id = parent_tmd.bif_id
         parent_bif = parent_tmd.bif
         # Define the current criterion, inherited from parent
-        current_tmd = copy.deepcopy(current_section.stop_criteria["TMD"])
+        current_tmd = parent_tmd
 
         # The termination remains the same, so it is always True that
         # current_tmd.term <= parent_tmd.term
@@ -108,7 +118,7 @@ class TMDAlgo(AbstractAlgo):
         # Bifurcation is larger than current reference distance
         bif_id, bif = self.barcode.min_bif(bif_above=parent_tmd.ref, bif_below=parent_tmd.term)
         # Update the bifurcation in the stop_criterion
-        current_tmd.update_bif(bif_id, bif)
+        current_tmd = current_tmd.with_bif(bif_id, bif)
         # Ensure that criterion fulfils all requirements
         # the term that corresponds to current_tmd.bif term_target
         # term_target <= parent_tmd.term
@@ -122,7 +132,7 @@ class TMDAlgo(AbstractAlgo):
         # Use the current bifurcation to determine the respective termination
         # Bifurcation should be larger than current reference distance
         term_id, term = self.barcode.get_term_between(parent_bif_id, parent_bif, current_tmd.term)
-        current_tmd.update_term(term_id, term)
+        current_tmd = current_tmd.with_term(term_id, term)
 
         # Get a stop criterion that fulfils requirements
         target_stop2 = self.barcode.curate_stop_criterion(parent_tmd, current_tmd)
@@ -182,13 +192,13 @@ class TMDAlgo(AbstractAlgo):
 
     def extend(self, current_section):
         """Definition of stop criterion for the growth of the current section."""
-        criteria_tmd = copy.deepcopy(current_section.stop_criteria["TMD"])
-        maximum_target = current_section.stop_criteria["TMD"].term
-        reference = current_section.stop_criteria["TMD"].ref
+        criteria_tmd = current_section.stop_criteria["TMD"]
+        maximum_target = criteria_tmd.term
+        reference = criteria_tmd.ref
 
         # We check that the current bifurcation has not been used
         if criteria_tmd.bif_id not in self.barcode.bifs and not np.isinf(criteria_tmd.bif):
-            criteria_tmd.update_bif(
+            criteria_tmd = criteria_tmd.with_bif(
                 *self.barcode.min_bif(bif_above=reference, bif_below=maximum_target)
             )
             criteria_tmd = self.barcode.curate_stop_criterion(criteria_tmd, criteria_tmd)
@@ -198,14 +208,14 @@ class TMDAlgo(AbstractAlgo):
             # Termination must be larger that bifurcation
             # unless if bifurcation is infinite
             reference = criteria_tmd.bif if not np.isinf(criteria_tmd.bif) else criteria_tmd.ref
-            criteria_tmd.update_term(
+            criteria_tmd = criteria_tmd.with_term(
                 *self.barcode.min_term(term_above=reference, term_below=maximum_target)
             )
             criteria_tmd = self.barcode.curate_stop_criterion(criteria_tmd, criteria_tmd)
 
         current_section.stop_criteria["TMD"] = criteria_tmd
 
-        return current_section.next()
+        return current_section.next_chunk()
 
 
 class TMDApicalAlgo(TMDAlgo):
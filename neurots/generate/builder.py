@@ -0,0 +1,115 @@
+"""NeuroTS class: Morphology builder."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+from morphio import PointLevel
+
+
+class BuilderSection:
+    """A section stored in a :class:`MorphologyBuilder`.
+
+    Args:
+        builder (MorphologyBuilder): The builder containing the section.
+        section_id (int): The ID of the section in the builder (i.e. its creation index).
+        parent (BuilderSection): The parent section.
+        points (numpy.ndarray): The points of the section.
+        section_type (morphio.SectionType): The type of the section.
+    """
+
+    __slots__ = ("builder", "id", "parent", "children", "points", "type")
+
+    def __init__(self, builder, section_id, parent, points, section_type):
+        self.builder = builder
+        self.id = section_id
+        self.parent = parent
+        self.children = []
+        self.points = points
+        self.type = section_type
+
+    def append_section(self, points, section_type):
+        """Append a child section to this section.
+
+        Args:
+            points (numpy.ndarray): The points of the new section.
+            section_type (morphio.SectionType): The type of the new section.
+
+        Returns:
+            BuilderSection: The new section.
+        """
+        return self.builder.add_section(self, points, section_type)
+
+
+class MorphologyBuilder:
+    """Lightweight container of the sections of a morphology being grown.
+
+    The sections are numbered in the order they are appended, which is not the order of the
+    morphologies loaded by MorphIO when several trees are grown at the same time. They are thus
+    stored in this builder and then appended to the actual morphology only once the growth is
+    complete, in depth-first order, so the section IDs of the morphology are consistent with the
+    ones of the MorphIO loader without copying the morphology.
+    """
+
+    def __init__(self):
+        self.sections = []
+        self.root_sections = []
+
+    def add_section(self, parent, points, section_type):
+        """Add a section.
+
+        Args:
+            parent (BuilderSection): The parent of the new section (``None`` for a root section).
+            points (numpy.ndarray): The points of the new section.
+            section_type (morphio.SectionType): The type of the new section.
+
+        Returns:
+            BuilderSection: The new section.
+        """
+        section = BuilderSection(self, len(self.sections), parent, points, section_type)
+        self.sections.append(section)
+        if parent is None:
+            self.root_sections.append(section)
+        else:
+            parent.children.append(section)
+        return section
+
+    def append_root_section(self, points, section_type):
+        """Append a root section.
+
+        Args:
+            points (numpy.ndarray): The points of the new section.
+            section_type (morphio.SectionType): The type of the new section.
+
+        Returns:
+            BuilderSection: The new section.
+        """
+        return self.add_section(None, points, section_type)
+
+    def build(self, neuron, diameter):
+        """Append the sections to a morphology in depth-first order.
+
+        The points of the sections are released once they are appended to the morphology, so they
+        are not all copied at once.
+
+        Args:
+            neuron (morphio.mut.Morphology): The morphology to which the sections are appended.
+            diameter (float): The diameter given to all the points.
+
+        Returns:
+            list[int]: The ID in the morphology of each section of the builder.
+        """
+        section_ids = [None] * len(self.sections)
+        stack = [(None, section) for section in reversed(self.root_sections)]
+        while stack:
+            parent, section = stack.pop()
+            point_level = PointLevel(section.points, np.full(len(section.points), diameter))
+            if parent is None:
+                new_section = neuron.append_root_section(point_level, section.type)
+            else:
+                new_section = parent.append_section(point_level, section.type)
+            section_ids[section.id] = new_section.id
+            section.points = None
+            stack.extend((new_section, child) for child in reversed(section.children))
+        return section_ids
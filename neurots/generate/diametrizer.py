@@ -196,12 +196,279 @@ def smooth_section_diam(section, min_diam=0.07):
     )
 
 
+class _NeuriteTopology:
+    """Topology of a neurite, which gives the order in which its sections are diametrized.
+
+    The sections are stored in depth-first order.
+
+    Args:
+        root (morphio.mut.Section): The root section of the neurite.
+    """
+
+    def __init__(self, root):
+        self.sections = list(root.iter())
+        index = {section.id: i for i, section in enumerate(self.sections)}
+        self.parents = np.array(
+            [-1 if section.is_root else index[section.parent.id] for section in self.sections],
+            dtype=int,
+        )
+        self.children = [
+            [index[child.id] for child in section.children] for section in self.sections
+        ]
+
+    def branching_levels(self):
+        """Yield the sections diametrized at once from the root.
+
+        The first level is the root section and each other level contains the children of the
+        bifurcations of the previous one.
+        """
+        level = [0]
+        while level:
+            yield np.array(level)
+            level = [
+                child
+                for section in level
+                if len(self.children[section]) > 1
+                for child in self.children[section]
+            ]
+
+    def merging_levels(self):
+        """Yield the sections diametrized at once from the tips.
+
+        The first level contains the tips and each other level contains the sections whose last
+        child belongs to the previous one.
+        """
+        level = [i for i, children in enumerate(self.children) if not children]
+        remaining_children = [len(children) for children in self.children]
+        while level:
+            yield np.array(level)
+            next_level = []
+            for section in level:
+                parent = self.parents[section]
+                if parent != -1:
+                    remaining_children[parent] -= 1
+                    if remaining_children[parent] == 0:
+                        next_level.append(parent)
+            level = next_level
+
+    def draws(self, model, from_root):
+        """Return the data from which each random value is sampled, in the order of the draws."""
+        draws = [model["trunk"]]
+        if from_root:
+            levels = self.branching_levels()
+        else:
+            draws.extend(model["term"] for children in self.children if not children)
+            levels = self.merging_levels()
+        for level in levels:
+            draws.extend(
+                model["trunk_taper"] if self.parents[section] == -1 else model["taper"]
+                for section in level
+            )
+        return draws
+
+
+class _NeuriteArrays(_NeuriteTopology):
+    """Flat representation of the sections of a neurite used by the vectorized diametrizers.
+
+    The points of the sections are concatenated, the points of the section ``i`` being
+    ``points[offsets[i]:offsets[i + 1]]``.
+
+    Args:
+        root (morphio.mut.Section): The root section of the neurite.
+    """
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.offsets = np.zeros(len(self.sections) + 1, dtype=int)
+        np.cumsum([len(section.points) for section in self.sections], out=self.offsets[1:])
+        points = np.vstack([section.points for section in self.sections]).astype(np.float32)
+        self.diameters = np.hstack([section.diameters for section in self.sections]).astype(
+            np.float32
+        )
+
+        # The length of the segment starting at each point (0 for the last point of a section)
+        self.segment_lengths = np.zeros(len(points), dtype=np.float32)
+        self.segment_lengths[:-1] = np.linalg.norm(points[1:] - points[:-1], axis=1)
+        self.segment_lengths[self.offsets[1:] - 1] = 0
+
+    def is_valid(self):
+        """Check that each section has at least one segment and a positive length."""
+        sizes = np.diff(self.offsets)
+        if np.any(sizes < 2):
+            return False
+        return bool(np.all(np.add.reduceat(self.segment_lengths, self.offsets[:-1]) > 0))
+
+    def section_points(self, sections):
+        """Return the indices of the points of the given sections.
+
+        Returns:
+            tuple[numpy.ndarray]: The indices of the points, the position of their section in the
+            given sections, their index in their section, the position of the first point of
+            each section and the number of points of each section.
+        """
+        starts = self.offsets[sections]
+        sizes = self.offsets[sections + 1] - starts
+        owners = np.repeat(np.arange(len(sections)), sizes)
+        first_points = np.cumsum(sizes) - sizes
+        local = np.arange(sizes.sum()) - first_points[owners]
+        return starts[owners] + local, owners, local, first_points, sizes
+
+    def connect_sections(self):
+        """Give the first point of each section the last diameter of its parent."""
+        children = np.flatnonzero(self.parents != -1)
+        self.diameters[self.offsets[children]] = self.diameters[
+            self.offsets[self.parents[children] + 1] - 1
+        ]
+
+    def write(self):
+        """Write the diameters to the sections."""
+        for section, start, end in zip(self.sections, self.offsets[:-1], self.offsets[1:]):
+            section.diameters = self.diameters[start:end]
+
+
+def _can_vectorize(model):
+    """Check that the tapers of the model can be computed with cumulative sums.
+
+    The vectorized diametrizers assume that the diameters vary monotonically along the sections
+    and that the minimum diameter is not larger than the trunk diameter.
+    """
+    return (
+        np.min(model["taper"]) >= 0
+        and np.min(model["trunk_taper"]) >= 0
+        and np.min(model["term"]) <= np.min(model["trunk"])
+    )
+
+
+def _vectorized_from_root(neurite, model, random_generator):  # pylint: disable=too-many-locals
+    """Diametrize a neurite from the root with one batch of sections per branching level.
+
+    The random values are drawn in the same order as in :func:`diametrize_from_root`.
+    """
+    trunk_diam = sample(model["trunk"], random_generator)
+    min_diam = np.min(model["term"])
+    section_lengths_ = np.add.reduceat(neurite.segment_lengths.astype(float), neurite.offsets[:-1])
+
+    initial_diams = np.array([trunk_diam], dtype=float)
+    for level in neurite.branching_levels():
+        is_root = neurite.parents[level] == -1
+        tapers = np.array(
+            [
+                sample(model["trunk_taper"] if root else model["taper"], random_generator)
+                for root in is_root
+            ],
+            dtype=float,
+        )
+        taps = tapers / section_lengths_[level]
+
+        # The diameters decrease by the lengths of the previous segments (shifted by one more
+        # point for the children, as in taper_section_diam_from_root())
+        points, owners, local, first_points, sizes = neurite.section_points(level)
+        shifts = np.where(is_root, 1, 2)[owners]
+        steps = np.where(
+            local >= shifts,
+            taps[owners] * neurite.segment_lengths[np.maximum(points - shifts, 0)],
+            0.0,
+        )
+        cumulated = np.cumsum(steps)
+        cumulated -= np.repeat(cumulated[first_points], sizes)
+        # The clipping to the maximum diameter only affects the first steps
+        start_diams = np.minimum(initial_diams, trunk_diam + cumulated[first_points + 1])
+        diams = np.maximum(min_diam, start_diams[owners] - cumulated)
+        diams[first_points] = initial_diams
+        neurite.diameters[points] = diams
+
+        # The children of the bifurcations start the next level
+        parents = np.array([section for section in level if len(neurite.children[section]) > 1])
+        if len(parents) == 0:
+            break
+        n_children = np.array([len(neurite.children[section]) for section in parents])
+        d1 = bifurcator(
+            neurite.diameters[neurite.offsets[parents + 1] - 1].astype(float),
+            n_children,
+            rall_ratio=model["Rall_ratio"],
+            siblings_ratio=model["siblings_ratio"],
+        )
+        first_children = np.cumsum(n_children) - n_children
+        initial_diams = np.repeat(d1, n_children) * model["siblings_ratio"]
+        initial_diams[first_children] = d1
+        initial_diams = initial_diams.astype(np.float32).astype(float)
+
+    neurite.connect_sections()
+    neurite.write()
+
+
+def _vectorized_from_tips(neurite, model, random_generator):  # pylint: disable=too-many-locals
+    """Diametrize a neurite from the tips with one batch of sections per merging level.
+
+    The random values are drawn in the same order as in :func:`diametrize_from_tips`.
+    """
+    trunk_diam = sample(model["trunk"], random_generator)
+    min_diam = np.min(model["term"])
+    section_lengths_ = np.add.reduceat(neurite.segment_lengths, neurite.offsets[:-1])
+
+    final_diams = np.zeros(len(neurite.sections), dtype=np.float32)
+    for tip, children in enumerate(neurite.children):
+        if not children:
+            final_diams[tip] = sample(model["term"], random_generator)
+
+    for level in neurite.merging_levels():
+        tapers = np.array(
+            [
+                sample(
+                    model["trunk_taper"] if neurite.parents[section] == -1 else model["taper"],
+                    random_generator,
+                )
+                for section in level
+            ],
+            dtype=float,
+        )
+
+        # The last diameters of the bifurcations are merged from the ones of their children
+        merged = [section for section in level if neurite.children[section]]
+        if merged:
+            children = np.array(
+                [child for section in merged for child in neurite.children[section]]
+            )
+            n_children = np.array([len(neurite.children[section]) for section in merged])
+            first_children = np.cumsum(n_children) - n_children
+            # The diameters[0] of the children are the duplicate points
+            children_diams = neurite.diameters[neurite.offsets[children] + 1].astype(float)
+            parent_diams = np.power(
+                np.add.reduceat(np.power(children_diams, model["Rall_ratio"]), first_children),
+                1.0 / model["Rall_ratio"],
+            )
+            final_diams[merged] = np.where(
+                parent_diams <= trunk_diam,
+                parent_diams,
+                np.maximum.reduceat(children_diams, first_children),
+            )
+
+        # The diameters increase by the lengths of the next segments
+        taps = tapers / section_lengths_[level]
+        points, owners, _, first_points, sizes = neurite.section_points(level)
+        last_points = first_points + sizes - 1
+        steps = taps[owners] * neurite.segment_lengths[points]
+        cumulated = np.cumsum(steps)
+        remaining = np.repeat(cumulated[last_points], sizes) - cumulated + steps
+        # The clipping to the minimum diameter only affects the first steps
+        end_diams = np.maximum(
+            final_diams[level].astype(float), min_diam - remaining[last_points - 1]
+        )
+        diams = np.minimum(trunk_diam, end_diams[owners] + remaining)
+        diams[last_points] = final_diams[level]
+        neurite.diameters[points] = diams
+
+    neurite.connect_sections()
+    neurite.write()
+
+
 def diametrize_from_root(
     neuron,
     neurite_type=None,
     *,
     model_params,
     random_generator=np.random,
+    vectorized=True,
 ):  # pylint: disable=too-many-locals
     """Corrects the diameters of a morphio-neuron according to the model.
 
@@ -212,9 +479,19 @@ def diametrize_from_root(
         neurite_type (morphio.SectionType): Only the neurites of this type are diametrized.
         model_params (dict): The model parameters.
         random_generator (numpy.random.Generator): The random number generator to use.
+        vectorized (bool): If set to ``True``, the sections of each branching level are
+            diametrized at once with numpy. The random values are drawn in the same order as with
+            the loop over the sections, which is still used for the neurites with degenerated
+            sections or models with negative tapers.
     """
     for r in root_section_filter(neuron, tree_type=neurite_type):
         model = model_params[r.type.name]  # Selected by the root type.
+        if vectorized and _can_vectorize(model):
+            neurite = _NeuriteArrays(r)
+            if neurite.is_valid():
+                _vectorized_from_root(neurite, model, random_generator)
+                continue
+
         trunk_diam = sample(model["trunk"], random_generator)
         min_diam = np.min(model["term"])
         status = {s.id: False for s in r.iter()}
@@ -261,7 +538,9 @@ def diametrize_from_root(
                 redefine_diameter_section(section, 0, section.parent.diameters[-1])
 
 
-def diametrize_from_tips(neuron, neurite_type=None, *, model_params, random_generator=np.random):
+def diametrize_from_tips(
+    neuron, neurite_type=None, *, model_params, random_generator=np.random, vectorized=True
+):
     """Corrects the diameters of a morphio-neuron according to the model.
 
     Starts from the tips and moves towards the root.
@@ -271,9 +550,17 @@ def diametrize_from_tips(neuron, neurite_type=None, *, model_params, random_gene
         neurite_type (morphio.SectionType): Only the neurites of this type are diametrized.
         model_params (dict): The model parameters.
         random_generator (numpy.random.Generator): The random number generator to use.
+        vectorized (bool): If set to ``True``, the sections whose children are all diametrized
+            are diametrized at once with numpy (see :func:`diametrize_from_root`).
     """
     for r in root_section_filter(neuron, tree_type=neurite_type):
         model = model_params[r.type.name]  # Selected by the root type.
+        if vectorized and _can_vectorize(model):
+            neurite = _NeuriteArrays(r)
+            if neurite.is_valid():
+                _vectorized_from_tips(neurite, model, random_generator)
+                continue
+
         trunk_diam = sample(model["trunk"], random_generator)
         min_diam = np.min(model["term"])
         tips = [s for s in r.iter() if not s.children]
@@ -383,6 +670,72 @@ diam_methods = {
 }
 
 
+def _get_diam_method(diam_method):
+    """Return the diametrization function of a method name or check that it is a callable."""
+    if isinstance(diam_method, str):
+        try:
+            return diam_methods[diam_method]
+        except KeyError as exc:
+            raise KeyError(
+                "The name of the diametrization method is unknown: "
+                f"'{diam_method}' is not in {list(diam_methods.keys())}"
+            ) from exc
+
+    if not hasattr(diam_method, "__call__"):
+        raise ValueError(f"Diameter method not understood, we got {diam_method}")
+    return diam_method
+
+
+def _get_neurite_types(neurite_types):
+    """Return the neurite types to diametrize as morphio section types."""
+    if neurite_types is None:
+        return [SectionType.apical_dendrite, SectionType.basal_dendrite]
+    return [
+        getattr(SectionType, tree_type) if isinstance(tree_type, str) else tree_type
+        for tree_type in neurite_types
+    ]
+
+
+def _optional_kwargs(diam_method, input_model, diam_params, random_generator):
+    """Return the optional arguments accepted by a diametrization function."""
+    param_signature = list(inspect.signature(diam_method).parameters.keys())
+    optional_kw = {}
+    if "model_params" in param_signature:
+        optional_kw["model_params"] = input_model
+    if "diam_params" in param_signature:
+        optional_kw["diam_params"] = diam_params
+    if "random_generator" in param_signature:
+        optional_kw["random_generator"] = random_generator
+    return optional_kw
+
+
+class _DrawnValues:
+    """Replay random values drawn beforehand, in the interface used by :func:`sample`."""
+
+    def __init__(self, values):
+        self._values = iter(values)
+
+    def choice(self, _data):
+        """Return the next value."""
+        return next(self._values)
+
+
+def _draw_all(draws, random_generator):
+    """Draw one value from each data in one call to the random number generator.
+
+    The indices are drawn with broadcast upper bounds, which gives the same values as successive
+    calls to :func:`sample`.
+    """
+    if not draws:
+        return []
+    sizes = [len(data) for data in draws]
+    if isinstance(random_generator, np.random.Generator):
+        indices = random_generator.integers(0, sizes)
+    else:
+        indices = random_generator.randint(0, sizes)
+    return [np.asarray(data)[index] for data, index in zip(draws, indices)]
+
+
 def build(
     neuron,
     input_model=None,
@@ -414,30 +767,57 @@ def build(
 
     and should only update the neuron object.
     """
-    if neurite_types is None:
-        neurite_types = [SectionType.apical_dendrite, SectionType.basal_dendrite]
+    diam_method = _get_diam_method(diam_method)
+    optional_kw = _optional_kwargs(diam_method, input_model, diam_params, random_generator)
+    for tree_type in _get_neurite_types(neurite_types):
+        diam_method(neuron, tree_type, **optional_kw)
 
-    if isinstance(diam_method, str):
-        try:
-            diam_method = diam_methods[diam_method]
-        except KeyError as exc:
-            raise KeyError(
-                "The name of the diametrization method is unknown: "
-                f"'{diam_method}' is not in {list(diam_methods.keys())}"
-            ) from exc
 
-    elif not hasattr(diam_method, "__call__"):
-        raise ValueError(f"Diameter method not understood, we got {diam_method}")
+def build_population(
+    neurons,
+    input_model=None,
+    neurite_types=None,
+    diam_method=None,
+    diam_params=None,
+    random_generator=np.random,
+):
+    """Diametrize several morphologies according to the selected method.
 
-    for tree_type in neurite_types:
-        if isinstance(tree_type, str):
-            tree_type = getattr(SectionType, tree_type)
-        param_signature = list(inspect.signature(diam_method).parameters.keys())
-        optional_kw = {}
-        if "model_params" in param_signature:
-            optional_kw["model_params"] = input_model
-        if "diam_params" in param_signature:
-            optional_kw["diam_params"] = diam_params
-        if "random_generator" in param_signature:
-            optional_kw["random_generator"] = random_generator
-        diam_method(neuron, tree_type, **optional_kw)
+    The method is selected and its signature is inspected only once for all the morphologies. For
+    the ``M4`` and ``M5`` methods, the random values of all the morphologies are drawn at once,
+    which gives the same diameters as calling :func:`build` on each morphology in turn with the
+    same random number generator.
+
+    Args:
+        neurons (list[morphio.mut.Morphology]): The morphologies that will be diametrized.
+        input_model (dict): The model parameters.
+        neurite_types (list[str]): Only the neurites of these types are diametrized.
+        diam_method (str or callable): The name of the diametrization method or a function (see
+            :func:`build`).
+        diam_params (dict): The parameters passed to the diametrization method.
+        random_generator (numpy.random.Generator): The random number generator to use.
+    """
+    neurons = list(neurons)
+    diam_method = _get_diam_method(diam_method)
+    neurite_types = _get_neurite_types(neurite_types)
+    optional_kw = _optional_kwargs(diam_method, input_model, diam_params, random_generator)
+
+    if diam_method in (diametrize_from_root, diametrize_from_tips) and (
+        isinstance(random_generator, (np.random.Generator, np.random.RandomState))
+        or random_generator is np.random
+    ):
+        # The number of values drawn for each neurite only depends on its topology
+        draws = [
+            data
+            for neuron in neurons
+            for tree_type in neurite_types
+            for root in root_section_filter(neuron, tree_type=tree_type)
+            for data in _NeuriteTopology(root).draws(
+                input_model[root.type.name], from_root=diam_method is diametrize_from_root
+            )
+        ]
+        optional_kw["random_generator"] = _DrawnValues(_draw_all(draws, random_generator))
+
+    for neuron in neurons:
+        for tree_type in neurite_types:
+            diam_method(neuron, tree_type, **optional_kw)
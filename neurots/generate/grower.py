@@ -18,6 +18,7 @@
 import copy
 import json
 import logging
+from contextlib import nullcontext
 
 import numpy as np
 from diameter_synthesis import build_diameters
@@ -30,10 +31,14 @@ from numpy.random import SeedSequence
 
 from neurots.generate import diametrizer
 from neurots.generate import orientations as _oris
+from neurots.generate.algorithms.barcode import BarcodeTemplates
+from neurots.generate.builder import MorphologyBuilder
 from neurots.generate.orientations import OrientationManager
 from neurots.generate.orientations import check_3d_angles
 from neurots.generate.soma import Soma
 from neurots.generate.soma import SomaGrower
+from neurots.generate.stats import GrowthStats
+from neurots.generate.tree import DEFAULT_DIAMETER
 from neurots.generate.tree import TreeGrower
 from neurots.morphmath import rotation
 from neurots.morphmath import sample
@@ -42,7 +47,6 @@ from neurots.preprocess import preprocess_inputs
 from neurots.utils import Y_DIRECTION
 from neurots.utils import NeuroTSError
 from neurots.utils import convert_from_legacy_neurite_type
-from neurots.utils import point_to_section_segment
 
 L = logging.getLogger(__name__)
 
@@ -59,6 +63,37 @@ def _load_json(path_or_json):
     return convert_from_legacy_neurite_type(data)
 
 
+class PreparedInputs:
+    """Parameters and distributions loaded, validated and preprocessed once.
+
+    A prepared object can be passed to several :class:`NeuronGrower` instances (as their
+    ``input_parameters`` argument) which will then share these inputs and skip the loading,
+    copying, validation and preprocessing steps. The inputs should thus not be modified after
+    they were prepared. The barcodes of the persistence diagrams of the inputs are also built once,
+    when they are first needed, and then copied by each grower (see
+    :class:`neurots.generate.algorithms.barcode.BarcodeTemplates`).
+
+    Args:
+        input_parameters (dict or str): The user-defined parameters or the path to a JSON file
+            containing them.
+        input_distributions (dict or str): Distributions extracted from biological data or the
+            path to a JSON file containing them.
+        skip_proprocessing (bool): If set to ``False``, the parameters and distributions are
+            preprocessed with registered validator and preprocessors.
+    """
+
+    def __init__(self, input_parameters, input_distributions, skip_preprocessing=False):
+        self.input_parameters = _load_json(input_parameters)
+        self.input_distributions = _load_json(input_distributions)
+
+        # Validate and preprocess parameters and distributions
+        if not skip_preprocessing:
+            self.input_parameters, self.input_distributions = preprocess_inputs(
+                self.input_parameters, self.input_distributions
+            )
+        self.barcode_templates = BarcodeTemplates()
+
+
 class NeuronGrower:
     """The main class for growing algorithms of neurons.
 
@@ -67,32 +102,78 @@ class NeuronGrower:
     consumed by the algorithms and the user-selected parameters are also stored.
 
     Args:
-        input_parameters (dict): The user-defined parameters.
+        input_parameters (dict or PreparedInputs): The user-defined parameters or the inputs
+            prepared with :class:`PreparedInputs`, in which case ``input_distributions`` should be
+            ``None``.
         input_distributions (dict): Distributions extracted from biological data.
         context (Any): An object containing contextual information.
         external_diametrizer (Callable): Diametrizer function for external diametrizer module
         skip_proprocessing (bool): If set to ``False``, the parameters and distributions are
-            preprocessed with registered validator and preprocessors.
-        rng_or_seed (int or numpy.random.Generator): A random number generator to use. If an
-            int is given, it is passed to :func:`numpy.random.default_rng()` to create a new
-            random number generator.
+            preprocessed with registered validator and preprocessors. This is ignored when the
+            inputs are already prepared.
+        rng_or_seed (int, numpy.random.SeedSequence or numpy.random.Generator): A random number
+            generator to use. If an int or a seed sequence is given, it is passed to
+            :func:`numpy.random.default_rng()` to create a new random number generator. The seeds
+            of the cells of a population can be built with
+            :meth:`neurots.population.seeds.PopulationSeeds.cell_seed`.
         trunk_orientations_class (typing.Generic[OrientationManagerBase]): The class used to
             build the trunk orientation manager. This class should inherit from
             :class:`neurots.generate.orientations.OrientationManagerBase`.
+        collect_stats (bool): If set to ``True``, statistics about the growth (timings of each
+            phase, number of sections and points, etc.) are collected and stored in the
+            :attr:`stats` attribute as a :class:`neurots.generate.stats.GrowthStats` object.
+        sampling (str): The sampling mode of the step sizes and random directions of the sections.
+            In ``exact`` mode, each value is drawn when it is needed. In ``buffered`` mode, they
+            are drawn by blocks, which is faster but gives different morphologies for the same
+            seed (see :class:`neurots.morphmath.sample.BufferedSampler`).
+        analytic_stop (bool): If set to ``True``, the bifurcation and termination values of the
+            sections are sampled once per section instead of being drawn at each step, which is
+            faster but follows an approximation of the law of the default mode and gives different
+            morphologies for the same seed (see
+            :class:`neurots.generate.section.SectionGrowerExponentialProba`).
+        chunk_size (int): The maximum number of points created at once by the TMD section growers.
+            If larger than 1, the growth is faster but gives different morphologies for the same
+            seed (see :meth:`neurots.generate.section.SectionGrowerExponentialProba.next_chunk`).
+        independent_trees (bool): If set to ``True``, each tree draws its random numbers from its
+            own stream, keyed by the creation index of the tree and spawned from a seed drawn
+            once from the random number generator of the grower. The trees then do not depend on
+            the order in which they are grown, which gives different morphologies than the default
+            mode for the same seed.
     """
 
+    # pylint: disable-msg=too-many-arguments
     def __init__(
         self,
         input_parameters,
-        input_distributions,
+        input_distributions=None,
         context=None,
         external_diametrizer=None,
         skip_preprocessing=False,
         rng_or_seed=np.random,
         trunk_orientations_class=OrientationManager,
+        collect_stats=False,
+        sampling="exact",
+        analytic_stop=False,
+        chunk_size=1,
+        independent_trees=False,
     ):
         """Constructor of the NeuronGrower class."""
         self.neuron = Morphology()
+        # The sections are stored in a builder during the growth and appended to the neuron after
+        self._builder = MorphologyBuilder()
+        self.stats = GrowthStats() if collect_stats else None
+        if sampling not in sample.SAMPLING_MODES:
+            raise NeuroTSError(
+                f"The sampling mode must be one of {sample.SAMPLING_MODES} (got '{sampling}')"
+            )
+        self.sampling = sampling
+        self.analytic_stop = analytic_stop
+        if not isinstance(chunk_size, (int, np.integer)) or chunk_size < 1:
+            raise NeuroTSError(f"The chunk size must be a positive integer (got {chunk_size})")
+        self.chunk_size = chunk_size
+        self.independent_trees = independent_trees
+        self._tree_seeds = None
+        self._trees = []
         self.context = self._process_context(context)
         if rng_or_seed is None or isinstance(
             rng_or_seed, (int, np.integer, SeedSequence, BitGenerator)
@@ -106,15 +187,25 @@ class NeuronGrower:
                 "following types: [int, SeedSequence, BitGenerator, RandomState, Generator]."
             )
 
-        self.input_parameters = _load_json(input_parameters)
+        if isinstance(input_parameters, PreparedInputs):
+            if input_distributions is not None:
+                raise ValueError(
+                    "The 'input_distributions' argument must be None when the inputs are prepared."
+                )
+            self.input_parameters = input_parameters.input_parameters
+            self.input_distributions = input_parameters.input_distributions
+            self._barcode_templates = input_parameters.barcode_templates
+        else:
+            self._barcode_templates = None
+            self.input_parameters = _load_json(input_parameters)
+            self.input_distributions = _load_json(input_distributions)
+
+            # Validate and preprocess parameters and distributions
+            if not skip_preprocessing:
+                self.input_parameters, self.input_distributions = preprocess_inputs(
+                    self.input_parameters, self.input_distributions
+                )
         L.debug("Input Parameters: %s", self.input_parameters)
-        self.input_distributions = _load_json(input_distributions)
-
-        # Validate and preprocess parameters and distributions
-        if not skip_preprocessing:
-            self.input_parameters, self.input_distributions = preprocess_inputs(
-                self.input_parameters, self.input_distributions
-            )
 
         # A list of trees with the corresponding orientations
         # and initial points on the soma surface will be initialized.
@@ -151,6 +242,28 @@ class NeuronGrower:
             )
         return context
 
+    def _tree_random_generator(self):
+        """Return the random number generator of a new tree."""
+        if not self.independent_trees:
+            return self._rng
+        if self._tree_seeds is None:
+            # The seed is drawn lazily so the default mode does not consume any random number
+            self._tree_seeds = SeedSequence(int.from_bytes(self._rng.bytes(16), "little"))
+        # The children are spawned in the creation order of the trees
+        return np.random.default_rng(self._tree_seeds.spawn(1)[0])
+
+    def _add_tree(self, grower):
+        """Add a new tree grower to the active neurites."""
+        self._trees.append(grower)
+        self.active_neurites.append(grower)
+
+    def _is_apical(self, grower):
+        """Check whether a tree grower grows an apical tree."""
+        return (
+            "apical_dendrite" in self.input_parameters["grow_types"]
+            and grower.type == self.input_parameters["apical_dendrite"]["tree_type"]
+        )
+
     def next(self):
         """Call the "next" method of each neurite grower."""
         for grower in list(self.active_neurites):
@@ -158,10 +271,7 @@ class NeuronGrower:
                 # If tree is an apical, the apical points get appended at the end of growth
                 # This will ensure that for each apical tree a relevant apical point,
                 # will be exposed to the user as a set of 3D coordinates (x,y,z).
-                if (
-                    "apical_dendrite" in self.input_parameters["grow_types"]
-                    and grower.type == self.input_parameters["apical_dendrite"]["tree_type"]
-                ):
+                if self._is_apical(grower):
                     self.apical_sections.append(grower.growth_algo.apical_section)
                 self.active_neurites.remove(grower)
             else:
@@ -177,30 +287,52 @@ class NeuronGrower:
         Returns:
             morphio.mut.Morphology: The grown neuron.
         """
-        self._grow_soma()
-        while self.active_neurites:
-            self.next()  # pylint: disable=E1102
-        self._post_grow()
-        self._diametrize()
+        if self.stats is None:
+            return self._grow()
+        with self.stats.activate():
+            return self._grow()
+
+    def _timer(self, phase):
+        """Return a context manager measuring the time spent in a phase if stats are collected."""
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.timer(phase)
+
+    def _grow(self):
+        """Run the successive phases of the growth."""
+        with self._timer("grow_soma"):
+            self._grow_soma()
+        with self._timer("grow_neurites"):
+            while self.active_neurites:
+                self.next()  # pylint: disable=E1102
+        with self._timer("post_grow"):
+            self._post_grow()
+        with self._timer("diametrize"):
+            self._diametrize()
+        if self.stats is not None:
+            self.stats.count_morphology(self.neuron)
         return self.neuron
 
     def _post_grow(self):
         """Actions after the morphology has been grown and before its diametrization."""
-        # ensures section.id are consistent with morphio loader
-        apical_points = [
-            self.neuron.sections[apical_section].points[-1] if apical_section is not None else None
-            for apical_section in self.apical_sections
-        ]
-
-        self.neuron = Morphology(self.neuron)
+        if self.independent_trees:
+            # The trees are ordered by creation so the morphology does not depend on the order in
+            # which they were grown
+            self._builder.root_sections = [grower.root_section for grower in self._trees]
+            self.apical_sections = [
+                grower.growth_algo.apical_section
+                for grower in self._trees
+                if self._is_apical(grower)
+            ]
+
+        # The sections are appended in depth-first order, which ensures section.id are consistent
+        # with morphio loader
+        section_ids = self._builder.build(self.neuron, DEFAULT_DIAMETER)
+        self._builder = MorphologyBuilder()
 
         self.apical_sections = [
-            (
-                point_to_section_segment(self.neuron, apical_point)[0]
-                if apical_point is not None
-                else None
-            )
-            for apical_point in apical_points
+            section_ids[apical_section] if apical_section is not None else None
+            for apical_section in self.apical_sections
         ]
 
     def _init_diametrizer(self, external_diametrizer=None):
@@ -225,7 +357,10 @@ class NeuronGrower:
 
             def _diametrize():
                 """Diametrizer function."""
-                self.input_distributions["diameter"]["apical_point_sec_ids"] = self.apical_sections
+                # The inputs may be shared with other growers so they are not updated in place
+                input_model = dict(
+                    self.input_distributions["diameter"], apical_point_sec_ids=self.apical_sections
+                )
                 neurite_types = self.input_parameters.get("diameter_params", {}).get(
                     "neurite_types", None
                 )
@@ -233,7 +368,7 @@ class NeuronGrower:
                     neurite_types = self.input_parameters["grow_types"]
                 diametrizer.build(
                     self.neuron,
-                    self.input_distributions["diameter"],
+                    input_model,
                     neurite_types=neurite_types,
                     diam_method=diam_method,
                     diam_params=self.input_parameters.get("diameter_params", {}),
@@ -366,15 +501,19 @@ class NeuronGrower:
             # Iterate over all initial points on the soma and create new trees
             # with a direction and initial_point
             for p in points:
-                self.active_neurites.append(
+                self._add_tree(
                     TreeGrower(
-                        self.neuron,
+                        self._builder,
                         initial_direction=self.soma_grower.soma.orientation_from_point(p),
                         initial_point=p,
                         parameters=params,
                         distributions=distr,
                         context=self.context,
-                        random_generator=self._rng,
+                        random_generator=self._tree_random_generator(),
+                        sampling=self.sampling,
+                        analytic_stop=self.analytic_stop,
+                        chunk_size=self.chunk_size,
+                        barcode_templates=self._barcode_templates,
                     )
                 )
 
@@ -391,15 +530,19 @@ class NeuronGrower:
             orientations = trunk_orientations_manager.compute_tree_type_orientations(neurite_type)
 
             for p in self.soma_grower.add_points_from_orientations(orientations):
-                self.active_neurites.append(
+                self._add_tree(
                     TreeGrower(
-                        self.neuron,
+                        self._builder,
                         initial_direction=self.soma_grower.soma.orientation_from_point(p),
                         initial_point=p,
                         parameters=self.input_parameters[neurite_type],
                         distributions=self.input_distributions[neurite_type],
                         context=self.context,
-                        random_generator=self._rng,
+                        random_generator=self._tree_random_generator(),
+                        sampling=self.sampling,
+                        analytic_stop=self.analytic_stop,
+                        chunk_size=self.chunk_size,
+                        barcode_templates=self._barcode_templates,
                     )
                 )
 
@@ -4,33 +4,129 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-from collections import deque
 from functools import partial
 
 import numpy as np
 from numpy.linalg import norm as vectorial_norm  # vectorial_norm used for array of vectors
+from scipy.optimize import brentq
+from scipy.special import spence
 
+from neurots.morphmath.point_array import DynamicPointArray
 from neurots.morphmath.utils import get_random_point  # norm used for single vectors
+from neurots.morphmath.utils import get_random_points
 from neurots.morphmath.utils import norm
 from neurots.utils import accept_reject
 
 MEMORY = 5
 DISTANCE_MIN = 1e-8
 
+# Initial number of points that can be stored in a section before its buffer is resized
+POINTS_INITIAL_CAPACITY = 32
+
+# The value of the dilogarithm at 1, i.e. pi^2 / 6
+_DILOG_ONE = spence(0.0)
+
 # Memory decreases with distance from current point
 WEIGHTS = np.exp(np.arange(1, MEMORY + 1) - MEMORY)
 
+# The factor applied to the weighted sum of the directions when a new direction is added
+_DECAY = WEIGHTS[-2] / WEIGHTS[-1]
+
 # default parameters for accept/reject
 DEFAULT_MAX_TRIES = 50
 DEFAULT_RANDOMNESS_INCREASE = 1.2
 
 
+class DirectionHistory:
+    """The latest directions of a section and their weighted sum.
+
+    The last ``MEMORY`` directions are stored in a ring buffer and the sum of the directions
+    weighted by ``WEIGHTS`` (the latest direction having the largest weight) is updated each time
+    a direction is appended, so the history of a section is computed in constant time. The
+    directions can be accessed like the ones of a list, from the oldest to the latest.
+
+    Args:
+        directions (list[numpy.ndarray]): The initial directions.
+    """
+
+    __slots__ = ("_directions", "_start", "_size", "_weighted_sum")
+
+    def __init__(self, directions=()):
+        self._directions = np.empty((MEMORY, 3))
+        self._start = 0
+        self._size = 0
+        self._weighted_sum = np.zeros(3)
+        for direction in directions:
+            self.append(direction)
+
+    def __len__(self):
+        """Return the number of stored directions."""
+        return self._size
+
+    def __getitem__(self, index):
+        """Return the direction at the given index (the last one being the latest)."""
+        if not -self._size <= index < self._size:
+            raise IndexError("direction index out of range")
+        return self._directions[(self._start + index % self._size) % MEMORY]
+
+    def __iter__(self):
+        """Iterate over the directions from the oldest to the latest."""
+        return (self[i] for i in range(self._size))
+
+    def __array__(self, dtype=None):
+        """Return the directions as a numpy array."""
+        return np.array(list(self), dtype=dtype).reshape(self._size, 3)
+
+    def append(self, direction):
+        """Append a direction and discard the oldest one if ``MEMORY`` directions are stored."""
+        if self._size == MEMORY:
+            self._weighted_sum -= WEIGHTS[0] * self._directions[self._start]
+            self._directions[self._start] = direction
+            self._start = (self._start + 1) % MEMORY
+        else:
+            self._directions[(self._start + self._size) % MEMORY] = direction
+            self._size += 1
+        self._weighted_sum *= _DECAY
+        self._weighted_sum += self[-1]
+
+    def weighted_sum(self):
+        """Return the weighted sum of the directions."""
+        return self._weighted_sum.copy()
+
+    def copy(self):
+        """Return a copy of the history."""
+        # pylint: disable=protected-access
+        other = DirectionHistory()
+        other._directions = self._directions.copy()
+        other._start = self._start
+        other._size = self._size
+        other._weighted_sum = self._weighted_sum.copy()
+        return other
+
+
+def _history(latest_directions):
+    """Returns the normalized weighted sum of the given directions."""
+    if len(latest_directions) == 0:
+        return np.zeros(3)
+
+    history = latest_directions.weighted_sum()
+
+    distance = vectorial_norm(history)
+    if distance > DISTANCE_MIN:
+        history /= distance
+
+    return history
+
+
 class SectionGrower:
     """Class for the section growth.
 
     A section is a list of points in 4D space (x, y, x, r) that are sequentially connected to each
     other. This process generates a tubular morphology that resembles a random walk.
 
+    The points are stored in a :class:`neurots.morphmath.point_array.DynamicPointArray` whose
+    filled part is handed without copy to the morphology builder.
+
     Args:
         parent (morphio.Section): The parent of the section.
         children (int): The number of children.
@@ -43,6 +139,10 @@ class SectionGrower:
         pathlength (float): The path length of the section.
         context (Any): The context used for the section.
         random_generator (numpy.random.Generator): The random number generator to use.
+        sampler (neurots.morphmath.sample.BufferedSampler): The sampler used to draw the step
+            sizes and the random directions. If ``None``, they are drawn one at a time from the
+            step size distribution and the random number generator.
+        chunk_size (int): The maximum number of points created by :meth:`next_chunk`.
     """
 
     # pylint: disable-msg=too-many-arguments
@@ -59,29 +159,71 @@ class SectionGrower:
         pathlength,
         context=None,
         random_generator=np.random,
+        sampler=None,
+        chunk_size=1,
     ):
         self.parent = parent
         self.id = None
         assert not np.isclose(vectorial_norm(direction), 0.0), "Nan direction not recognized"
         self.direction = direction / vectorial_norm(direction)
         self.children = children
-        self.points = [np.array(first_point[:3])]
+        self.points = DynamicPointArray(POINTS_INITIAL_CAPACITY, dtype=np.float64)
+        self.points.append(first_point[:3])
 
         self.params = parameters
 
         self.stop_criteria = stop_criteria
         self.process = process
-        self.latest_directions = deque(maxlen=MEMORY)
+        self.latest_directions = DirectionHistory()
         self.context = context
         self._rng = random_generator
         self.step_size_distribution = step_size_distribution
+        self.sampler = sampler
+        self.chunk_size = chunk_size
         self.pathlength = 0 if parent is None else pathlength
 
+    @property
+    def latest_directions(self):
+        """The latest directions of the section."""
+        return self._latest_directions
+
+    @latest_directions.setter
+    def latest_directions(self, directions):
+        if not isinstance(directions, DirectionHistory):
+            directions = DirectionHistory(directions)
+        self._latest_directions = directions
+
     @property
     def last_point(self):
         """Returns the last point of the section."""
         return self.points[-1]
 
+    def draw_step_size(self):
+        """Returns a positive step size."""
+        if self.sampler is None:
+            return self.step_size_distribution.draw_positive()
+        return self.sampler.step_size()
+
+    def random_direction(self):
+        """Returns a random unit vector."""
+        if self.sampler is None:
+            return get_random_point(random_generator=self._rng)
+        return self.sampler.random_direction()
+
+    def draw_steps(self, n):
+        """Returns ``n`` positive step sizes and ``n`` random unit vectors."""
+        if self.sampler is not None:
+            return (
+                np.array([self.sampler.step_size() for _ in range(n)]),
+                np.array([self.sampler.random_direction() for _ in range(n)]),
+            )
+        step_sizes = self.step_size_distribution.draw_positive_block(n)
+        while len(step_sizes) < n:
+            step_sizes = np.concatenate(
+                (step_sizes, self.step_size_distribution.draw_positive_block(n - len(step_sizes)))
+            )
+        return step_sizes[:n], get_random_points(n, random_generator=self._rng)
+
     def update_pathlength(self, length):
         """Increases the path distance."""
         self.pathlength += length
@@ -95,7 +237,7 @@ class SectionGrower:
         """
         direction = self.params.targeting * self.direction + self.params.history * self.history()
         if add_random_component or extra_randomness > 0.0:
-            random_component = self.params.randomness * get_random_point(random_generator=self._rng)
+            random_component = self.params.randomness * self.random_direction()
             if extra_randomness > 0:  # pragma: no cover
                 random_component *= extra_randomness
             direction += random_component
@@ -152,7 +294,7 @@ class SectionGrower:
                 add_random_component=add_random_component, extra_randomness=extra_randomness
             )
 
-        seg_length = self.step_size_distribution.draw_positive()
+        seg_length = self.draw_step_size()
         next_point = self.last_point + seg_length * direction
         self.update_pathlength(seg_length)
 
@@ -181,18 +323,7 @@ class SectionGrower:
 
     def history(self):
         """Returns a combination of the sections history."""
-        n_points = len(self.latest_directions)
-
-        if n_points == 0:
-            return np.zeros(3)
-
-        history = np.dot(WEIGHTS[MEMORY - n_points :], self.latest_directions)
-
-        distance = vectorial_norm(history)
-        if distance > DISTANCE_MIN:
-            history /= distance
-
-        return history
+        return _history(self.latest_directions)
 
     def next(self):
         """Creates one point and returns the next state: bifurcate, terminate or continue."""
@@ -206,17 +337,126 @@ class SectionGrower:
 
         return "bifurcate"
 
+    def next_chunk(self):
+        """Creates one or several points and returns the next state.
+
+        The base section grower creates one point, like :meth:`next`.
+        """
+        return self.next()
+
     def post_next_point(self):
         """A method to perform actions after `self.next_point()` has been called."""
 
 
+class _AnalyticStop:
+    """The value at which a section stops for one criterion in ``analytic_stop`` mode.
+
+    Args:
+        threshold (float): The threshold drawn from a standard exponential distribution.
+        start (float): The value of the section when the threshold was drawn.
+    """
+
+    __slots__ = ("threshold", "start", "crit", "value")
+
+    def __init__(self, threshold, start):
+        self.threshold = threshold
+        self.start = start
+        self.crit = None
+        self.value = None
+
+    def update(self, crit, step_size, scale_prob):
+        """Compute the stop value for the given criterion."""
+        self.crit = crit
+        self.value = _analytic_stop_value(crit, self.start, self.threshold, step_size, scale_prob)
+
+
+def _analytic_stop_value(crit, start, threshold, step_size, scale_prob):
+    """Return the value at which a section stops in ``analytic_stop`` mode.
+
+    At each step of size ``s``, a section stops with the probability ``exp(-lambda * x)``, where
+    ``x = crit - value``, i.e. with the hazard ``h(x) = -log(1 - exp(-lambda * x))``. Taking the
+    value as continuous, the hazard rate is ``h(x) / s`` and its integral from ``x`` to infinity is
+    ``Li2(exp(-lambda * x)) / (lambda * s)``, where ``Li2`` is the dilogarithm. The section stops
+    when the integral of the hazard rate since the start of the section reaches the threshold. The
+    integral starts half a step before the first value (each step covers the values around its end),
+    which keeps the law close to the one of the per-step draws for coarse steps.
+
+    Args:
+        crit (float): The bifurcation or termination value.
+        start (float): The value of the section when the threshold was drawn.
+        threshold (float): The threshold drawn from a standard exponential distribution.
+        step_size (float): The mean increase of the value at each step.
+        scale_prob (float): The slope ``lambda`` of the exponential.
+
+    Returns:
+        float: The value at which the section stops.
+    """
+    if np.isinf(crit) and crit > 0:
+        return crit
+    if crit <= start:
+        return start
+    half_step = 0.5 * step_size
+    target = (
+        spence(-np.expm1(-scale_prob * (crit - start + half_step)))
+        + scale_prob * step_size * threshold
+    )
+    if target >= _DILOG_ONE:
+        return crit
+    # Li2(exp(-z)) <= exp(-z) * Li2(1), so the root is lower than log(Li2(1) / target)
+    scaled_distance = brentq(
+        lambda z: spence(-np.expm1(-z)) - target, 0.0, np.log(_DILOG_ONE / target)
+    )
+    return max(crit - scaled_distance / scale_prob - half_step, start)
+
+
 class SectionGrowerExponentialProba(SectionGrower):
     """Abstract class for exponentially decreasing bifurcation and termination probabilities.
 
     The parameter lambda defines the slope of the exponential.
     The parameter that follows the exponential must be defined in the derived class.
+
+    By default, a random number is drawn at each step and the section stops with the probability
+    ``exp(-(crit - value) * lambda)``. If the ``analytic_stop`` section parameter is set to
+    ``True``, the bifurcation and termination values of a section are instead sampled once from
+    the continuous version of this law (see :func:`_analytic_stop_value`), assuming the value
+    increases by the mean step size at each step, and the section then grows until it reaches
+    them. Only one random number is drawn per section and per criterion and a step is only a
+    comparison. This is a different model: the law is close to the one of the default mode when
+    the value increases by the step size at each step (as with path distances) but the
+    radial distances usually increase more slowly, so the sections stop closer to their
+    criteria. It also gives different morphologies than the default mode for the same seed.
+
+    If ``chunk_size`` is larger than 1, :meth:`next_chunk` creates up to ``chunk_size`` points at
+    once.
     """
 
+    _analytic_stops = None
+
+    def _stop_value(self, which, crit, value):
+        """Return the value at which the section stops for a criterion in analytic mode.
+
+        The threshold is drawn the first time it is needed and the stop value is computed again
+        only when the criterion changes.
+        """
+        if self._analytic_stops is None:
+            self._analytic_stops = {}
+        stop = self._analytic_stops.get(which)
+        if stop is None:
+            stop = self._analytic_stops[which] = _AnalyticStop(
+                self._rng.standard_exponential(), value
+            )
+        if stop.crit != crit:
+            stop.update(crit, self.step_size_distribution.mean_positive(), self.params.scale_prob)
+        return stop.value
+
+    def _reset_stop(self, which):
+        """Draw a new threshold the next time the criterion is checked.
+
+        The stop of a section can be ignored (e.g. when another section bifurcates), in which case
+        the section keeps growing.
+        """
+        del self._analytic_stops[which]
+
     def _check(self, value, which):
         crit = getattr(self.stop_criteria["TMD"], which)
         scale_prob = self.params.scale_prob
@@ -225,6 +465,11 @@ class SectionGrowerExponentialProba(SectionGrower):
         if x < 0:
             # no need to exponentiate, the comparison below automatically resolves to `True`
             return True
+        if self.params.analytic_stop:
+            if value < self._stop_value(which, crit, value):
+                return False
+            self._reset_stop(which)
+            return True
         # Check if close enough to exp( distance * scale_prob)
         return self._rng.random() < np.exp(-x * scale_prob)
 
@@ -249,6 +494,91 @@ class SectionGrowerExponentialProba(SectionGrower):
         """Placeholder for any function."""
         raise NotImplementedError("Attempt to use abstract class")
 
+    def get_vals(self, points, pathlengths):
+        """Placeholder for the vectorized version of :meth:`get_val`."""
+        raise NotImplementedError("Attempt to use abstract class")
+
+    def _check_chunk(self, values, which):
+        """Vectorized version of :meth:`_check`."""
+        crit = getattr(self.stop_criteria["TMD"], which)
+        scale_prob = self.params.scale_prob
+        assert scale_prob > 0
+        x = crit - values
+        if self.params.analytic_stop:
+            return values >= self._stop_value(which, crit, values[0])
+        return (x < 0) | (self._rng.random(len(x)) < np.exp(-np.maximum(x, 0) * scale_prob))
+
+    def next_chunk(self):
+        """Creates up to ``chunk_size`` points and returns the next state.
+
+        The step sizes and random components of the chunk are drawn by blocks, the points are
+        computed with a cumulative sum of the steps and the stop criteria are checked on all the
+        points at once. The chunk is then truncated at the first point where the section stops.
+        The growth follows the same random walk and stop probabilities as when the points are
+        created one at a time, but the random numbers are consumed in a different order and the
+        stop criteria (which can be updated when other sections bifurcate or terminate) are only
+        refreshed between chunks. The morphologies are thus reproducible for a given seed and
+        chunk size but different from the ones grown point by point.
+
+        The points are created one at a time if ``chunk_size`` is 1, if the section has
+        constraints or if :meth:`post_next_point` is overridden, so that it is called after each
+        point.
+        """
+        if (
+            self.chunk_size == 1
+            or (self.context is not None and self.context.get("constraints", []))
+            or type(self).post_next_point is not SectionGrower.post_next_point
+        ):
+            return self.next()
+
+        step_sizes, random_points = self.draw_steps(self.chunk_size)
+
+        # The directions only depend on the previous ones so they can be computed before the points
+        history = self.latest_directions.copy()
+        targeting = self.params.targeting * self.direction
+        directions = np.empty((self.chunk_size, 3))
+        for i, random_point in enumerate(random_points):
+            direction = (
+                targeting
+                + self.params.history * _history(history)
+                + self.params.randomness * random_point
+            )
+            direction /= vectorial_norm(direction)
+            history.append(direction)
+            directions[i] = direction
+
+        points = self.last_point + np.cumsum(step_sizes[:, np.newaxis] * directions, axis=0)
+        pathlengths = self.pathlength + np.cumsum(step_sizes)
+        values = self.get_vals(points, pathlengths)
+
+        bifurcations = self._check_chunk(values, "bif")
+        terminations = self._check_chunk(values, "term")
+        stops = np.flatnonzero(bifurcations | terminations)
+        n_points = stops[0] + 1 if len(stops) > 0 else self.chunk_size
+        if self.params.analytic_stop and len(stops) > 0:
+            for which, section_stops in [("bif", bifurcations), ("term", terminations)]:
+                if section_stops[stops[0]]:
+                    self._reset_stop(which)
+
+        if n_points == self.chunk_size:
+            self.latest_directions = history
+        else:
+            for direction in directions[:n_points]:
+                self.latest_directions.append(direction)
+        for point in points[:n_points]:
+            self.points.append(point)
+        self.pathlength = pathlengths[n_points - 1]
+
+        if len(stops) == 0:
+            return "continue"
+
+        if bifurcations[stops[0]]:
+            self.children = 2.0
+            return "bifurcate"
+
+        self.children = 0.0
+        return "terminate"
+
 
 class SectionGrowerTMD(SectionGrowerExponentialProba):
     """Class for the TMD section growth."""
@@ -257,6 +587,10 @@ class SectionGrowerTMD(SectionGrowerExponentialProba):
         """Returns radial distance."""
         return norm(np.subtract(self.last_point, self.stop_criteria["TMD"].ref))
 
+    def get_vals(self, points, pathlengths):
+        """Returns the radial distances of the given points."""
+        return vectorial_norm(points - self.stop_criteria["TMD"].ref, axis=1)
+
 
 class SectionGrowerPath(SectionGrowerExponentialProba):
     """Class for the TMD path based section growth."""
@@ -264,3 +598,7 @@ class SectionGrowerPath(SectionGrowerExponentialProba):
     def get_val(self):
         """Returns path distance."""
         return self.pathlength
+
+    def get_vals(self, points, pathlengths):
+        """Returns the given path distances."""
+        return pathlengths
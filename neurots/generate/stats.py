@@ -0,0 +1,91 @@
+"""Statistics collected during the growth of a cell."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from morphio import SectionType
+
+_CURRENT_STATS = ContextVar("neurots_growth_stats", default=None)
+
+
+def current_stats():
+    """Return the statistics of the cell currently grown or ``None`` if they are not collected."""
+    return _CURRENT_STATS.get()
+
+
+class GrowthStats:
+    """Statistics collected during the growth of a cell.
+
+    The statistics are collected by :meth:`neurots.generate.grower.NeuronGrower.grow` when the
+    grower is created with ``collect_stats=True``.
+
+    Attributes:
+        timings (dict[str, float]): The wall time (in seconds) spent in each phase of the growth.
+        n_sections (dict[str, int]): The number of sections of each neurite type.
+        n_points (dict[str, int]): The number of points of each neurite type (the first point of
+            each section, which is a duplicate of the last point of its parent, is included).
+        accept_reject_calls (int): The number of calls to the accept-reject algorithm.
+        accept_reject_tries (int): The total number of proposals made by the accept-reject
+            algorithm.
+        barcode_lookups (int): The number of queries made to the barcodes.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.n_sections = {}
+        self.n_points = {}
+        self.accept_reject_calls = 0
+        self.accept_reject_tries = 0
+        self.barcode_lookups = 0
+
+    @contextmanager
+    def activate(self):
+        """Make these statistics the ones updated by the growth algorithms."""
+        token = _CURRENT_STATS.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT_STATS.reset(token)
+
+    @contextmanager
+    def timer(self, phase):
+        """Add the wall time spent in the context to the timing of the given phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+
+    def record_accept_reject(self, n_tries):
+        """Record a call to the accept-reject algorithm which made ``n_tries`` proposals."""
+        self.accept_reject_calls += 1
+        self.accept_reject_tries += n_tries
+
+    def record_barcode_lookup(self):
+        """Record a query to a barcode."""
+        self.barcode_lookups += 1
+
+    def count_morphology(self, neuron):
+        """Count the sections and points of each neurite type of a morphology."""
+        self.n_sections = {}
+        self.n_points = {}
+        for section in neuron.iter():
+            neurite_type = SectionType(section.type).name
+            self.n_sections[neurite_type] = self.n_sections.get(neurite_type, 0) + 1
+            self.n_points[neurite_type] = self.n_points.get(neurite_type, 0) + len(section.points)
+
+    def to_dict(self):
+        """Return the statistics as a dictionary."""
+        return {
+            "timings": dict(self.timings),
+            "n_sections": dict(self.n_sections),
+            "n_points": dict(self.n_points),
+            "accept_reject_calls": self.accept_reject_calls,
+            "accept_reject_tries": self.accept_reject_tries,
+            "barcode_lookups": self.barcode_lookups,
+        }
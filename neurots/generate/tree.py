@@ -5,9 +5,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import copy
+import itertools
 import json
 import logging
+from bisect import bisect_left
+from bisect import insort
+from collections import ChainMap
 from collections import namedtuple
+from collections.abc import Mapping
+from types import MappingProxyType
 
 import numpy as np
 from morphio import PointLevel
@@ -15,6 +21,7 @@ from morphio import SectionType
 
 from neurots.generate.algorithms import basicgrower
 from neurots.generate.algorithms import tmdgrower
+from neurots.generate.builder import MorphologyBuilder
 from neurots.generate.section import SectionGrower
 from neurots.generate.section import SectionGrowerPath
 from neurots.generate.section import SectionGrowerTMD
@@ -46,15 +53,19 @@ section_growers = {
 
 # Section grower parameters
 SectionParameters = namedtuple(
-    "SectionParameters", ["randomness", "targeting", "scale_prob", "history"]
+    "SectionParameters",
+    ["randomness", "targeting", "scale_prob", "history", "analytic_stop"],
+    defaults=[False],
 )
 
 
-def _create_section_parameters(input_dict):
+def _create_section_parameters(input_dict, analytic_stop=False):
     """Create section parameters from input dictionary.
 
     Args:
         input_dict (dict): Input dictionary with ``randomness`` and ``targeting`` entries.
+        analytic_stop (bool): If set to ``True``, the bifurcation and termination distances of
+            the sections are sampled analytically.
 
     Returns:
         SectionParameters: The section parameters.
@@ -64,7 +75,11 @@ def _create_section_parameters(input_dict):
     history = np.clip(1.0 - randomness - targeting, 0.0, 1.0)
 
     parameters = SectionParameters(
-        randomness=randomness, targeting=targeting, scale_prob=LAMBDA, history=history
+        randomness=randomness,
+        targeting=targeting,
+        scale_prob=LAMBDA,
+        history=history,
+        analytic_stop=analytic_stop,
     )
 
     try:
@@ -78,11 +93,60 @@ def _create_section_parameters(input_dict):
         raise NeuroTSError(msg) from err
 
 
+class SectionSchedule:
+    """The active sections of a tree sorted by TMD bifurcation value.
+
+    The sections with the same bifurcation value are sorted by the order in which they were
+    added, so the order is the same as the one given by a stable sort of the active sections.
+    The sorted list is maintained incrementally: a section is only moved when it is added,
+    removed or when its bifurcation value changes.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._keys = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        """Return the number of scheduled sections."""
+        return len(self._entries)
+
+    def __contains__(self, section):
+        """Check whether a section is scheduled."""
+        return section in self._keys
+
+    def add(self, section):
+        """Schedule a section."""
+        key = (section.stop_criteria["TMD"].bif, next(self._counter))
+        self._keys[section] = key
+        insort(self._entries, (*key, section))
+
+    def remove(self, section):
+        """Remove a section from the schedule."""
+        del self._entries[bisect_left(self._entries, self._keys.pop(section))]
+
+    def update(self, section):
+        """Move a section if it is scheduled and its bifurcation value changed."""
+        if section not in self._keys:
+            return
+        bif, order = self._keys[section]
+        new_bif = section.stop_criteria["TMD"].bif
+        if new_bif != bif:
+            del self._entries[bisect_left(self._entries, (bif, order))]
+            self._keys[section] = (new_bif, order)
+            insort(self._entries, (new_bif, order, section))
+
+    def sections(self):
+        """Return the scheduled sections in order."""
+        return [entry[-1] for entry in self._entries]
+
+
 class TreeGrower:
     """Tree class.
 
     Args:
-        neuron (morphio.mut.Morphology): The morphology in which groups and points are stored.
+        neuron (morphio.mut.Morphology or neurots.generate.builder.MorphologyBuilder): The
+            morphology or the builder in which the sections are stored.
         initial_direction (list[float]): 3D vector that defines the starting direction of the tree.
         initial_point (list[float]): 3D vector that defines the starting point of the tree.
         parameters (dict): A dictionary with ``tree_type``, ``radius``, ``randomness`` and
@@ -90,8 +154,18 @@ class TreeGrower:
         distributions (dict): The distributions used.
         context (Any): The context used for the tree.
         random_generator (numpy.random.Generator): The random number generator to use.
+        sampling (str): The sampling mode of the step sizes and random directions of the
+            sections, see :class:`neurots.morphmath.sample.BufferedSampler`.
+        analytic_stop (bool): If set to ``True``, the bifurcation and termination distances of
+            the sections are sampled analytically, see
+            :class:`neurots.generate.section.SectionGrowerExponentialProba`.
+        chunk_size (int): The maximum number of points created at once by the TMD section growers,
+            see :meth:`neurots.generate.section.SectionGrowerExponentialProba.next_chunk`.
+        barcode_templates (neurots.generate.algorithms.barcode.BarcodeTemplates): The templates
+            used to build the barcodes of the input persistence diagrams.
     """
 
+    # pylint: disable-msg=too-many-arguments
     def __init__(
         self,
         neuron,
@@ -101,6 +175,10 @@ class TreeGrower:
         distributions,
         context=None,
         random_generator=np.random,
+        sampling="exact",
+        analytic_stop=False,
+        chunk_size=1,
+        barcode_templates=None,
     ):
         """Constructor of TreeGrower object."""
         self.neuron = neuron
@@ -110,13 +188,26 @@ class TreeGrower:
         self.params = parameters
         self.distr = distributions
         self.active_sections = []
+        self.root_section = None
+        self._schedule = SectionSchedule()
         self.context = context
+        self._section_contexts = {}
         self._rng = random_generator
+        self.chunk_size = chunk_size
+        self.barcode_templates = barcode_templates
 
         # Creates the distribution from which the segment lengths
         # To sample a new seg_len call self.seg_len.draw()
         self.seg_length_distr = sample.Distr(self.params["step_size"], random_generator=self._rng)
-        self._section_parameters = _create_section_parameters(parameters)
+        if sampling == "buffered":
+            self.sampler = sample.BufferedSampler(self.seg_length_distr, self._rng)
+        elif sampling == "exact":
+            self.sampler = None
+        else:
+            raise NeuroTSError(
+                f"The sampling mode must be one of {sample.SAMPLING_MODES} (got '{sampling}')"
+            )
+        self._section_parameters = _create_section_parameters(parameters, analytic_stop)
         self.growth_algo = self._initialize_algorithm()
 
     def _initialize_algorithm(self):
@@ -129,6 +220,7 @@ class TreeGrower:
             start_point=self.point,
             context=self.context,
             random_generator=self._rng,
+            barcode_templates=self.barcode_templates,
         )
 
         stop, num_sec = growth_algo.initialize()
@@ -137,7 +229,7 @@ class TreeGrower:
             parent=None,
             direction=self.direction,
             first_point=list(self.point),
-            stop=copy.deepcopy(stop),
+            stop=stop,
             process="major",
             pathlength=0.0,
             children=2 if num_sec > 1 else 0,
@@ -147,6 +239,36 @@ class TreeGrower:
 
         return growth_algo
 
+    def _section_context(self, process):
+        """Return the context given to the sections of the given process.
+
+        When the context is a mapping, the sections share a read-only view of it, in which the
+        constraints are filtered according to the tree type and the process. The views are built
+        once per process, so the context is never copied. Other contexts are deep-copied for each
+        section.
+        """
+        if not isinstance(self.context, Mapping):
+            return copy.deepcopy(self.context)
+
+        if process not in self._section_contexts:
+            context = self.context
+            if "constraints" in context:
+                context = ChainMap(
+                    {
+                        "constraints": [
+                            constraint
+                            for constraint in context["constraints"]
+                            if "section_prob" in constraint
+                            and SectionType(self.params["tree_type"]).name
+                            in constraint.get("neurite_types", [])
+                            and process in constraint.get("processes", ["major", "secondary"])
+                        ]
+                    },
+                    context,
+                )
+            self._section_contexts[process] = MappingProxyType(context)
+        return self._section_contexts[process]
+
     def add_section(
         self, parent, direction, first_point, stop, pathlength, process=None, children=0
     ):
@@ -164,16 +286,7 @@ class TreeGrower:
             children (int): The number of children.
         """
         SGrower = section_growers[self.params["metric"]]
-        context = copy.deepcopy(self.context)
-        if "constraints" in self.context:  # pragma: no cover
-            context["constraints"] = [
-                constraint
-                for constraint in self.context["constraints"]
-                if "section_prob" in constraint
-                and SectionType(self.params["tree_type"]).name
-                in constraint.get("neurite_types", [])
-                and process in constraint.get("processes", ["major", "secondary"])
-            ]
+        context = self._section_context(process)
 
         sec_grower = SGrower(
             parent=parent,
@@ -182,16 +295,30 @@ class TreeGrower:
             parameters=self._section_parameters,
             children=children,
             process=process,
-            stop_criteria=copy.deepcopy(stop),
+            stop_criteria=dict(stop),
             step_size_distribution=self.seg_length_distr,
             pathlength=pathlength,
             context=context,
             random_generator=self._rng,
+            sampler=self.sampler,
+            chunk_size=self.chunk_size,
         )
 
-        self.active_sections.append(sec_grower)
+        self._activate_section(sec_grower)
         return sec_grower
 
+    def _activate_section(self, section_grower):
+        """Add a section to the active sections and schedule it if it has TMD stop criteria."""
+        self.active_sections.append(section_grower)
+        if "TMD" in section_grower.stop_criteria:
+            self._schedule.add(section_grower)
+
+    def _deactivate_section(self, section_grower):
+        """Remove a section from the active sections and from the schedule."""
+        self.active_sections.remove(section_grower)
+        if section_grower in self._schedule:
+            self._schedule.remove(section_grower)
+
     def end(self):
         """Ends the growth."""
         return not bool(self.active_sections)
@@ -208,13 +335,14 @@ class TreeGrower:
         return np.copy(secs)[ordered_list]
 
     def append_section(self, section):
-        """Append section to the MorphIO neuron.
+        """Append section to the MorphIO neuron or to the morphology builder.
 
         Args:
             section (SectionGrowerPath): The section that is going to be appended.
 
         Returns:
-            section (morphio.Section): The new appended section.
+            section (morphio.Section or neurots.generate.builder.BuilderSection): The new appended
+            section.
         """
         if section.parent:
             append_fun = section.parent.append_section
@@ -224,27 +352,36 @@ class TreeGrower:
         if L.level == logging.DEBUG:  # pragma: no cover
             data = {
                 "parent": section.parent.id if section.parent else None,
-                "coord": np.vstack(section.points).tolist(),
+                "coord": section.points.data.tolist(),
                 "type": int(SectionType(self.params["tree_type"])),
             }
             L.debug("appended_data=%s", json.dumps(data))
 
-        return append_fun(
-            PointLevel(
-                np.array(section.points).tolist(),
-                [DEFAULT_DIAMETER] * len(section.points),
-            ),
-            SectionType(self.params["tree_type"]),
-        )
+        if isinstance(self.neuron, MorphologyBuilder):
+            # The diameters are set when the morphology is built
+            new_section = append_fun(section.points.data, SectionType(self.params["tree_type"]))
+        else:
+            new_section = append_fun(
+                PointLevel(
+                    section.points.data,
+                    np.full(len(section.points), DEFAULT_DIAMETER),
+                ),
+                SectionType(self.params["tree_type"]),
+            )
+
+        if not section.parent:
+            self.root_section = new_section
+        return new_section
 
     def next_point(self):
         """Operates the tree growth according to the selected algorithm."""
         if not isinstance(self.growth_algo, basicgrower.TrunkAlgo):
-            ordered_sections = self.order_per_bif(self.active_sections)
+            # The sections are ordered per bifurcation (as with order_per_bif())
+            ordered_sections = self._schedule.sections()
         else:
             # TrunkAlgo does not keep track of the bifurcations so it is not
             # possible to order per bifurcation
-            ordered_sections = np.copy(self.active_sections)
+            ordered_sections = list(self.active_sections)
 
         for section_grower in ordered_sections:
             # the current section_grower is generated
@@ -255,14 +392,20 @@ class TreeGrower:
                 # it needs to revert the value after getting the state to preserve
                 # the original topology
                 _term = section_grower.stop_criteria["TMD"].term
-                section_grower.stop_criteria["TMD"].term = self.params["major_termination_length"]
+                section_grower.stop_criteria["TMD"] = section_grower.stop_criteria["TMD"]._replace(
+                    term=self.params["major_termination_length"]
+                )
             else:
                 _term = None
 
             state = self.growth_algo.extend(section_grower)
+            # The bifurcation can be updated when the section is extended
+            self._schedule.update(section_grower)
 
             if _term is not None:
-                section_grower.stop_criteria["TMD"].term = _term
+                section_grower.stop_criteria["TMD"] = section_grower.stop_criteria["TMD"]._replace(
+                    term=_term
+                )
 
             if state != "continue":
                 section = self.append_section(section_grower)
@@ -287,12 +430,12 @@ class TreeGrower:
                         child.latest_directions.append(latest)
                         # Generate the first point of the section
                         child.first_point()
-                    self.active_sections.remove(section_grower)
+                    self._deactivate_section(section_grower)
 
                 elif state == "terminate":
                     # the current section_grower terminates
                     self.growth_algo.terminate(section_grower)
-                    self.active_sections.remove(section_grower)
+                    self._deactivate_section(section_grower)
 
                 else:
                     raise NeuroTSError(f"Unknown state during growth: {state}")  # pragma: no cover
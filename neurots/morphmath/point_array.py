@@ -13,21 +13,41 @@ class DynamicPointArray:
     It is used by algorithms that require the points as a :class:`numpy.array` and append points
     incrementally.
 
+    The points can be accessed like the ones of a list (indexing and iteration) and the filled
+    part of the buffer is available without copy through :attr:`data`.
+
     Args:
         initial_capacity (int): The initial capacity of the array.
         resize_factor (float): The factor used to increase the capacity of the array.
+        dtype (numpy.dtype): The type of the coordinates.
     """
 
-    def __init__(self, initial_capacity=100000, resize_factor=2.0):
+    def __init__(self, initial_capacity=100000, resize_factor=2.0, dtype=np.float32):
         self._size = 0
         self._capacity = initial_capacity
         self._resize_factor = resize_factor
-        self._data = np.empty((initial_capacity, 3), dtype=np.float32)
+        self._data = np.empty((initial_capacity, 3), dtype=dtype)
 
     def __len__(self):
         """Return the length of the array."""
         return self._size
 
+    def __getitem__(self, index):
+        """Return the point(s) at the given index (as views on the buffer)."""
+        return self._data[: self._size][index]
+
+    def __setitem__(self, index, value):
+        """Set the point(s) at the given index."""
+        self._data[: self._size][index] = value
+
+    def __iter__(self):
+        """Iterate over the points."""
+        return iter(self._data[: self._size])
+
+    def __array__(self, dtype=None):
+        """Return the filled data as a numpy array."""
+        return np.asarray(self._data[: self._size], dtype=dtype)
+
     @property
     def capacity(self):
         """Returns the current capacity of the array."""
@@ -40,7 +60,7 @@ class DynamicPointArray:
 
     def _resize_capacity(self):
         """Resizes the capacity when the size equals capacity."""
-        self._capacity = int(self._resize_factor * self._capacity)
+        self._capacity = max(int(self._resize_factor * self._capacity), self._capacity + 1)
         self._data = np.resize(self._data, (self._capacity, 3))
 
     def append(self, point):
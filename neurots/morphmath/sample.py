@@ -5,6 +5,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import numpy as np
+from scipy import stats
+
+from neurots.morphmath.utils import get_random_points
+
+SAMPLING_MODES = ("exact", "buffered")
+"""The available sampling modes (see :class:`BufferedSampler`)."""
+
+DEFAULT_BLOCK_SIZE = 256
+"""The number of random values drawn at once by a :class:`BufferedSampler`."""
 
 
 class Distr:
@@ -40,6 +49,7 @@ class Distr:
 
     def set_distribution(self, params):
         """Return a statistical distribution according to input parameters."""
+        self._mean_positive = None
         # If distribution is a statistical distribution
         if self.type != "data":
             name, self.loc, self.scale = getattr(self, self.type)(params)
@@ -80,6 +90,104 @@ class Distr:
             val = self.loc + self.scale * self.distribution()
         return val
 
+    def mean_positive(self):
+        """Return the mean of the numbers returned by :meth:`draw_positive`."""
+        if self._mean_positive is None:
+            self._mean_positive = self._compute_mean_positive()
+        return self._mean_positive
+
+    def _compute_mean_positive(self):
+        if self.type == "data":
+            positives = np.where(self.distribution["bins"] > 0)
+            weights = self.distribution["weights"][positives]
+            return np.sum(self.distribution["bins"][positives] * weights) / np.sum(weights)
+
+        if self.scale == 0:
+            return self.loc
+
+        if self.type == "norm":
+            # Mean of a normal distribution truncated to the positive values
+            lower = -self.loc / self.scale
+            return self.loc + self.scale * stats.norm.pdf(lower) / stats.norm.sf(lower)
+        if self.type == "uniform":
+            return (max(self.loc, 0) + self.loc + self.scale) / 2
+        # The exponential distribution is memoryless
+        return max(self.loc, 0) + self.scale
+
+    def draw_positive_block(self, size):
+        """Return an array of positive sampled numbers.
+
+        The numbers follow the same distribution as the ones returned by :meth:`draw_positive`
+        but they are drawn with one call to the random number generator. The negative values are
+        discarded, so the returned array can contain less than ``size`` values.
+        """
+        if self.type == "data":
+            positives = np.where(self.distribution["bins"] > 0)
+            return self._rng.choice(
+                self.distribution["bins"][positives],
+                size=size,
+                p=self.distribution["weights"][positives],
+            )
+
+        if self.scale == 0:
+            return np.full(size, self.draw_positive())
+
+        values = self.loc + self.scale * self.distribution(size=size)
+        return values[values > 0]
+
+
+class BufferedSampler:
+    """Serve step sizes and random unit vectors drawn by blocks.
+
+    Drawing scalar random numbers one at a time is slow, so this sampler draws blocks of
+    ``block_size`` step sizes and random directions with vectorized calls and serves them from
+    buffers. The values follow the same distributions as the ones of
+    :meth:`Distr.draw_positive` and :func:`neurots.morphmath.utils.get_random_point` but the
+    random numbers are consumed in a different order.
+
+    .. note::
+
+        A morphology grown in ``buffered`` mode is thus reproducible for a given seed and block
+        size but is different from the one grown in ``exact`` mode (which is the default mode and
+        draws each value when it is needed, as in previous versions).
+
+    Args:
+        step_size_distribution (Distr): The step size distribution.
+        random_generator (numpy.random.Generator): The random number generator to use.
+        block_size (int): The number of values drawn at once.
+    """
+
+    def __init__(
+        self, step_size_distribution, random_generator=np.random, block_size=DEFAULT_BLOCK_SIZE
+    ):
+        if block_size < 1:
+            raise ValueError(f"The block size must be a positive integer (got {block_size})")
+        self.step_size_distribution = step_size_distribution
+        self.block_size = block_size
+        self._rng = random_generator
+        self._step_sizes = np.empty(0)
+        self._step_size_index = 0
+        self._directions = np.empty((0, 3))
+        self._direction_index = 0
+
+    def step_size(self):
+        """Return a positive step size."""
+        while self._step_size_index >= len(self._step_sizes):
+            self._step_sizes = self.step_size_distribution.draw_positive_block(self.block_size)
+            self._step_size_index = 0
+        value = self._step_sizes[self._step_size_index]
+        self._step_size_index += 1
+        return value
+
+    def random_direction(self):
+        """Return a random unit vector."""
+        if self._direction_index >= len(self._directions):
+            self._directions = get_random_points(self.block_size, random_generator=self._rng)
+            self._direction_index = 0
+        value = self._directions[self._direction_index]
+        self._direction_index += 1
+        return value
+
 
 def d_transform(distr, funct, **kwargs):
     """Transform a distribution according to a selected function."""
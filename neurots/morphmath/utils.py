@@ -30,6 +30,20 @@ def get_random_point(D=1.0, random_generator=np.random):
     return np.array((x, y, z))
 
 
+def get_random_points(n, D=1.0, random_generator=np.random):
+    """Return the 3-d coordinates of ``n`` random points.
+
+    This is the vectorized version of :func:`get_random_point`: the points are uniformly
+    distributed on the sphere of radius D but the random numbers are drawn in a different order.
+    """
+    phi = random_generator.uniform(0.0, 2.0 * np.pi, n)
+    theta = np.arccos(random_generator.uniform(-1.0, 1.0, n))
+
+    sn_theta = np.sin(theta)
+
+    return D * np.column_stack((np.cos(phi) * sn_theta, np.sin(phi) * sn_theta, np.cos(theta)))
+
+
 def norm(vector):
     """Return the norm of the numpy array."""
     return np.sqrt(vector.dot(vector))
@@ -0,0 +1,13 @@
+"""Module to synthesize populations of cells."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from neurots.population.manifest import RunManifest  # noqa
+from neurots.population.seeds import PopulationSeeds  # noqa
+from neurots.population.synthesis import synthesize_population  # noqa
+from neurots.population.writers import BackgroundWriter  # noqa
+from neurots.population.writers import ContainerWriter  # noqa
+from neurots.population.writers import DirectoryWriter  # noqa
+from neurots.population.writers import write_population  # noqa
@@ -0,0 +1,68 @@
+"""Conversion of morphologies to and from plain arrays."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+from morphio import PointLevel
+from morphio import SectionType
+from morphio import SomaType
+from morphio.mut import Morphology
+
+
+def morphology_to_arrays(neuron, section_ids=()):
+    """Convert a morphology into a picklable dictionary of arrays.
+
+    The sections are stored in depth-first order, so the given section IDs are converted to the
+    IDs the sections will have once the morphology is unpacked.
+
+    Args:
+        neuron (morphio.mut.Morphology or morphio.Morphology): The morphology to convert.
+        section_ids (list[int]): Section IDs to convert (``None`` values are kept).
+
+    Returns:
+        tuple[dict, list[int]]: The arrays describing the morphology and the converted section IDs.
+    """
+    sections = list(neuron.iter())
+    index = {section.id: i for i, section in enumerate(sections)}
+    offsets = np.cumsum([0] + [len(section.points) for section in sections])
+    return {
+        "soma_type": int(neuron.soma.type),
+        "soma_points": np.array(neuron.soma.points),
+        "soma_diameters": np.array(neuron.soma.diameters),
+        "offsets": offsets,
+        "types": np.array([int(section.type) for section in sections], dtype=int),
+        "parents": np.array(
+            [-1 if section.is_root else index[section.parent.id] for section in sections],
+            dtype=int,
+        ),
+        "points": (
+            np.vstack([section.points for section in sections]) if sections else np.empty((0, 3))
+        ),
+        "diameters": (
+            np.hstack([section.diameters for section in sections]) if sections else np.empty(0)
+        ),
+    }, [index[i] if i is not None else None for i in section_ids]
+
+
+def arrays_to_morphology(data):
+    """Build a morphology from a dictionary created by :func:`morphology_to_arrays`."""
+    neuron = Morphology()
+    neuron.soma.points = data["soma_points"]
+    neuron.soma.diameters = data["soma_diameters"]
+    neuron.soma.type = SomaType(data["soma_type"])
+
+    sections = []
+    offsets = data["offsets"]
+    for i, (section_type, parent) in enumerate(zip(data["types"], data["parents"])):
+        point_level = PointLevel(
+            data["points"][offsets[i] : offsets[i + 1]],
+            data["diameters"][offsets[i] : offsets[i + 1]],
+        )
+        if parent == -1:
+            section = neuron.append_root_section(point_level, SectionType(section_type))
+        else:
+            section = sections[parent].append_section(point_level, SectionType(section_type))
+        sections.append(section)
+    return neuron
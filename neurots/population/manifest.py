@@ -0,0 +1,142 @@
+"""Manifest used to resume the synthesis of a population."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+from numpy.random import SeedSequence
+
+from neurots.population.seeds import PopulationSeeds
+
+L = logging.getLogger(__name__)
+
+
+class RunManifest:
+    """Record of the cells of a population that were grown and written.
+
+    The manifest is a JSON Lines file. The first line contains the root seed of the population and
+    each following line contains the ID and the spawn key of a completed cell. The file is only
+    appended to, so it stays valid if the job is interrupted (an incomplete last line is ignored).
+
+    When the manifest already exists, its root seed is used, so the remaining cells are grown with
+    the same seeds as in the interrupted run and the resumed population is the same as if it was
+    synthesized at once. The cells written by the interrupted run must then be kept by the writer
+    of the resumed run, so a :class:`neurots.population.writers.ContainerWriter` must not be
+    opened with the mode ``'w'`` (see :func:`neurots.population.writers.write_population`).
+
+    Args:
+        path (str): The path to the manifest file.
+        seed (None, int, numpy.random.SeedSequence or neurots.population.seeds.PopulationSeeds):
+            The seed of the population. If the manifest already exists, this seed must either be
+            ``None`` or be the same as the one stored in the manifest.
+    """
+
+    def __init__(self, path, seed=None):
+        self.path = Path(path)
+        self.completed = set()
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            self.seeds = self._load(seed)
+            L.info("Resume from %s: %s cells already completed", self.path, len(self.completed))
+        else:
+            self.seeds = PopulationSeeds(seed)
+            self._append(
+                {
+                    "entropy": self.seeds.entropy,
+                    "spawn_key": list(self.seeds.seed_sequence.spawn_key),
+                    "pool_size": self.seeds.seed_sequence.pool_size,
+                }
+            )
+
+    def _load(self, seed):
+        with self.path.open(encoding="utf-8") as f:
+            content = f.read()
+        lines = content.splitlines()
+
+        records = []
+        for num, line in enumerate(lines):
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as exc:
+                if num < len(lines) - 1:
+                    raise ValueError(f"The manifest {self.path} is corrupted") from exc
+                L.warning("Ignore the incomplete last line of the manifest %s", self.path)
+
+        if not records:
+            raise ValueError(f"The manifest {self.path} has no valid header")
+        if not content.endswith("\n"):
+            # Rewrite the valid records so the next ones are not appended to an incomplete line
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(
+                "".join(json.dumps(record) + "\n" for record in records), encoding="utf-8"
+            )
+            tmp_path.replace(self.path)
+        header = records[0]
+        seeds = PopulationSeeds(
+            SeedSequence(
+                header["entropy"], spawn_key=header["spawn_key"], pool_size=header["pool_size"]
+            )
+        )
+        if seed is not None:
+            seed = PopulationSeeds(seed).seed_sequence
+            if (seed.entropy, tuple(seed.spawn_key)) != (
+                seeds.entropy,
+                tuple(seeds.seed_sequence.spawn_key),
+            ):
+                raise ValueError(
+                    f"The seed {seed.entropy} does not match the seed {seeds.entropy} stored in "
+                    f"the manifest {self.path}"
+                )
+
+        for record in records[1:]:
+            cell_id = record["cell_id"]
+            if tuple(record["spawn_key"]) != seeds.cell_seed(cell_id).spawn_key:
+                raise ValueError(
+                    f"The spawn key of the cell {cell_id} stored in the manifest {self.path} does "
+                    "not match the seed of the population"
+                )
+            self.completed.add(cell_id)
+        return seeds
+
+    def _append(self, *records):
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+    def is_completed(self, cell_id):
+        """Check whether a cell was already completed."""
+        return cell_id in self.completed
+
+    def remaining(self, cell_ids):
+        """Return the IDs of the cells that were not completed yet.
+
+        Args:
+            cell_ids (int or list[int]): The number of cells of the population or their IDs.
+
+        Returns:
+            list[int]: The IDs of the cells that remain to be synthesized.
+        """
+        if isinstance(cell_ids, (int, np.integer)):
+            cell_ids = range(cell_ids)
+        return [cell_id for cell_id in cell_ids if cell_id not in self.completed]
+
+    def record(self, cell_ids):
+        """Record that some cells were grown and written.
+
+        Args:
+            cell_ids (list[int]): The IDs of the completed cells.
+        """
+        cell_ids = [int(cell_id) for cell_id in cell_ids if cell_id not in self.completed]
+        if not cell_ids:
+            return
+        self._append(
+            *(
+                {"cell_id": cell_id, "spawn_key": list(self.seeds.cell_seed(cell_id).spawn_key)}
+                for cell_id in cell_ids
+            )
+        )
+        self.completed.update(cell_ids)
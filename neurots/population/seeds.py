@@ -0,0 +1,69 @@
+"""Reproducible random streams for the cells of a population."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+from numpy.random import SeedSequence
+
+
+class PopulationSeeds:
+    """Manager of the independent random streams of the cells of a population.
+
+    The seed of each cell is the child of a root :class:`numpy.random.SeedSequence` whose spawn key
+    is the cell ID. It is thus the same as the one returned by ``SeedSequence(seed).spawn(n)`` but
+    it can be computed directly from the cell ID, so the morphology of a cell does not depend on the
+    number of processes or nodes used to synthesize the population, nor on the order in which the
+    cells are grown. A single cell can thus be reproduced from the root entropy and its ID.
+
+    The seeds returned by :meth:`cell_seed` can be passed as the ``rng_or_seed`` argument of
+    :class:`neurots.generate.grower.NeuronGrower` and
+    :class:`neurots.astrocyte.grower.AstrocyteGrower`.
+
+    Args:
+        seed (None, int, list[int], numpy.random.SeedSequence or PopulationSeeds): The seed of the
+            population. If ``None``, fresh entropy is pulled from the OS, it can then be retrieved
+            with :attr:`entropy` to reproduce the population.
+    """
+
+    def __init__(self, seed=None):
+        if isinstance(seed, PopulationSeeds):
+            seed = seed.seed_sequence
+        if not isinstance(seed, SeedSequence):
+            seed = SeedSequence(seed)
+        self.seed_sequence = seed
+
+    @property
+    def entropy(self):
+        """Return the entropy of the root seed sequence."""
+        return self.seed_sequence.entropy
+
+    def cell_seed(self, cell_id):
+        """Return the seed sequence of a given cell.
+
+        Args:
+            cell_id (int): The ID of the cell.
+
+        Returns:
+            numpy.random.SeedSequence: The seed sequence of the cell.
+        """
+        if cell_id < 0:
+            raise ValueError(f"The cell ID must be a non-negative integer (got {cell_id})")
+        root = self.seed_sequence
+        return SeedSequence(
+            root.entropy,
+            spawn_key=tuple(root.spawn_key) + (int(cell_id),),
+            pool_size=root.pool_size,
+        )
+
+    def cell_rng(self, cell_id):
+        """Return a new random number generator for a given cell.
+
+        Args:
+            cell_id (int): The ID of the cell.
+
+        Returns:
+            numpy.random.Generator: The random number generator of the cell.
+        """
+        return np.random.default_rng(self.cell_seed(cell_id))
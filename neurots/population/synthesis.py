@@ -0,0 +1,189 @@
+"""Synthesis of populations of cells sharing the same inputs."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import inspect
+import logging
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+
+import numpy as np
+
+from neurots.generate.grower import NeuronGrower
+from neurots.generate.grower import PreparedInputs
+from neurots.population.arrays import arrays_to_morphology
+from neurots.population.arrays import morphology_to_arrays
+from neurots.population.seeds import PopulationSeeds
+
+L = logging.getLogger(__name__)
+
+TASKS_PER_WORKER = 4
+"""The maximum number of cells submitted to the pool per worker at any time."""
+
+_WORKER_INPUTS = {}
+
+
+def _grow_cell(inputs, cell_id, seed):
+    """Grow one cell from the shared inputs."""
+    grower = inputs["grower_class"](
+        inputs["prepared_inputs"],
+        None,
+        context=inputs["context"],
+        external_diametrizer=inputs["external_diametrizer"],
+        rng_or_seed=seed,
+        **inputs["grower_kwargs"],
+    )
+    neuron = grower.grow()
+    return cell_id, neuron, grower.apical_sections
+
+
+def _init_worker(inputs):
+    """Store the inputs that are shipped once to each worker process."""
+    _WORKER_INPUTS.clear()
+    _WORKER_INPUTS.update(inputs)
+
+
+def _grow_cell_in_worker(cell_id, seed):
+    """Grow one cell in a worker process and pack it so it can be sent to the main process."""
+    cell_id, neuron, apical_sections = _grow_cell(_WORKER_INPUTS, cell_id, seed)
+    data, apical_sections = morphology_to_arrays(neuron, apical_sections)
+    return cell_id, data, apical_sections
+
+
+def _iter_futures(executor, tasks, ordered, max_pending):
+    """Submit the tasks to the executor and yield their results.
+
+    At most ``max_pending`` tasks are submitted at the same time, so the memory usage does not
+    depend on the number of tasks.
+    """
+    tasks = iter(tasks)
+    pending = deque() if ordered else set()
+
+    def submit_next():
+        try:
+            task = next(tasks)
+        except StopIteration:
+            return False
+        future = executor.submit(_grow_cell_in_worker, *task)
+        if ordered:
+            pending.append(future)
+        else:
+            pending.add(future)
+        return True
+
+    while len(pending) < max_pending and submit_next():
+        pass
+
+    while pending:
+        if ordered:
+            done = [pending.popleft()]
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending.difference_update(done)
+        for future in done:
+            yield future.result()
+            submit_next()
+
+
+def synthesize_population(
+    input_parameters,
+    input_distributions,
+    n_cells,
+    workers=None,
+    ordered=True,
+    seed=None,
+    context=None,
+    external_diametrizer=None,
+    skip_preprocessing=None,
+    grower_class=NeuronGrower,
+    **grower_kwargs,
+):  # pylint: disable=too-many-locals
+    """Synthesize a population of cells sharing the same inputs.
+
+    The inputs are loaded, validated and preprocessed only once (see
+    :class:`neurots.generate.grower.PreparedInputs`), then shipped once to each worker of a process
+    pool which grows the cells.
+
+    Args:
+        input_parameters (dict, str or neurots.generate.grower.PreparedInputs): The user-defined
+            parameters, the path to a JSON file containing them or the already prepared inputs, in
+            which case ``input_distributions`` should be ``None``.
+        input_distributions (dict or str): The distributions extracted from biological data or
+            the path to a JSON file containing them.
+        n_cells (int or list[int]): The number of cells to synthesize or the IDs of the cells to
+            synthesize (e.g. to synthesize only one shard of a population).
+        workers (int): The number of worker processes. If ``None``, the number of CPUs is used. If
+            lower or equal to 1, the cells are grown in the current process.
+        ordered (bool): If set to ``True``, the cells are yielded in the order of their IDs,
+            otherwise they are yielded as soon as they are completed.
+        seed (int, numpy.random.SeedSequence or neurots.population.seeds.PopulationSeeds): The
+            seed used to create the random number generator of each cell (see
+            :class:`neurots.population.seeds.PopulationSeeds`). The morphology of a cell only
+            depends on this seed and on its ID, not on the number of workers or on the shard it
+            belongs to.
+        context (Any): An object containing contextual information. It must be picklable if
+            ``workers > 1``.
+        external_diametrizer (Callable): Diametrizer function for external diametrizer module. It
+            must be picklable if ``workers > 1``.
+        skip_preprocessing (bool): If set to ``False``, the parameters and distributions are
+            preprocessed with registered validator and preprocessors. If ``None``, the default of
+            ``grower_class`` is used (the inputs of an
+            :class:`neurots.astrocyte.grower.AstrocyteGrower` are not preprocessed, since they do
+            not follow the schema of the neuron inputs).
+        grower_class (type): The class used to grow each cell, e.g.
+            :class:`neurots.generate.grower.NeuronGrower` or
+            :class:`neurots.astrocyte.grower.AstrocyteGrower`.
+        **grower_kwargs: Other keyword arguments passed to the grower.
+
+    Yields:
+        tuple[int, morphio.mut.Morphology, list[int]]: The cell ID, the grown morphology and the IDs
+        of its apical sections.
+    """
+    if isinstance(input_parameters, PreparedInputs):
+        if input_distributions is not None:
+            raise ValueError(
+                "The 'input_distributions' argument must be None when the inputs are prepared."
+            )
+        prepared_inputs = input_parameters
+    else:
+        if skip_preprocessing is None:
+            skip_preprocessing = (
+                inspect.signature(grower_class).parameters["skip_preprocessing"].default
+            )
+        prepared_inputs = PreparedInputs(
+            input_parameters, input_distributions, skip_preprocessing=skip_preprocessing
+        )
+
+    inputs = {
+        "prepared_inputs": prepared_inputs,
+        "context": context,
+        "external_diametrizer": external_diametrizer,
+        "grower_class": grower_class,
+        "grower_kwargs": grower_kwargs,
+    }
+    seeds = PopulationSeeds(seed)
+    cell_ids = range(n_cells) if isinstance(n_cells, (int, np.integer)) else list(n_cells)
+    tasks = ((cell_id, seeds.cell_seed(cell_id)) for cell_id in cell_ids)
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    if workers <= 1:
+        L.debug("Synthesize %s cells in the current process", len(cell_ids))
+        for task in tasks:
+            yield _grow_cell(inputs, *task)
+        return
+
+    L.debug("Synthesize %s cells with %s workers", len(cell_ids), workers)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(inputs,)
+    ) as executor:
+        for cell_id, data, apical_sections in _iter_futures(
+            executor, tasks, ordered, TASKS_PER_WORKER * workers
+        ):
+            yield cell_id, arrays_to_morphology(data), apical_sections
@@ -0,0 +1,337 @@
+"""Writers used to store the cells of a population."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import queue
+import threading
+from pathlib import Path
+
+import h5py
+import numpy as np
+
+from neurots.population.arrays import morphology_to_arrays
+
+L = logging.getLogger(__name__)
+
+H5_VERSION = [1, 3]
+"""The version of the H5 format used to write the morphologies."""
+
+_SOMA_TYPE = 1
+
+_STOP = object()
+
+
+def morphology_to_h5_arrays(neuron):
+    """Convert a morphology into the ``points`` and ``structure`` arrays of the H5 format.
+
+    Args:
+        neuron (morphio.mut.Morphology or morphio.Morphology): The morphology to convert.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The ``points`` array containing the coordinates and
+        diameters of the soma and section points and the ``structure`` array containing the offset,
+        the type and the parent of the soma and of each section.
+    """
+    data, _ = morphology_to_arrays(neuron)
+    soma_points = np.column_stack([data["soma_points"], data["soma_diameters"]]).reshape(-1, 4)
+    section_points = np.column_stack([data["points"], data["diameters"]]).reshape(-1, 4)
+    points = np.vstack([soma_points, section_points]).astype(np.float32)
+
+    parents = data["parents"]
+    if len(soma_points) > 0:
+        # The soma is the first row of the structure, so the section indices are shifted
+        soma_structure = [[0, _SOMA_TYPE, -1]]
+        parents = np.where(parents == -1, 0, parents + 1)
+    else:
+        soma_structure = np.empty((0, 3))
+    section_structure = np.column_stack(
+        [data["offsets"][:-1] + len(soma_points), data["types"], parents]
+    )
+    structure = np.vstack([soma_structure, section_structure]).astype(np.int32)
+    return points, structure
+
+
+class DirectoryWriter:
+    """Write each cell of a population in its own file.
+
+    Args:
+        output_dir (str): The directory in which the files are written.
+        extension (str): The extension of the files, which defines the format of the files.
+    """
+
+    def __init__(self, output_dir, extension="h5"):
+        self.output_dir = Path(output_dir)
+        self.extension = extension.lstrip(".")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(self, name, neuron):
+        """Write a morphology in the file ``<output_dir>/<name>.<extension>``."""
+        neuron.write(str(self.output_dir / f"{name}.{self.extension}"))
+
+    def flush(self):
+        """Nothing has to be done to flush this writer since each file is written at once."""
+
+    def close(self):
+        """Nothing has to be done to close this writer."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ContainerWriter:
+    """Write the cells of a population in a single HDF5 container.
+
+    Each cell is stored in a group named after the cell, with the same layout as a H5 morphology
+    file, so the morphologies can be loaded with :class:`morphio.Collection`. The cells are
+    buffered and written in batches, so the file is written sequentially and the memory usage only
+    depends on the batch size.
+
+    Args:
+        path (str): The path to the HDF5 container.
+        batch_size (int): The number of cells buffered before they are written to the container.
+        mode (str): The mode used to open the file (``'w'`` to create a new container or ``'a'`` to
+            add cells to an existing one). By default, a new container is created when the first
+            cells are written, unless :meth:`resume` was called before, in which case the cells are
+            added to the existing container.
+    """
+
+    def __init__(self, path, batch_size=100, mode=None):
+        if batch_size < 1:
+            raise ValueError(f"The batch size must be a positive integer (got {batch_size})")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.mode = mode
+        self._buffer = []
+        self._closed = False
+        # With the default mode, the file is opened when it is known whether a run is resumed
+        self._file = None if mode is None else h5py.File(self.path, mode)
+
+    def resume(self):
+        """Keep the cells already stored in the container.
+
+        This is called by :func:`write_population` when a run recorded in a manifest is resumed.
+
+        Raises:
+            ValueError: If the container was opened with the mode ``'w'``, since the cells it
+                contained were then already removed.
+        """
+        if self.mode == "w":
+            raise ValueError(
+                f"The container {self.path} was opened with the mode 'w', which removed the cells "
+                "completed by the resumed run, it should be opened with the mode 'a'"
+            )
+        if self.mode is None:
+            self.mode = "a"
+
+    def write(self, name, neuron):
+        """Add a morphology to the container.
+
+        Args:
+            name (str): The name of the group in which the morphology is stored.
+            neuron (morphio.mut.Morphology or morphio.Morphology): The morphology to store.
+        """
+        if self._closed:
+            raise ValueError(f"The container {self.path} is closed")
+        points, structure = morphology_to_h5_arrays(neuron)
+        self._buffer.append((str(name), points, structure))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered morphologies to the container."""
+        if self._closed:
+            return
+        if self._file is None:
+            if self.mode is None:
+                self.mode = "w"
+            self._file = h5py.File(self.path, self.mode)
+        L.debug("Write %s morphologies in %s", len(self._buffer), self.path)
+        for name, points, structure in self._buffer:
+            if name in self._file:
+                # The cell may have been written by an interrupted run that is resumed
+                del self._file[name]
+            group = self._file.create_group(name)
+            group.create_dataset("points", data=points)
+            group.create_dataset("structure", data=structure)
+            metadata = group.create_group("metadata")
+            metadata.attrs["cell_family"] = np.array([0], dtype=np.uint32)
+            metadata.attrs["version"] = np.array(H5_VERSION, dtype=np.uint32)
+        self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        """Write the buffered morphologies and close the container."""
+        if self._closed:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class BackgroundWriter:
+    """Write the cells of a population in a background thread.
+
+    The cells are pushed into a bounded queue and written by another writer in a dedicated thread,
+    so the serialization of the morphologies overlaps with the growth of the next cells. When the
+    queue is full, :meth:`write` blocks until the writer catches up, so the memory usage stays
+    bounded when the storage is slow. An error raised in the thread is raised again (only once) by
+    the next call to :meth:`write` or by :meth:`close`, and the next cells are discarded.
+
+    Args:
+        writer (DirectoryWriter or ContainerWriter): The writer used in the background thread. It
+            is not closed by this writer.
+        max_queue_size (int): The maximum number of cells waiting to be written.
+    """
+
+    def __init__(self, writer, max_queue_size=16):
+        if max_queue_size < 1:
+            raise ValueError(
+                f"The maximum queue size must be a positive integer (got {max_queue_size})"
+            )
+        self.writer = writer
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._error = None
+        self._error_raised = False
+        self._thread = threading.Thread(target=self._run, name="neurots-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                if self._error is not None:
+                    # Keep consuming the queue so the main thread is never blocked
+                    continue
+                self.writer.write(*item)
+            except Exception as exc:  # pylint: disable=broad-except
+                L.debug("The background writer failed", exc_info=True)
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None and not self._error_raised:
+            self._error_raised = True
+            raise self._error
+
+    def write(self, name, neuron):
+        """Push a morphology into the queue of the background thread.
+
+        Args:
+            name (str): The name of the morphology.
+            neuron (morphio.mut.Morphology or morphio.Morphology): The morphology to write. It
+                should not be modified afterwards.
+        """
+        if self._thread is None:
+            raise ValueError("The background writer is closed")
+        self._raise_error()
+        self._queue.put((name, neuron))
+
+    def flush(self):
+        """Wait until all the queued morphologies are written and flush the underlying writer."""
+        if self._thread is None:
+            return
+        self._queue.join()
+        self._raise_error()
+        self.writer.flush()
+
+    def close(self):
+        """Wait until all the morphologies are written and stop the background thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def write_population(
+    cells, writer, name_format="{}", max_queue_size=None, manifest=None, checkpoint_interval=100
+):
+    """Write the cells yielded by :func:`neurots.population.synthesis.synthesize_population`.
+
+    The cells are consumed lazily, so only the cells buffered by the writer are kept in memory.
+
+    If a manifest is given, the writer is flushed every ``checkpoint_interval`` cells and the cells
+    written so far are then recorded in the manifest. An interrupted run can thus be resumed by
+    synthesizing only the cells returned by
+    :meth:`neurots.population.manifest.RunManifest.remaining` (the cells written after the last
+    checkpoint are grown and written again). When the manifest already contains completed cells,
+    the writer must keep them: a :class:`ContainerWriter` opened with the default mode is switched
+    to append mode and one opened with the mode ``'w'`` is refused.
+
+    Args:
+        cells (Iterable[tuple[int, morphio.mut.Morphology, list[int]]]): The cell IDs, the
+            morphologies and their apical sections.
+        writer (DirectoryWriter, ContainerWriter or BackgroundWriter): The writer used to store
+            the morphologies.
+        name_format (str): The format used to build the name of a cell from its ID.
+        max_queue_size (int): If not ``None``, the cells are written in a background thread (see
+            :class:`BackgroundWriter`) and at most this number of cells wait to be written.
+        manifest (neurots.population.manifest.RunManifest): The manifest in which the written
+            cells are recorded.
+        checkpoint_interval (int): The number of cells written between two updates of the
+            manifest.
+
+    Returns:
+        dict[int, list[int]]: The IDs of the apical sections of each cell.
+
+    Raises:
+        ValueError: If a run recorded in the manifest is resumed with a :class:`ContainerWriter`
+            opened with the mode ``'w'``.
+    """
+    if manifest is not None and manifest.completed:
+        base_writer = writer.writer if isinstance(writer, BackgroundWriter) else writer
+        if isinstance(base_writer, ContainerWriter):
+            base_writer.resume()
+
+    if max_queue_size is not None:
+        with BackgroundWriter(writer, max_queue_size=max_queue_size) as background_writer:
+            return write_population(
+                cells,
+                background_writer,
+                name_format=name_format,
+                manifest=manifest,
+                checkpoint_interval=checkpoint_interval,
+            )
+
+    apical_sections = {}
+    pending = []
+
+    def checkpoint():
+        writer.flush()
+        manifest.record(pending)
+        pending.clear()
+
+    for cell_id, neuron, cell_apical_sections in cells:
+        writer.write(name_format.format(cell_id), neuron)
+        apical_sections[cell_id] = cell_apical_sections
+        if manifest is not None:
+            pending.append(cell_id)
+            if len(pending) >= checkpoint_interval:
+                checkpoint()
+
+    if manifest is not None:
+        checkpoint()
+    return apical_sections
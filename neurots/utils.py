@@ -10,6 +10,8 @@ from copy import deepcopy
 import numpy as np
 from neurom import COLS
 
+from neurots.generate.stats import current_stats
+
 Y_DIRECTION = [0.0, 1.0, 0.0]
 
 
@@ -121,19 +123,21 @@ def accept_reject(
     n_tries = 0
     best_proposal = None
     best_p = -1.0
+    stats = current_stats()
     while n_tries < max_tries:
         proposal = propose((1 + n_tries) * randomness_increase)
         _prob = probability(proposal, **probability_kwargs)
-        if _prob == 1.0:
-            # this ensures we don't change rng for the tests, but its not really needed
-            return proposal
-
-        if rng.binomial(1, _prob):
+        # this ensures we don't change rng for the tests, but its not really needed
+        if _prob == 1.0 or rng.binomial(1, _prob):
+            if stats is not None:
+                stats.record_accept_reject(n_tries + 1)
             return proposal
 
         if _prob > best_p:
             best_p = _prob
             best_proposal = proposal
         n_tries += 1
+    if stats is not None:
+        stats.record_accept_reject(n_tries)
     warnings.warn("We could not sample from distribution, we take best sample.")
     return best_proposal
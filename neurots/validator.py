@@ -7,7 +7,9 @@ Visit https://json-schema.org/understanding-json-schema/ for more information ab
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import json
+from collections import OrderedDict
 
 try:
     import importlib_resources as resources
@@ -15,6 +17,7 @@ except ImportError:
     from importlib import resources
 
 import jsonschema
+import numpy as np
 
 SCHEMA_PATH = resources.files("neurots") / "schemas"
 
@@ -25,6 +28,14 @@ with (SCHEMA_PATH / "distributions.json").open(encoding="utf-8") as f:
     DISTRIBS_SCHEMA = json.load(f)
 
 
+MAX_CACHED_INSTANCES = 128
+"""The maximum number of content hashes of valid objects stored when the cache is enabled."""
+
+_VALIDATORS = {}
+_VALID_INSTANCES = OrderedDict()
+_CACHE = {"enabled": False}
+
+
 class ValidationError(Exception):
     """Exception raised when a JSON object is not valid according to a given schema."""
 
@@ -33,9 +44,67 @@ def _format_error(error):
     return f"""In [{"->".join([str(i) for i in error.absolute_path])}]: {error.message}"""
 
 
-def validate(instance, schema):
-    """Validate a JSON object according to a given schema."""
-    validator = jsonschema.Draft7Validator(schema)
+def get_validator(schema):
+    """Return the compiled validator of a given schema.
+
+    The validators are compiled once per schema object and then reused.
+    """
+    cached_schema, validator = _VALIDATORS.get(id(schema), (None, None))
+    if cached_schema is not schema:
+        validator = jsonschema.Draft7Validator(schema)
+        # The schema is stored to ensure its ID is not reused by another object
+        _VALIDATORS[id(schema)] = (schema, validator)
+    return validator
+
+
+def set_validation_cache(enabled=True):
+    """Enable or disable the cache of valid objects used by :func:`validate`.
+
+    When the cache is enabled, the content hashes of the last valid objects are stored, so an
+    object with the same content as one of them is not validated again.
+    """
+    _CACHE["enabled"] = enabled
+    if not enabled:
+        _VALID_INSTANCES.clear()
+
+
+def _json_default(obj):
+    """Convert the numpy objects that the JSON encoder can not serialize."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _content_hash(instance, schema):
+    """Return a hash of the content of a JSON object or None if it can not be serialized."""
+    try:
+        content = json.dumps(instance, sort_keys=True, default=_json_default)
+    except (TypeError, ValueError):
+        return None
+    return id(schema), hashlib.sha256(content.encode()).hexdigest()
+
+
+def validate(instance, schema, use_cache=None):
+    """Validate a JSON object according to a given schema.
+
+    Args:
+        instance (dict): The object to validate.
+        schema (dict): The JSON schema used to validate the object.
+        use_cache (bool): If set to ``True``, the object is not validated again if an object with
+            the same content was already found valid against the same schema. If ``None``, the
+            value set with :func:`set_validation_cache` is used.
+    """
+    if use_cache is None:
+        use_cache = _CACHE["enabled"]
+
+    key = None
+    if use_cache:
+        key = _content_hash(instance, schema)
+        if key is not None and key in _VALID_INSTANCES:
+            _VALID_INSTANCES.move_to_end(key)
+            return
+
+    validator = get_validator(schema)
     errors = sorted(validator.iter_errors(instance), key=lambda e: e.path)
     messages = []
     for error in errors:
@@ -48,12 +117,17 @@ def validate(instance, schema):
     if messages:
         raise ValidationError("\n".join(messages))
 
+    if key is not None:
+        _VALID_INSTANCES[key] = True
+        while len(_VALID_INSTANCES) > MAX_CACHED_INSTANCES:
+            _VALID_INSTANCES.popitem(last=False)
+
 
-def validate_neuron_params(data):
+def validate_neuron_params(data, use_cache=None):
     """Validate parameter dictionary."""
-    validate(data, PARAMS_SCHEMA)
+    validate(data, PARAMS_SCHEMA, use_cache=use_cache)
 
 
-def validate_neuron_distribs(data):
+def validate_neuron_distribs(data, use_cache=None):
     """Validate distribution dictionary."""
-    validate(data, DISTRIBS_SCHEMA)
+    validate(data, DISTRIBS_SCHEMA, use_cache=use_cache)
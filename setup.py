@@ -20,6 +20,7 @@ reqs = [
     "scipy>=1.6",
     "tmd>=2.3.0",
     "diameter-synthesis>=0.5.4",
+    "h5py>=3.1",
 ]
 
 doc_reqs = [
@@ -13,6 +13,8 @@ from morph_tool import diff
 from numpy import testing as npt
 
 from neurots.astrocyte.grower import AstrocyteGrower
+from neurots.population.seeds import PopulationSeeds
+from neurots.population.synthesis import synthesize_population
 
 _path = Path(__file__).parent / "data"
 
@@ -273,3 +275,43 @@ def test_grow__run(rng_type, monkeypatch):
     _check_neurots_soma(astro_grower.soma_grower.soma)
     difference = diff(astro_grower.neuron, _path / "astrocyte.h5")
     assert not difference, difference.info
+
+
+def test_grow__population_seeds():
+    """Test the astrocyte grower with the seeds of a population."""
+    seeds = PopulationSeeds(42)
+
+    neurons = [
+        AstrocyteGrower(
+            input_distributions=_distributions(),
+            input_parameters=_parameters(),
+            context=_context(),
+            rng_or_seed=seeds.cell_seed(cell_id),
+        ).grow()
+        for cell_id in [0, 1, 0]
+    ]
+
+    assert not diff(neurons[0], neurons[2])
+    assert diff(neurons[0], neurons[1])
+
+
+def test_grow__population():
+    """Test the synthesis of an astrocyte population with the default arguments."""
+    cells = synthesize_population(
+        _parameters(),
+        _distributions(),
+        2,
+        workers=1,
+        seed=42,
+        context=_context(),
+        grower_class=AstrocyteGrower,
+    )
+    seeds = PopulationSeeds(42)
+    for cell_id, neuron, _ in cells:
+        expected = AstrocyteGrower(
+            input_distributions=_distributions(),
+            input_parameters=_parameters(),
+            context=_context(),
+            rng_or_seed=seeds.cell_seed(cell_id),
+        ).grow()
+        assert not diff(neuron, expected)
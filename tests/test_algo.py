@@ -246,8 +246,7 @@ def test_TMDApicalAlgo():
         },
     )
 
-    grower.stop_criteria["TMD"].bif_id = 2
-    grower.stop_criteria["TMD"].bif = 18.5246
+    grower.stop_criteria["TMD"] = grower.stop_criteria["TMD"].with_bif(2, 18.5246)
     grower.points[-1] *= 2
     grower.id = 2
     algo.bifurcate(grower)
@@ -262,8 +261,7 @@ def test_TMDApicalAlgo():
     s1, s2 = algo.bifurcate(grower)
     assert_equal(algo.apical_section, 3)
 
-    grower.stop_criteria["TMD"].bif_id = 2
-    grower.stop_criteria["TMD"].bif = 18.5246
+    grower.stop_criteria["TMD"] = grower.stop_criteria["TMD"].with_bif(2, 18.5246)
     grower.points[-1] *= 2
     grower.id = 4
     algo.bifurcate(grower)
@@ -295,6 +295,54 @@ def test_diametrize_from_tips_axon(neu3):
     )
 
 
+@pytest.mark.parametrize(
+    "diam_method", [diametrizer.diametrize_from_root, diametrizer.diametrize_from_tips]
+)
+@pytest.mark.parametrize("taper", [[0.05, 0.1, 0.5], [2.0, 5.0], [-0.1, 0.1]])
+def test_vectorized_diametrizers(diam_method, taper):
+    """The vectorized and loop diametrizers give the same diameters and draw the same values."""
+    test_model = copy.deepcopy(MODEL)
+    test_model["basal_dendrite"]["taper"] = taper
+    test_model["axon"]["taper"] = taper
+    test_model["basal_dendrite"]["Rall_ratio"] = 1.5
+    test_model["basal_dendrite"]["siblings_ratio"] = 0.8
+    for path, neurite_type in [
+        (NEU_PATH1, SectionType.basal_dendrite),
+        (NEU_PATH3, SectionType.axon),
+        (NEU_PATH3, SectionType.basal_dendrite),
+    ]:
+        diameters = []
+        next_values = []
+        for vectorized in [False, True]:
+            neuron = morphio.mut.Morphology(path)
+            rng = np.random.default_rng(0)
+            diam_method(
+                neuron,
+                neurite_type,
+                model_params=test_model,
+                random_generator=rng,
+                vectorized=vectorized,
+            )
+            diameters.append(morphio.Morphology(neuron).diameters)
+            next_values.append(rng.random())
+        assert_array_almost_equal(diameters[0], diameters[1])
+        assert next_values[0] == next_values[1]
+
+
+def test_neurite_arrays(neu1):
+    neurite = diametrizer._NeuriteArrays(neu1.root_sections[0])  # pylint: disable=protected-access
+    assert_equal(neurite.parents, [-1, 0, 0])
+    assert neurite.children == [[1, 2], [], []]
+    assert_equal(neurite.offsets, [0, 7, 13, 19])
+    assert neurite.is_valid()
+    points, owners, local, first_points, sizes = neurite.section_points(np.array([2, 0]))
+    assert_equal(points, list(range(13, 19)) + list(range(7)))
+    assert_equal(owners, [0] * 6 + [1] * 7)
+    assert_equal(local, list(range(6)) + list(range(7)))
+    assert_equal(first_points, [0, 6])
+    assert_equal(sizes, [6, 7])
+
+
 def test_redefine_diameter_section(neu1):
     section = neu1.root_sections[0]
     assert_equal(section.diameters[0], 4)
@@ -418,6 +466,65 @@ def test_build_M4_rng(neu1):
     )
 
 
+@pytest.mark.parametrize("diam_method", ["M1", "M4", "M5"])
+@pytest.mark.parametrize(
+    "random_generator", [np.random.default_rng, np.random.RandomState], ids=["Generator", "legacy"]
+)
+def test_build_population(diam_method, random_generator):
+    test_model = copy.deepcopy(MODEL)
+    test_model["basal_dendrite"]["trunk_taper"] = np.arange(0, 1, 0.1)
+    test_model["basal_dendrite"]["term"] = [0.3, 0.6]
+    test_model["axon"]["taper"] = [0.05, 0.1, 0.2]
+    paths = [NEU_PATH1, NEU_PATH3, NEU_PATH1, NEU_PATH2]
+
+    expected = [morphio.mut.Morphology(path) for path in paths]
+    rng = random_generator(42)
+    for neuron in expected:
+        diametrizer.build(
+            neuron,
+            input_model=test_model,
+            neurite_types=["basal_dendrite", "axon"],
+            diam_method=diam_method,
+            random_generator=rng,
+        )
+    expected_next_value = rng.random()
+
+    neurons = [morphio.mut.Morphology(path) for path in paths]
+    rng = random_generator(42)
+    diametrizer.build_population(
+        neurons,
+        input_model=test_model,
+        neurite_types=["basal_dendrite", "axon"],
+        diam_method=diam_method,
+        random_generator=rng,
+    )
+    assert rng.random() == expected_next_value
+    for neuron, expected_neuron in zip(neurons, expected):
+        assert_array_almost_equal(
+            morphio.Morphology(neuron).diameters, morphio.Morphology(expected_neuron).diameters
+        )
+
+
+def test_build_population_diam_method(neu1, neu2):
+    def diam_method(neuron, tree_type, random_generator=None):
+        for section in diametrizer.root_section_filter(neuron, tree_type):
+            section.diameters = np.full(len(section.diameters), random_generator.random())
+
+    rng = np.random.default_rng(0)
+    diametrizer.build_population(
+        [neu1, neu2],
+        neurite_types=["basal_dendrite"],
+        diam_method=diam_method,
+        random_generator=rng,
+    )
+    expected_values = np.random.default_rng(0).random(2)
+    assert_array_almost_equal(neu1.root_sections[0].diameters[0], expected_values[0])
+    assert_array_almost_equal(neu2.root_sections[0].diameters[0], expected_values[1])
+
+    with pytest.raises(KeyError, match="The name of the diametrization method is unknown"):
+        diametrizer.build_population([neu1], diam_method="UNKNOWN")
+
+
 def test_build_unknown_model(neu1):
     with pytest.raises(
         KeyError,
@@ -8,6 +8,8 @@
 import importlib.util as ilu
 from pathlib import Path
 
+import morphio
+
 EXAMPLES = Path(__file__).parent.parent / "examples"
 DATA = EXAMPLES / "data"
 
@@ -57,6 +59,14 @@ def test_synthesize_neurons(tmpdir):
     ]
 
 
+def test_synthesize_population(tmpdir):
+    _run_example("examples/synthesize_population.py", tmpdir, DATA)
+    assert sorted([i.relto(tmpdir) for i in tmpdir.listdir()]) == ["generated_cells.h5"]
+    collection = morphio.Collection(str(tmpdir / "generated_cells.h5"))
+    for i in range(10):
+        assert len(collection.load(f"generated_cell_{i}").root_sections) > 0
+
+
 def test_synthesize_single_neuron(tmpdir):
     _run_example("examples/synthesize_single_neuron.py", tmpdir, DATA)
     assert sorted([i.relto(tmpdir) for i in tmpdir.listdir()]) == [
@@ -0,0 +1,106 @@
+"""Test neurots.generate.builder code."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=missing-function-docstring
+import json
+import os
+
+import numpy as np
+from morph_tool import diff
+from morphio import PointLevel
+from morphio import SectionType
+from morphio.mut import Morphology
+from numpy import testing as npt
+
+from neurots import NeuronGrower
+from neurots.generate.builder import MorphologyBuilder
+from neurots.utils import point_to_section_segment
+
+_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _points(i):
+    return np.array([[i, 0, 0], [i, 1, 0]], dtype=float)
+
+
+def test_morphology_builder():
+    # The sections are added in the same order to a builder and to a morphology
+    builder = MorphologyBuilder()
+    neuron = Morphology()
+    builder_root_1 = builder.append_root_section(_points(0), SectionType.basal_dendrite)
+    root_1 = neuron.append_root_section(PointLevel(_points(0), [1, 1]), SectionType.basal_dendrite)
+    builder_root_2 = builder.append_root_section(_points(1), SectionType.apical_dendrite)
+    root_2 = neuron.append_root_section(PointLevel(_points(1), [1, 1]), SectionType.apical_dendrite)
+    builder_child = builder_root_1.append_section(_points(2), SectionType.basal_dendrite)
+    child = root_1.append_section(PointLevel(_points(2), [1, 1]), SectionType.basal_dendrite)
+    builder_root_2.append_section(_points(3), SectionType.apical_dendrite)
+    root_2.append_section(PointLevel(_points(3), [1, 1]), SectionType.apical_dendrite)
+    builder_child.append_section(_points(4), SectionType.basal_dendrite)
+    child.append_section(PointLevel(_points(4), [1, 1]), SectionType.basal_dendrite)
+
+    assert [section.id for section in builder.sections] == [0, 1, 2, 3, 4]
+    assert [section.id for section in builder.root_sections] == [0, 1]
+    assert [section.id for section in builder_root_1.children] == [2]
+    assert builder_child.parent is builder_root_1
+
+    built = Morphology()
+    section_ids = builder.build(built, 1)
+
+    # The sections are numbered in depth-first order
+    assert section_ids == [0, 3, 1, 4, 2]
+    assert not diff(built, neuron)
+    for section_id, section in zip(section_ids, neuron.sections.values()):
+        npt.assert_array_equal(built.sections[section_id].points, section.points)
+    assert all(section.points is None for section in builder.sections)
+
+    # The IDs are the same as the ones of a copy of the morphology
+    copied = Morphology(neuron)
+    for section_id, section in copied.sections.items():
+        npt.assert_array_equal(built.sections[section_id].points, section.points)
+
+
+class _RecordingSection:
+    """A section which records the points still stored in a builder when a child is appended."""
+
+    def __init__(self, builder, records):
+        self.builder = builder
+        self.records = records
+        self.id = len(records)
+
+    def append_section(self, point_level, _section_type):
+        self.records.append(
+            (len(point_level.points), sum(s.points is not None for s in self.builder.sections))
+        )
+        return _RecordingSection(self.builder, self.records)
+
+    append_root_section = append_section
+
+
+def test_morphology_builder_releases_points():
+    # The points of a section are released as soon as it is appended, without a full copy
+    builder = MorphologyBuilder()
+    root = builder.append_root_section(_points(0), SectionType.basal_dendrite)
+    root.append_section(_points(1), SectionType.basal_dendrite)
+    builder.append_root_section(_points(2), SectionType.apical_dendrite)
+    records = []
+    assert builder.build(_RecordingSection(builder, records), 1) == [1, 2, 3]
+    assert records == [(2, 3), (2, 2), (2, 1)]
+
+
+def test_apical_sections():
+    """The apical sections are the ones found by searching the apical points."""
+    with open(os.path.join(_path, "bio_distr_breaker.json"), encoding="utf-8") as f:
+        distributions = json.load(f)
+    with open(os.path.join(_path, "bio_params_breaker.json"), encoding="utf-8") as f:
+        params = json.load(f)
+
+    grower = NeuronGrower(params, distributions, rng_or_seed=3367155)
+    neuron = grower.grow()
+    assert grower.apical_sections
+    for apical_section in grower.apical_sections:
+        apical_point = neuron.sections[apical_section].points[-1]
+        assert point_to_section_segment(neuron, apical_point)[0] == apical_section
+    assert not grower._builder.sections  # pylint: disable=protected-access
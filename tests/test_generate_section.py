@@ -8,10 +8,12 @@
 # pylint: disable=redefined-outer-name
 import numpy as np
 import pytest
+from numpy import testing as npt
 from numpy.testing import assert_array_almost_equal
 
 from neurots.generate import section
 from neurots.generate.algorithms.common import TMDStop
+from neurots.generate.tree import SectionParameters
 from neurots.morphmath import sample
 
 EXPECTED_WEIGHTS = np.array([0.01831564, 0.04978707, 0.13533528, 0.36787944, 1.0])
@@ -85,3 +87,270 @@ def test_history(SEG_LEN):
     assert_array_almost_equal(s.history(), np.array([0.0, 0.34525776, 0.9385079]))
     s.latest_directions = np.array([[0.0, 0.0, 0.00000001]])
     assert_array_almost_equal(s.history(), np.array([0.0e00, 0.0e00, 1.0e-08]))
+
+
+def test_direction_history():
+    rng = np.random.default_rng(0)
+    directions = rng.normal(size=(12, 3))
+    history = section.DirectionHistory()
+    assert len(history) == 0
+    assert_array_almost_equal(history.weighted_sum(), np.zeros(3))
+
+    for num, direction in enumerate(directions, start=1):
+        history.append(direction)
+        latest = directions[max(0, num - section.MEMORY) : num]
+        assert len(history) == len(latest)
+        npt.assert_array_equal(history, latest)
+        npt.assert_array_equal(history[-1], direction)
+        npt.assert_array_equal(history[0], latest[0])
+        assert_array_almost_equal(
+            history.weighted_sum(), np.dot(section.WEIGHTS[section.MEMORY - len(latest) :], latest)
+        )
+
+    with pytest.raises(IndexError):
+        history[section.MEMORY]  # pylint: disable=pointless-statement
+
+
+def test_analytic_stop(SEG_LEN):
+    params = SectionParameters(
+        randomness=0.0, targeting=1.0, scale_prob=1.0, history=0.0, analytic_stop=True
+    )
+    tmd_stop = TMDStop(1, 10.0, 0, 20.0, 0.0)
+    rng = np.random.default_rng(0)
+    s = section.SectionGrowerPath(
+        None,
+        None,
+        [0.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        params,
+        "major",
+        {"TMD": tmd_stop},
+        SEG_LEN,
+        0.0,
+        random_generator=rng,
+    )
+    s.first_point()
+
+    # The stop values are drawn once, when they are needed for the first time
+    s.pathlength = 0.0
+    assert s.check_stop()
+    stops = s._analytic_stops  # pylint: disable=protected-access
+    assert set(stops) == {"bif", "term"}
+    bif_stop = stops["bif"]
+    assert bif_stop.value == section._analytic_stop_value(  # pylint: disable=protected-access
+        10.0, 0.0, bif_stop.threshold, SEG_LEN.mean_positive(), 1.0
+    )
+    assert 0 < bif_stop.value < 10.0
+    state = rng.bit_generator.state
+    s.pathlength = np.nextafter(bif_stop.value, -np.inf)
+    assert s.check_stop()
+    assert rng.bit_generator.state == state
+
+    # The stop value is computed again when the criterion changes
+    s.stop_criteria["TMD"] = tmd_stop.with_bif(1, 12.0)
+    assert s.check_stop()
+    assert stops["bif"] is bif_stop
+    assert bif_stop.crit == 12.0
+    assert bif_stop.value == section._analytic_stop_value(  # pylint: disable=protected-access
+        12.0, 0.0, bif_stop.threshold, SEG_LEN.mean_positive(), 1.0
+    )
+    assert rng.bit_generator.state == state
+
+    # The section bifurcates when it reaches the stop value
+    s.pathlength = bif_stop.value
+    assert not s.check_stop()
+    assert s.children == 2
+
+    # A new threshold is drawn if the section keeps growing after the stop
+    assert set(stops) == {"term"}
+    s.pathlength = 0.0
+    assert s.check_stop()
+    assert stops["bif"].threshold != bif_stop.threshold
+
+
+def test_analytic_stop_value():
+    # pylint: disable=protected-access
+    stop_value = section._analytic_stop_value
+    assert stop_value(np.inf, 0.0, 1.0, 1.0, 1.0) == np.inf
+    assert stop_value(-np.inf, 2.0, 1.0, 1.0, 1.0) == 2.0
+    assert stop_value(1.0, 2.0, 1.0, 1.0, 1.0) == 2.0
+    assert stop_value(10.0, 0.0, 10.0, 1.0, 1.0) == 10.0
+
+    # The integral of the hazard rate from the start to the stop value is the threshold
+    for threshold, step_size, scale_prob in [(0.5, 1.0, 1.0), (1e-3, 0.1, 2.0), (2.0, 0.2, 0.5)]:
+        value = stop_value(10.0, 0.0, threshold, step_size, scale_prob)
+        u = np.linspace(-0.5 * step_size, value + 0.5 * step_size, 200001)
+        rate = -np.log1p(-np.exp(-scale_prob * (10.0 - u))) / step_size
+        npt.assert_allclose(np.sum((rate[1:] + rate[:-1]) * np.diff(u)) / 2, threshold, rtol=1e-4)
+
+
+@pytest.mark.parametrize("step", [0.05, 0.5])
+def test_analytic_stop_distribution(step):
+    """The analytic stop follows the law of the stop drawn at each step for small steps."""
+    start, crit = 4.0, 10.0
+    values = np.arange(start, crit + step / 2, step)
+    stop_probs = np.exp(-(crit - values))
+    survival = np.concatenate([[1], np.cumprod(1 - stop_probs)[:-1]])
+    expected = np.sum(survival * stop_probs * (crit - values))
+
+    rng = np.random.default_rng(0)
+    n_sections = 1000
+    for analytic_stop in [False, True]:
+        params = SectionParameters(
+            randomness=0.0,
+            targeting=1.0,
+            scale_prob=1.0,
+            history=0.0,
+            analytic_stop=analytic_stop,
+        )
+        remaining_distances = []
+        for _ in range(n_sections):
+            s = section.SectionGrowerPath(
+                None,
+                None,
+                [0.0, 0.0, 0.0],
+                [0.0, 1.0, 0.0],
+                params,
+                "major",
+                {"TMD": TMDStop(1, np.inf, 0, crit, 0.0)},
+                sample.Distr({"norm": {"mean": step, "std": 0.0}}),
+                0.0,
+                random_generator=rng,
+            )
+            s.first_point()
+            for value in values:
+                s.pathlength = value
+                if not s.check_stop():
+                    break
+            assert s.children == 0
+            remaining_distances.append(crit - s.pathlength)
+        std_error = np.std(remaining_distances) / np.sqrt(n_sections)
+        # The analytic stop is a continuous approximation of the law of the per-step draws
+        tolerance = 4 * std_error + (0.05 * expected if analytic_stop else 0)
+        assert abs(np.mean(remaining_distances) - expected) < tolerance
+
+
+@pytest.mark.parametrize("analytic_stop", [False, True])
+@pytest.mark.parametrize("grower_class", [section.SectionGrowerPath, section.SectionGrowerTMD])
+def test_next_chunk(grower_class, analytic_stop):
+    params = SectionParameters(
+        randomness=0.2, targeting=0.3, scale_prob=1.0, history=0.5, analytic_stop=analytic_stop
+    )
+    rng = np.random.default_rng(0)
+    s = grower_class(
+        None,
+        None,
+        [0.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        params,
+        "major",
+        {"TMD": TMDStop(1, 30.0, 0, 60.0, np.zeros(3))},
+        sample.Distr({"norm": {"mean": 1.0, "std": 0.2}}, random_generator=rng),
+        0.0,
+        random_generator=rng,
+        chunk_size=8,
+    )
+    s.first_point()
+
+    states = []
+    stop_values = None
+    while not states or states[-1] == "continue":
+        n_points = len(s.points)
+        states.append(s.next_chunk())
+        assert 1 <= len(s.points) - n_points <= 8
+        if states[-1] == "continue":
+            assert len(s.points) - n_points == 8
+        if analytic_stop and states[-1] == "continue":
+            # pylint: disable=protected-access
+            stop_values = {which: stop.value for which, stop in s._analytic_stops.items()}
+
+    if analytic_stop:
+        # The chunk stops at the first point that reaches a stop value, which is then drawn again
+        which = "bif" if states[-1] == "bifurcate" else "term"
+        assert which not in s._analytic_stops  # pylint: disable=protected-access
+        segment_lengths = np.linalg.norm(np.diff(s.points, axis=0), axis=1)
+        pathlengths = np.concatenate([[0], np.cumsum(segment_lengths)])
+        values = s.get_vals(np.asarray(s.points), pathlengths)
+        assert values[-1] >= stop_values[which]
+        assert np.all(values[:-1] < stop_values[which])
+
+    assert states[-1] == ("bifurcate" if s.children == 2 else "terminate")
+    assert len(s.latest_directions) == section.MEMORY
+    segment = s.points[-1] - s.points[-2]
+    npt.assert_array_almost_equal(s.latest_directions[-1], segment / np.linalg.norm(segment))
+    npt.assert_almost_equal(s.pathlength, np.linalg.norm(np.diff(s.points, axis=0), axis=1).sum())
+
+
+@pytest.mark.parametrize("buffered", [False, True])
+def test_draw_steps(buffered):
+    def make_section(rng):
+        step_size_distribution = sample.Distr({"norm": {"mean": 1.0, "std": 0.5}}, rng)
+        return section.SectionGrowerPath(
+            None,
+            None,
+            [0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            SectionParameters(randomness=0.2, targeting=0.3, scale_prob=1.0, history=0.5),
+            "major",
+            {"TMD": TMDStop(1, 30.0, 0, 60.0, np.zeros(3))},
+            step_size_distribution,
+            0.0,
+            random_generator=rng,
+            sampler=(
+                sample.BufferedSampler(step_size_distribution, rng, block_size=4)
+                if buffered
+                else None
+            ),
+            chunk_size=8,
+        )
+
+    step_sizes, random_points = make_section(np.random.default_rng(0)).draw_steps(10)
+    assert step_sizes.shape == (10,)
+    assert np.all(step_sizes > 0)
+    assert random_points.shape == (10, 3)
+    npt.assert_array_almost_equal(np.linalg.norm(random_points, axis=1), np.ones(10))
+
+    if buffered:
+        # The values are served by the sampler, in the same order as with one draw at a time
+        s = make_section(np.random.default_rng(0))
+        npt.assert_array_equal(step_sizes, [s.draw_step_size() for _ in range(10)])
+        npt.assert_array_equal(random_points, [s.random_direction() for _ in range(10)])
+
+    # The chunks use the same steps
+    s = make_section(np.random.default_rng(0))
+    s.first_point()
+    step_sizes, _ = make_section(np.random.default_rng(0)).draw_steps(9)
+    n_points = len(s.points)
+    assert s.next_chunk() == "continue"
+    segment_lengths = np.linalg.norm(np.diff(s.points[n_points - 1 :], axis=0), axis=1)
+    npt.assert_array_almost_equal(segment_lengths, step_sizes[1:])
+
+
+def test_next_chunk__post_next_point():
+    class SectionGrowerWithHook(section.SectionGrowerPath):
+        """Count the points created by the section."""
+
+        n_calls = 0
+
+        def post_next_point(self):
+            self.n_calls += 1
+
+    s = SectionGrowerWithHook(
+        None,
+        None,
+        [0.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        SectionParameters(randomness=0.2, targeting=0.3, scale_prob=1.0, history=0.5),
+        "major",
+        {"TMD": TMDStop(1, 30.0, 0, 60.0, np.zeros(3))},
+        sample.Distr({"norm": {"mean": 1.0, "std": 0.2}}),
+        0.0,
+        random_generator=np.random.default_rng(0),
+        chunk_size=8,
+    )
+    s.first_point()
+
+    # The points are created one at a time so the hook is called after each of them
+    assert s.next_chunk() == "continue"
+    assert len(s.points) == 3
+    assert s.n_calls == 2
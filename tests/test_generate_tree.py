@@ -11,9 +11,12 @@ import os
 
 import numpy as np
 import pytest
+from morphio import SectionType
 from numpy import testing as npt
 
 from neurots import NeuronGrower
+from neurots.generate.algorithms.common import TMDStop
+from neurots.generate.tree import SectionSchedule
 from neurots.generate.tree import TreeGrower
 from neurots.generate.tree import _create_section_parameters
 from neurots.utils import NeuroTSError
@@ -137,3 +140,102 @@ def test_TreeGrower_3d_angles():
             i,
             sections[len(sections) - num - 1],
         )
+
+
+def test_TreeGrower_section_context():
+    with open(os.path.join(_path, "bio_distribution.json"), encoding="utf-8") as f:
+        distributions = json.load(f)
+
+    with open(os.path.join(_path, "bio_path_params.json"), encoding="utf-8") as f:
+        params = json.load(f)
+
+    atlas_data = np.zeros((100, 100, 100))
+    basal_constraint = {
+        "section_prob": lambda *args, **kwargs: 1.0,
+        "neurite_types": ["basal_dendrite"],
+    }
+    apical_constraint = {
+        "section_prob": lambda *args, **kwargs: 1.0,
+        "neurite_types": ["apical_dendrite"],
+        "processes": ["secondary"],
+    }
+    context = {
+        "atlas_data": atlas_data,
+        "constraints": [basal_constraint, apical_constraint, {"trunk_prob": None}],
+    }
+    grower = NeuronGrower(
+        input_distributions=distributions, input_parameters=params, context=context, rng_or_seed=0
+    )
+    grower._grow_soma()
+
+    for tree in grower.active_neurites:
+        section_context = tree.active_sections[0].context
+
+        # The context is shared by the sections without being copied
+        assert section_context["atlas_data"] is atlas_data
+        assert tree._section_context("major") is section_context
+        assert context["constraints"] == [basal_constraint, apical_constraint, {"trunk_prob": None}]
+
+        # The constraints are filtered for each process
+        tree_type = SectionType(tree.type).name
+        if tree_type == "basal_dendrite":
+            expected_constraints = [basal_constraint]
+        else:
+            expected_constraints = []
+        assert section_context["constraints"] == expected_constraints
+        if tree_type == "apical_dendrite":
+            assert tree._section_context("secondary")["constraints"] == [apical_constraint]
+
+        # The context can not be modified by the sections
+        with pytest.raises(TypeError):
+            section_context["atlas_data"] = None
+
+    # Other contexts are copied
+    tree = grower.active_neurites[0]
+    tree.context = ["OTHER"]
+    assert tree._section_context("major") == ["OTHER"]
+    assert tree._section_context("major") is not tree.context
+
+
+class _Section:
+    def __init__(self, bif):
+        self.stop_criteria = {"TMD": TMDStop(0, bif, 0, 100.0, 0.0)}
+
+
+def test_SectionSchedule():
+    schedule = SectionSchedule()
+    sections = [_Section(bif) for bif in [3.0, 1.0, np.inf, 1.0, 2.0]]
+    for section in sections:
+        schedule.add(section)
+    assert len(schedule) == 5
+    assert schedule.sections() == list(TreeGrower.order_per_bif(sections))
+
+    schedule.remove(sections[3])
+    sections.pop(3)
+    assert sections[3] in schedule
+    assert schedule.sections() == list(TreeGrower.order_per_bif(sections))
+
+    # The sections are only moved when their bifurcation changes
+    sections[0].stop_criteria["TMD"] = sections[0].stop_criteria["TMD"].with_bif(1, 1.0)
+    sections[2].stop_criteria["TMD"] = sections[2].stop_criteria["TMD"]._replace(term=10.0)
+    for section in sections:
+        schedule.update(section)
+    assert schedule.sections() == list(TreeGrower.order_per_bif(sections))
+    assert schedule.sections()[:2] == [sections[0], sections[1]]
+
+
+def test_TreeGrower_schedule():
+    with open(os.path.join(_path, "bio_distribution.json"), encoding="utf-8") as f:
+        distributions = json.load(f)
+
+    with open(os.path.join(_path, "bio_path_params.json"), encoding="utf-8") as f:
+        params = json.load(f)
+
+    grower = NeuronGrower(input_distributions=distributions, input_parameters=params, rng_or_seed=0)
+    grower._grow_soma()
+
+    for tree in grower.active_neurites:
+        while not tree.end():
+            assert tree._schedule.sections() == list(TreeGrower.order_per_bif(tree.active_sections))
+            tree.next_point()
+        assert len(tree._schedule) == 0
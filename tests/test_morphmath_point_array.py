@@ -57,3 +57,21 @@ def test_dynamic_point_array_append(dynamic_array):
     npt.assert_allclose(dynamic_array.data, np.vstack((p0, p1, p2, p3)))
     assert len(dynamic_array) == 4
     assert dynamic_array.capacity == 6
+
+
+def test_dynamic_point_array_access():
+    array = _pa.DynamicPointArray(initial_capacity=1, resize_factor=1.5, dtype=np.float64)
+    points = np.random.random((4, 3))
+    for point in points:
+        array.append(point)
+
+    assert array.capacity == 4
+    assert array.data.dtype == np.float64
+    npt.assert_array_equal(array, points)
+    npt.assert_array_equal(array[-1], points[-1])
+    npt.assert_array_equal(array[1:3], points[1:3])
+    npt.assert_array_equal(list(array), points)
+
+    # The points are views on the buffer
+    array[-1] *= 2
+    npt.assert_array_equal(array.data[-1], 2 * points[-1])
@@ -24,6 +24,7 @@ from tempfile import TemporaryDirectory
 import numpy as np
 import pytest
 import tmd
+from mock import patch
 from morph_tool import diff
 from morphio import PointLevel
 from morphio import SectionType
@@ -36,7 +37,10 @@ from scipy.spatial.distance import cdist
 from neurots import extract_input
 from neurots.generate.diametrizer import diametrize_constant_per_neurite
 from neurots.generate.grower import NeuronGrower
+from neurots.generate.grower import PreparedInputs
+from neurots.preprocess import preprocess_inputs
 from neurots.preprocess.exceptions import NeuroTSValidationError
+from neurots.utils import NeuroTSError
 
 DATA_PATH = Path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_data"))
 _path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
@@ -157,6 +161,158 @@ def test_seeding():
     assert ng._rng.bit_generator.state["bit_generator"] == "PCG64"
 
 
+def test_prepared_inputs():
+    """Test growing several neurons from the same prepared inputs"""
+    distributions, parameters = _load_inputs(
+        os.path.join(_path, "bio_path_distribution.json"),
+        os.path.join(_path, "bio_path_params.json"),
+    )
+    with patch(
+        "neurots.generate.grower.preprocess_inputs", side_effect=preprocess_inputs
+    ) as preprocess:
+        prepared = PreparedInputs(parameters, distributions)
+        assert preprocess.call_count == 1
+
+        # The prepared inputs are not preprocessed again
+        ng_prepared = [NeuronGrower(prepared, rng_or_seed=seed) for seed in [0, 1]]
+        assert preprocess.call_count == 1
+
+    for seed, ng_p in zip([0, 1], ng_prepared):
+        ng = NeuronGrower(parameters, distributions, rng_or_seed=seed)
+        assert not diff(ng_p.grow(), ng.grow())
+        assert ng_p.apical_sections == ng.apical_sections
+
+    # The barcodes of the input diagrams are built once for all the growers
+    n_diagrams = sum(
+        len(distributions[neurite_type]["persistence_diagram"])
+        for neurite_type in parameters["grow_types"]
+    )
+    assert 0 < len(prepared.barcode_templates) <= n_diagrams
+
+    # The prepared inputs are shared and not updated
+    ng_prepared = ng_prepared[-1]
+    assert ng_prepared.input_distributions is prepared.input_distributions
+    assert "apical_point_sec_ids" not in prepared.input_distributions["diameter"]
+
+    with pytest.raises(ValueError, match="The 'input_distributions' argument must be None"):
+        NeuronGrower(prepared, distributions)
+
+
+def test_grow_stats():
+    """Test the statistics collected during the growth"""
+    distributions, parameters = _load_inputs(
+        os.path.join(_path, "bio_path_distribution.json"),
+        os.path.join(_path, "bio_path_params.json"),
+    )
+    ng = NeuronGrower(parameters, distributions, rng_or_seed=0)
+    assert ng.stats is None
+    neuron = ng.grow()
+
+    ng_stats = NeuronGrower(parameters, distributions, rng_or_seed=0, collect_stats=True)
+    assert not diff(ng_stats.grow(), neuron)
+
+    stats = ng_stats.stats.to_dict()
+    assert list(stats["timings"]) == ["grow_soma", "grow_neurites", "post_grow", "diametrize"]
+    assert all(timing >= 0 for timing in stats["timings"].values())
+    assert sum(stats["n_sections"].values()) == len(neuron.sections)
+    assert stats["n_sections"] == {
+        neurite_type.name: sum(1 for section in neuron.iter() if section.type == neurite_type)
+        for neurite_type in [SectionType.basal_dendrite, SectionType.apical_dendrite]
+    }
+    assert sum(stats["n_points"].values()) == sum(len(section.points) for section in neuron.iter())
+    assert stats["barcode_lookups"] > 0
+    assert stats["accept_reject_calls"] == 0
+    assert stats["accept_reject_tries"] == 0
+
+
+def test_grow_buffered_sampling():
+    """Test the growth with buffered sampling"""
+    distributions, parameters = _load_inputs(
+        os.path.join(_path, "bio_path_distribution.json"),
+        os.path.join(_path, "bio_path_params.json"),
+    )
+    exact = NeuronGrower(parameters, distributions, rng_or_seed=0).grow()
+    neuron = NeuronGrower(parameters, distributions, rng_or_seed=0, sampling="buffered").grow()
+    assert diff(neuron, exact)
+    assert len(neuron.root_sections) == len(exact.root_sections)
+
+    # The buffered growth is reproducible
+    other = NeuronGrower(parameters, distributions, rng_or_seed=0, sampling="buffered").grow()
+    assert not diff(other, neuron)
+
+    with pytest.raises(NeuroTSError, match="The sampling mode must be one of"):
+        NeuronGrower(parameters, distributions, sampling="unknown")
+
+
+def test_grow_analytic_stop():
+    """Test the growth with analytic stop sampling"""
+    distributions, parameters = _load_inputs(
+        os.path.join(_path, "bio_path_distribution.json"),
+        os.path.join(_path, "bio_path_params.json"),
+    )
+    exact = NeuronGrower(parameters, distributions, rng_or_seed=0).grow()
+    neuron = NeuronGrower(parameters, distributions, rng_or_seed=0, analytic_stop=True).grow()
+    assert diff(neuron, exact)
+    assert len(neuron.root_sections) == len(exact.root_sections)
+
+    # The growth is reproducible and the number of sections is still driven by the barcodes
+    other = NeuronGrower(parameters, distributions, rng_or_seed=0, analytic_stop=True).grow()
+    assert not diff(other, neuron)
+    assert len(neuron.sections) == pytest.approx(len(exact.sections), rel=0.2)
+
+
+def test_grow_chunks():
+    """Test the growth with several points created at once"""
+    distributions, parameters = _load_inputs(
+        os.path.join(_path, "bio_path_distribution.json"),
+        os.path.join(_path, "bio_path_params.json"),
+    )
+    exact = NeuronGrower(parameters, distributions, rng_or_seed=0).grow()
+    neuron = NeuronGrower(parameters, distributions, rng_or_seed=0, chunk_size=8).grow()
+    assert diff(neuron, exact)
+    # The topology is given by the barcodes
+    assert len(neuron.sections) == len(exact.sections)
+
+    # The growth is reproducible
+    other = NeuronGrower(parameters, distributions, rng_or_seed=0, chunk_size=8).grow()
+    assert not diff(other, neuron)
+
+    for chunk_size in [0, 1.5]:
+        with pytest.raises(NeuroTSError, match="The chunk size must be a positive integer"):
+            NeuronGrower(parameters, distributions, chunk_size=chunk_size)
+
+
+class _ReversedTreesGrower(NeuronGrower):
+    """Grower whose trees are grown in the reversed order."""
+
+    def _grow_trunks(self):
+        super()._grow_trunks()
+        self.active_neurites.reverse()
+
+
+def test_grow_independent_trees():
+    """Test the growth with one random number stream per tree"""
+    distributions, parameters = _load_inputs(
+        os.path.join(_path, "bio_path_distribution.json"),
+        os.path.join(_path, "bio_path_params.json"),
+    )
+    exact_grower = NeuronGrower(parameters, distributions, rng_or_seed=0)
+    exact = exact_grower.grow()
+    grower = NeuronGrower(parameters, distributions, rng_or_seed=0, independent_trees=True)
+    neuron = grower.grow()
+    assert diff(neuron, exact)
+
+    # The growth is reproducible and does not depend on the order of the trees
+    other_grower = _ReversedTreesGrower(
+        parameters, distributions, rng_or_seed=0, independent_trees=True
+    )
+    assert not diff(other_grower.grow(), neuron)
+    assert other_grower.apical_sections == grower.apical_sections
+
+    # In the default mode, the trees depend on the order in which they are grown
+    assert diff(_ReversedTreesGrower(parameters, distributions, rng_or_seed=0).grow(), exact)
+
+
 def test_grow_trunk_1_basal():
     """Test NeuronGrower._grow_trunk() with only 1 basal (should raise an Exception)"""
     distributions, parameters = _load_inputs(
@@ -0,0 +1,111 @@
+"""Test neurots.population code."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+# pylint: disable=redefined-outer-name
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from morph_tool import diff
+
+from neurots import NeuronGrower
+from neurots import PreparedInputs
+from neurots import synthesize_population
+from neurots.population import arrays
+from neurots.population.seeds import PopulationSeeds
+
+DATA = Path(__file__).parent / "data"
+PARAMS = DATA / "bio_path_params.json"
+DISTRS = DATA / "bio_path_distribution.json"
+
+
+@pytest.fixture
+def inputs():
+    with PARAMS.open(encoding="utf-8") as f:
+        params = json.load(f)
+    with DISTRS.open(encoding="utf-8") as f:
+        distrs = json.load(f)
+    return params, distrs
+
+
+def test_morphology_to_arrays():
+    seeds = np.random.SeedSequence(0).spawn(1)
+    grower = NeuronGrower(PARAMS, DISTRS, rng_or_seed=seeds[0])
+    neuron = grower.grow()
+
+    data, apical_sections = arrays.morphology_to_arrays(neuron, grower.apical_sections)
+    assert apical_sections == grower.apical_sections
+    assert len(data["offsets"]) == len(neuron.sections) + 1
+    assert not diff(arrays.arrays_to_morphology(data), neuron)
+
+
+def test_synthesize_population_serial(inputs):
+    params, distrs = inputs
+    cells = list(synthesize_population(params, distrs, 3, workers=1, seed=42))
+
+    assert [cell_id for cell_id, _, _ in cells] == [0, 1, 2]
+    seeds = np.random.SeedSequence(42).spawn(3)
+    for (_, neuron, apical_sections), seed in zip(cells, seeds):
+        grower = NeuronGrower(params, distrs, rng_or_seed=seed)
+        assert not diff(neuron, grower.grow())
+        assert apical_sections == grower.apical_sections
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_synthesize_population_pool(ordered):
+    expected = {
+        cell_id: (neuron, apical_sections)
+        for cell_id, neuron, apical_sections in synthesize_population(
+            PARAMS, DISTRS, 3, workers=1, seed=42
+        )
+    }
+    cells = list(synthesize_population(PARAMS, DISTRS, 3, workers=2, ordered=ordered, seed=42))
+
+    if ordered:
+        assert [cell_id for cell_id, _, _ in cells] == [0, 1, 2]
+    assert sorted(cell_id for cell_id, _, _ in cells) == [0, 1, 2]
+    for cell_id, neuron, apical_sections in cells:
+        assert not diff(neuron, expected[cell_id][0])
+        assert apical_sections == expected[cell_id][1]
+
+
+def test_synthesize_population_invalid_inputs(inputs):
+    params, distrs = inputs
+    params["basal_dendrite"]["metric"] = "radial_distances"
+    with pytest.raises(ValueError, match="Metric of parameters and distributions is inconsistent"):
+        next(synthesize_population(params, distrs, 1, workers=1))
+
+
+def test_synthesize_population_shards():
+    cells = {
+        cell_id: neuron
+        for cell_id, neuron, _ in synthesize_population(PARAMS, DISTRS, 4, workers=1, seed=42)
+    }
+
+    # Synthesizing the population by shards gives the same cells
+    for shard in [[2, 3], [1, 0]]:
+        for cell_id, neuron, _ in synthesize_population(
+            PARAMS, DISTRS, shard, workers=1, seed=PopulationSeeds(42)
+        ):
+            assert not diff(neuron, cells[cell_id])
+
+
+def test_synthesize_population_prepared_inputs(inputs):
+    params, distrs = inputs
+    prepared = PreparedInputs(params, distrs)
+    expected = list(synthesize_population(params, distrs, 2, workers=1, seed=42))
+
+    for (cell_id, neuron, _), (expected_id, expected_neuron, _) in zip(
+        synthesize_population(prepared, None, 2, workers=1, seed=42), expected
+    ):
+        assert cell_id == expected_id
+        assert not diff(neuron, expected_neuron)
+
+    with pytest.raises(ValueError, match="The 'input_distributions' argument must be None"):
+        next(synthesize_population(prepared, distrs, 2, workers=1))
@@ -0,0 +1,151 @@
+"""Test neurots.population.manifest code."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=missing-function-docstring
+import json
+from pathlib import Path
+
+import morphio
+import pytest
+from morph_tool import diff
+
+from neurots import synthesize_population
+from neurots.population import ContainerWriter
+from neurots.population import PopulationSeeds
+from neurots.population import RunManifest
+from neurots.population import write_population
+
+DATA = Path(__file__).parent / "data"
+PARAMS = DATA / "bio_path_params.json"
+DISTRS = DATA / "bio_path_distribution.json"
+
+
+def test_run_manifest(tmpdir):
+    path = Path(tmpdir) / "manifest.jsonl"
+    manifest = RunManifest(path, seed=42)
+    assert manifest.seeds.entropy == 42
+    assert manifest.remaining(4) == [0, 1, 2, 3]
+
+    manifest.record([1, 3])
+    manifest.record([3])
+    assert manifest.is_completed(1)
+    assert not manifest.is_completed(0)
+    assert manifest.remaining(4) == [0, 2]
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert records == [
+        {"entropy": 42, "spawn_key": [], "pool_size": 4},
+        {"cell_id": 1, "spawn_key": [1]},
+        {"cell_id": 3, "spawn_key": [3]},
+    ]
+
+    # Resume with the same seed or with the seed stored in the manifest
+    for seed in [42, None, PopulationSeeds(42)]:
+        resumed = RunManifest(path, seed=seed)
+        assert resumed.seeds.entropy == 42
+        assert resumed.remaining([0, 1, 2, 3, 4]) == [0, 2, 4]
+
+    with pytest.raises(ValueError, match="The seed 0 does not match the seed 42"):
+        RunManifest(path, seed=0)
+
+    # Without seed, the entropy is taken from the OS and stored
+    other_path = Path(tmpdir) / "other_manifest.jsonl"
+    entropy = RunManifest(other_path).seeds.entropy
+    assert RunManifest(other_path).seeds.entropy == entropy
+
+
+def test_run_manifest_incomplete(tmpdir):
+    path = Path(tmpdir) / "manifest.jsonl"
+    RunManifest(path, seed=42).record([0, 1])
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"cell_id": 2, "spa')
+
+    manifest = RunManifest(path)
+    assert manifest.completed == {0, 1}
+    manifest.record([2])
+    assert RunManifest(path).completed == {0, 1, 2}
+
+
+def test_run_manifest_errors(tmpdir):
+    path = Path(tmpdir) / "manifest.jsonl"
+    path.write_text('{"entropy": 4', encoding="utf-8")
+    with pytest.raises(ValueError, match="has no valid header"):
+        RunManifest(path)
+
+    path.write_text(
+        '{"entropy": 42, "spawn_key": [], "pool_size": 4}\n{"cell_id"\n{"cell_id": 1}\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="is corrupted"):
+        RunManifest(path)
+
+    path.write_text(
+        '{"entropy": 42, "spawn_key": [], "pool_size": 4}\n{"cell_id": 1, "spawn_key": [2]}\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="The spawn key of the cell 1"):
+        RunManifest(path)
+
+
+def _interrupt(cells, n):
+    for i, cell in enumerate(cells):
+        if i == n:
+            raise KeyboardInterrupt
+        yield cell
+
+
+@pytest.mark.parametrize("max_queue_size", [None, 2])
+def test_resume_population(tmpdir, max_queue_size):
+    manifest_path = Path(tmpdir) / "manifest.jsonl"
+    path = Path(tmpdir) / "cells.h5"
+    n_cells = 5
+
+    # The run is interrupted after 3 cells and the manifest is updated every 2 cells
+    manifest = RunManifest(manifest_path, seed=0)
+    cells = synthesize_population(PARAMS, DISTRS, manifest.remaining(n_cells), workers=1, seed=0)
+    with pytest.raises(KeyboardInterrupt):
+        with ContainerWriter(path, batch_size=2) as writer:
+            write_population(
+                _interrupt(cells, 3),
+                writer,
+                max_queue_size=max_queue_size,
+                manifest=manifest,
+                checkpoint_interval=2,
+            )
+
+    # The cell 2 was written after the last checkpoint so it is grown again
+    manifest = RunManifest(manifest_path)
+    assert manifest.remaining(n_cells) == [2, 3, 4]
+    cells = synthesize_population(
+        PARAMS, DISTRS, manifest.remaining(n_cells), workers=1, seed=manifest.seeds
+    )
+    with ContainerWriter(path) as writer:
+        apical_sections = write_population(
+            cells, writer, max_queue_size=max_queue_size, manifest=manifest
+        )
+    assert list(apical_sections) == [2, 3, 4]
+    assert not RunManifest(manifest_path).remaining(n_cells)
+
+    collection = morphio.Collection(str(path))
+    for cell_id, neuron, _ in synthesize_population(PARAMS, DISTRS, n_cells, workers=1, seed=0):
+        assert not diff(collection.load(str(cell_id)), neuron)
+
+
+def test_resume_population_truncated_container(tmpdir):
+    manifest_path = Path(tmpdir) / "manifest.jsonl"
+    path = Path(tmpdir) / "cells.h5"
+    manifest = RunManifest(manifest_path, seed=0)
+    with ContainerWriter(path) as writer:
+        write_population(
+            synthesize_population(PARAMS, DISTRS, 2, workers=1, seed=0), writer, manifest=manifest
+        )
+
+    # A container opened with the mode 'w' lost the completed cells so it can not be resumed
+    manifest = RunManifest(manifest_path)
+    with ContainerWriter(path, mode="w") as writer:
+        with pytest.raises(ValueError, match="was opened with the mode 'w'"):
+            write_population(iter([]), writer, manifest=manifest)
+    assert manifest.remaining(3) == [2]
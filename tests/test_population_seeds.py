@@ -0,0 +1,72 @@
+"""Test neurots.population.seeds code."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=missing-function-docstring
+from pathlib import Path
+
+import numpy as np
+import pytest
+from morph_tool import diff
+from numpy.testing import assert_array_equal
+
+from neurots import NeuronGrower
+from neurots.population.seeds import PopulationSeeds
+
+DATA = Path(__file__).parent / "data"
+
+
+def test_cell_seed():
+    seeds = PopulationSeeds(42)
+    spawned = np.random.SeedSequence(42).spawn(10)
+
+    # The seed of a cell can be computed directly from its ID in any order
+    for cell_id in [9, 0, 5]:
+        assert_array_equal(
+            seeds.cell_seed(cell_id).generate_state(4), spawned[cell_id].generate_state(4)
+        )
+    assert seeds.entropy == 42
+
+    with pytest.raises(ValueError, match="The cell ID must be a non-negative integer"):
+        seeds.cell_seed(-1)
+
+
+def test_constructor():
+    seeds = PopulationSeeds()
+    assert seeds.entropy is not None
+
+    # The population can be reproduced from its entropy
+    for other in [
+        PopulationSeeds(seeds.entropy),
+        PopulationSeeds(seeds),
+        PopulationSeeds(np.random.SeedSequence(seeds.entropy)),
+    ]:
+        assert_array_equal(
+            other.cell_seed(3).generate_state(4), seeds.cell_seed(3).generate_state(4)
+        )
+
+    # Seeds spawned from a child sequence are independent
+    child = np.random.SeedSequence(42).spawn(1)[0]
+    assert PopulationSeeds(child).cell_seed(0).spawn_key == (0, 0)
+
+
+def test_cell_rng():
+    seeds = PopulationSeeds(42)
+    assert seeds.cell_rng(1).random() == seeds.cell_rng(1).random()
+    assert seeds.cell_rng(1).random() != seeds.cell_rng(2).random()
+
+
+def test_neuron_grower():
+    seeds = PopulationSeeds(0)
+    neurons = [
+        NeuronGrower(
+            DATA / "bio_path_params.json",
+            DATA / "bio_path_distribution.json",
+            rng_or_seed=seeds.cell_seed(cell_id),
+        ).grow()
+        for cell_id in [1, 0, 1]
+    ]
+    assert not diff(neurons[0], neurons[2])
+    assert diff(neurons[0], neurons[1])
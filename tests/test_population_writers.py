@@ -0,0 +1,183 @@
+"""Test neurots.population.writers code."""
+
+# Copyright (C) 2021-2024  Blue Brain Project, EPFL
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import threading
+import time
+from pathlib import Path
+
+import h5py
+import morphio
+import numpy as np
+import pytest
+from morph_tool import diff
+
+from neurots import NeuronGrower
+from neurots import synthesize_population
+from neurots.population import writers
+
+DATA = Path(__file__).parent / "data"
+PARAMS = DATA / "bio_path_params.json"
+DISTRS = DATA / "bio_path_distribution.json"
+
+
+def _grow(seed):
+    return NeuronGrower(PARAMS, DISTRS, rng_or_seed=seed).grow()
+
+
+def test_morphology_to_h5_arrays(tmpdir):
+    neuron = _grow(0)
+    neuron.write(str(tmpdir / "neuron.h5"))
+    points, structure = writers.morphology_to_h5_arrays(neuron)
+
+    with h5py.File(tmpdir / "neuron.h5", "r") as f:
+        np.testing.assert_array_equal(points, f["points"][:])
+        np.testing.assert_array_equal(structure, f["structure"][:])
+    assert points.dtype == np.float32
+    assert structure.dtype == np.int32
+
+
+def test_morphology_to_h5_arrays_no_soma():
+    neuron = morphio.mut.Morphology()
+    section = neuron.append_root_section(
+        morphio.PointLevel([[0, 0, 0], [1, 0, 0]], [1, 1]), morphio.SectionType.axon
+    )
+    section.append_section(morphio.PointLevel([[1, 0, 0], [2, 0, 0]], [1, 1]))
+    points, structure = writers.morphology_to_h5_arrays(neuron)
+
+    assert points.shape == (4, 4)
+    np.testing.assert_array_equal(structure, [[0, 2, -1], [2, 2, 0]])
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 10])
+def test_container_writer(tmpdir, batch_size):
+    path = Path(tmpdir) / "cells.h5"
+    neurons = [_grow(seed) for seed in range(3)]
+    with writers.ContainerWriter(path, batch_size=batch_size) as writer:
+        for i, neuron in enumerate(neurons):
+            writer.write(f"cell_{i}", neuron)
+
+    with h5py.File(path, "r") as f:
+        assert sorted(f.keys()) == ["cell_0", "cell_1", "cell_2"]
+
+    collection = morphio.Collection(str(path))
+    for i, neuron in enumerate(neurons):
+        assert not diff(collection.load(f"cell_{i}"), neuron)
+    del collection
+
+    # Add cells to an existing container
+    with writers.ContainerWriter(path, batch_size=batch_size, mode="a") as writer:
+        writer.write("cell_3", neurons[0])
+    assert not diff(morphio.Collection(str(path)).load("cell_3"), neurons[0])
+
+
+def test_container_writer_errors(tmpdir):
+    with pytest.raises(ValueError, match="The batch size must be a positive integer"):
+        writers.ContainerWriter(Path(tmpdir) / "cells.h5", batch_size=0)
+
+    writer = writers.ContainerWriter(Path(tmpdir) / "cells.h5")
+    writer.close()
+    writer.close()
+    with pytest.raises(ValueError, match="is closed"):
+        writer.write("cell", _grow(0))
+
+
+@pytest.mark.parametrize("extension", ["h5", ".swc", "asc"])
+def test_directory_writer(tmpdir, extension):
+    output_dir = Path(tmpdir) / "cells"
+    neuron = _grow(0)
+    with writers.DirectoryWriter(output_dir, extension=extension) as writer:
+        writer.write("cell_0", neuron)
+
+    path = output_dir / f"cell_0.{extension.lstrip('.')}"
+    assert not diff(path, neuron)
+
+
+def test_write_population(tmpdir):
+    path = Path(tmpdir) / "cells.h5"
+    cells = synthesize_population(PARAMS, DISTRS, [1, 3], workers=1, seed=0)
+    with writers.ContainerWriter(path, batch_size=1) as writer:
+        apical_sections = writers.write_population(cells, writer, name_format="cell_{}")
+
+    assert list(apical_sections) == [1, 3]
+    collection = morphio.Collection(str(path))
+    for cell_id, neuron, _ in synthesize_population(PARAMS, DISTRS, [1, 3], workers=1, seed=0):
+        assert not diff(collection.load(f"cell_{cell_id}"), neuron)
+
+
+class _SlowWriter:
+    """A writer that waits for an event before writing each cell."""
+
+    def __init__(self, fail_on=None):
+        self.names = []
+        self.fail_on = fail_on
+        self.event = threading.Event()
+
+    def write(self, name, _):
+        self.event.wait()
+        if name == self.fail_on:
+            raise OSError(f"Can not write {name}")
+        self.names.append(name)
+
+
+def test_background_writer():
+    writer = _SlowWriter()
+    background_writer = writers.BackgroundWriter(writer, max_queue_size=2)
+
+    # The first cell is consumed by the thread, the 2 next ones fill the queue
+    background_writer.write("cell_0", None)
+    while not background_writer._queue.empty():
+        time.sleep(0.01)
+    for i in range(1, 3):
+        background_writer.write(f"cell_{i}", None)
+    thread = threading.Thread(target=background_writer.write, args=("cell_3", None))
+    thread.start()
+    thread.join(0.2)
+    assert thread.is_alive()
+    assert not writer.names
+
+    writer.event.set()
+    thread.join()
+    background_writer.close()
+    background_writer.close()
+    assert writer.names == [f"cell_{i}" for i in range(4)]
+
+    with pytest.raises(ValueError, match="The background writer is closed"):
+        background_writer.write("cell_4", None)
+
+
+def test_background_writer_errors():
+    with pytest.raises(ValueError, match="The maximum queue size must be a positive integer"):
+        writers.BackgroundWriter(_SlowWriter(), max_queue_size=0)
+
+    writer = _SlowWriter(fail_on="cell_1")
+    writer.event.set()
+    with pytest.raises(OSError, match="Can not write cell_1"):
+        with writers.BackgroundWriter(writer) as background_writer:
+            for i in range(3):
+                background_writer.write(f"cell_{i}", None)
+    assert writer.names == ["cell_0"]
+
+    writer = _SlowWriter(fail_on="cell_1")
+    writer.event.set()
+    background_writer = writers.BackgroundWriter(writer)
+    background_writer.write("cell_1", None)
+    background_writer._thread.join(0.1)
+    with pytest.raises(OSError, match="Can not write cell_1"):
+        background_writer.write("cell_2", None)
+    background_writer.close()
+    assert not writer.names
+
+
+def test_write_population_background(tmpdir):
+    cells = list(synthesize_population(PARAMS, DISTRS, 3, workers=1, seed=0))
+    with writers.DirectoryWriter(Path(tmpdir), extension="h5") as writer:
+        apical_sections = writers.write_population(cells, writer, max_queue_size=1)
+
+    assert list(apical_sections) == [0, 1, 2]
+    for cell_id, neuron, _ in cells:
+        assert not diff(Path(tmpdir) / f"{cell_id}.h5", neuron)
@@ -120,6 +120,54 @@ def test_Distr():
     assert_equal(soma_d.draw_positive(), 5.535798297559666)
 
 
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"norm": {"mean": 1, "std": 2}},
+        {"uniform": {"min": -50, "max": 10}},
+        {"uniform": {"min": 3, "max": 3}},
+        {"expon": {"loc": -1, "lambda": 2}},
+        {"data": {"weights": [0.1, 0.2, 0.7], "bins": [1, 2, 3]}},
+    ],
+)
+def test_draw_positive_block(params):
+    distr = sample.Distr(params, random_generator=np.random.default_rng(0))
+    values = distr.draw_positive_block(1000)
+    assert 0 < len(values) <= 1000
+    assert (values > 0).all()
+
+    # The block values follow the same distribution as the ones drawn one at a time
+    distr = sample.Distr(params, random_generator=np.random.default_rng(1))
+    expected = [distr.draw_positive() for _ in range(len(values))]
+    assert np.mean(values) == pytest.approx(np.mean(expected), rel=0.1)
+
+
+def test_buffered_sampler():
+    distr = sample.Distr(
+        {"uniform": {"min": -1, "max": 1}}, random_generator=np.random.default_rng(0)
+    )
+    sampler = sample.BufferedSampler(distr, np.random.default_rng(0), block_size=4)
+
+    step_sizes = [sampler.step_size() for _ in range(10)]
+    assert all(0 < step_size <= 1 for step_size in step_sizes)
+    assert len(set(step_sizes)) == 10
+
+    directions = np.array([sampler.random_direction() for _ in range(10)])
+    np.testing.assert_allclose(np.linalg.norm(directions, axis=1), 1)
+    assert len(np.unique(directions, axis=0)) == 10
+
+    # The sampler is reproducible
+    distr = sample.Distr(
+        {"uniform": {"min": -1, "max": 1}}, random_generator=np.random.default_rng(0)
+    )
+    other = sample.BufferedSampler(distr, np.random.default_rng(0), block_size=4)
+    assert_equal([other.step_size() for _ in range(10)], step_sizes)
+    assert_equal([other.random_direction() for _ in range(10)], directions)
+
+    with pytest.raises(ValueError, match="The block size must be a positive integer"):
+        sample.BufferedSampler(distr, block_size=0)
+
+
 def test_soma_size():
     np.random.seed(0)
     rng = np.random.default_rng(0)
@@ -4,8 +4,10 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import copy
 import json
 import os
+import pickle
 
 import numpy as np
 import pytest
@@ -14,6 +16,7 @@ from numpy.testing import assert_array_equal
 from numpy.testing import assert_equal
 
 from neurots.generate.algorithms.barcode import Barcode
+from neurots.generate.algorithms.barcode import BarcodeTemplates
 from neurots.generate.algorithms.common import TMDStop
 from neurots.generate.algorithms.common import checks_bif_term
 from neurots.utils import NeuroTSError
@@ -55,6 +58,77 @@ def test_barcode():
     assert_array_almost_equal(barcode_test.min_term(), (1, 204.0442))
 
 
+def test_barcode_queries():
+    """Tests the queries and removals of the bars of a barcode"""
+    ph_angles = [
+        [10.0, 0.0, 0, 0, 0, 0],
+        [4.0, 2.0, 0, 0, 0, 0],
+        [6.0, 1.0, 0, 0, 0, 0],
+        [4.0, 3.0, 0, 0, 0, 0],
+        [9.0, 2.0, 0, 0, 0, 0],
+    ]
+    barcode_test = Barcode(ph_angles)
+
+    # The bars are sorted by bifurcation, the ties being kept in the input order
+    assert list(barcode_test.bifs.items()) == [(1, 1.0), (2, 2.0), (3, 2.0), (4, 3.0)]
+    assert list(barcode_test.terms.items()) == [(2, 4.0), (4, 4.0), (1, 6.0), (3, 9.0), (0, 10.0)]
+    assert 0 not in barcode_test.bifs
+    assert None not in barcode_test.bifs
+    assert 5 not in barcode_test.terms
+
+    assert barcode_test.min_bif(bif_above=1.5) == (2, 2.0)
+    assert barcode_test.min_bif(bif_above=1.5, bif_below=1.9) == (None, np.inf)
+    assert barcode_test.min_term(term_above=5) == (1, 6.0)
+    assert barcode_test.select_compatible_bif(1.5, 3, 5, 10) == (3, 2.0)
+
+    barcode_test.remove_bif(2)
+    barcode_test.remove_term(3)
+    assert barcode_test.min_bif(bif_above=1.5) == (3, 2.0)
+    assert barcode_test.select_compatible_bif(1.5, 3, 5, 10) == (None, np.inf)
+    assert barcode_test.select_compatible_bif(1.5, 3, -np.inf, 10) == (3, 2.0)
+    assert len(barcode_test.bifs) == 3
+    with pytest.raises(KeyError):
+        barcode_test.remove_bif(2)
+    with pytest.raises(KeyError):
+        barcode_test.bifs[2]  # pylint: disable=pointless-statement
+
+    for bar_id in [0, 1, 2, 4]:
+        barcode_test.remove_term(bar_id)
+    assert not barcode_test.terms
+    assert barcode_test.min_term() == (None, 0)
+    with pytest.raises(StopIteration):
+        barcode_test.max_term()
+
+
+def test_barcode_templates():
+    """Tests the copies of the barcode templates"""
+    templates = BarcodeTemplates()
+    ph_angles = [[10.0, 0.0, 0, 0, 0, 0], [6.0, 2.0, 0, 0, 0, 0], [4.0, 1.0, 0, 0, 0, 0]]
+
+    barcode_1 = templates.barcode(ph_angles)
+    barcode_2 = templates.barcode(ph_angles)
+    assert ph_angles[1][1] == 2.0
+    assert list(barcode_1.bifs.items()) == list(Barcode(list(ph_angles)).bifs.items())
+    assert list(barcode_1.terms.items()) == list(Barcode(list(ph_angles)).terms.items())
+    assert len(templates) == 1
+
+    # The copies are independent
+    barcode_1.remove_bif(1)
+    barcode_1.remove_term(1)
+    assert barcode_1.min_term() == (2, 6.0)
+    assert barcode_1.min_bif() == (2, 2.0)
+    assert barcode_2.min_bif() == (1, 1.0)
+    assert barcode_2.min_term() == (1, 4.0)
+    assert templates.barcode(ph_angles).min_term() == (1, 4.0)
+
+    # An equal diagram is a different object so it gets its own template
+    templates.barcode(copy.deepcopy(ph_angles))
+    assert len(templates) == 2
+
+    # The templates are not pickled
+    assert len(pickle.loads(pickle.dumps(templates))) == 0
+
+
 def test_barcode_validate_persistence():
     """Tests the barcode functionality"""
 
@@ -98,25 +172,33 @@ def test_TMDStop():
     # Comparison should fail for other object
     assert tmd_stop != 10
 
-    tmd_stop.update_bif(0, 11.0)
-    assert_equal(tmd_stop.bif_id, 0)
-    assert_equal(tmd_stop.bif, 11.0)
+    # The stop criteria are immutable
+    with pytest.raises(AttributeError):
+        tmd_stop.bif = 11.0
 
-    tmd_stop.update_term(10, 110.0)
+    new_stop = tmd_stop.with_bif(0, 11.0)
+    assert_equal(new_stop.bif_id, 0)
+    assert_equal(new_stop.bif, 11.0)
+    assert_equal(tmd_stop.bif_id, 1)
+    assert_equal(tmd_stop.bif, 26.3027)
+    tmd_stop = new_stop
+
+    tmd_stop = tmd_stop.with_term(10, 110.0)
     assert_equal(tmd_stop.term_id, 10)
     assert_equal(tmd_stop.term, 110.0)
+    assert_equal(tmd_stop.bif, 11.0)
 
     assert tmd_stop.verify()
     assert_equal(tmd_stop.expected_bifurcation_length(), 1)
 
-    tmd_stop.bif = np.inf
+    tmd_stop = tmd_stop._replace(bif=np.inf)
     assert tmd_stop.verify()
     assert_equal(tmd_stop.expected_bifurcation_length(), 0)
 
-    tmd_stop.ref = 99999
+    tmd_stop = tmd_stop._replace(ref=99999)
     assert not tmd_stop.verify()
 
-    tmd_stop.term = np.inf
+    tmd_stop = tmd_stop._replace(term=np.inf)
     assert_equal(tmd_stop.expected_termination_length(), 0)
 
     with open(os.path.join(_PATH, "dummy_distribution.json"), encoding="utf-8") as f:
@@ -132,3 +214,24 @@ def test_TMDStop():
     child_stop = TMDStop(1, 26.3027, 999999, 5, 10.0)
     with pytest.raises(NeuroTSError):
         barcode_test.curate_stop_criterion(parent_stop, child_stop)
+
+
+def test_TMDStop_update():
+    """Test the deprecated update methods of the TMDStop class"""
+    tmd_stop = TMDStop(1, 26.3027, 0, 633.5966, 10.0)
+
+    with pytest.warns(DeprecationWarning, match="with_bif"):
+        new_stop = tmd_stop.update_bif(0, 11.0)
+    assert_equal(new_stop.bif_id, 0)
+    assert_equal(new_stop.bif, 11.0)
+    assert new_stop == tmd_stop.with_bif(0, 11.0)
+
+    with pytest.warns(DeprecationWarning, match="with_term"):
+        new_stop = new_stop.update_term(10, 110.0)
+    assert_equal(new_stop.term_id, 10)
+    assert_equal(new_stop.term, 110.0)
+    assert_equal(new_stop.bif, 11.0)
+
+    # The stop criteria are not updated in place
+    assert_equal(tmd_stop.bif_id, 1)
+    assert_equal(tmd_stop.term_id, 0)
@@ -15,6 +15,7 @@ import pytest
 from morphio import Morphology
 
 from neurots import utils
+from neurots.generate.stats import GrowthStats
 
 DATA = Path(__file__).parent / "data"
 
@@ -132,3 +133,17 @@ def test_accept_reject():
     # check if we attain max_tries we return random
     val = utils.accept_reject(propose_null, prob, rng)
     assert val == 0.0
+
+
+def test_accept_reject_stats():
+    rng = np.random.default_rng(42)
+    proposals = iter([0.0, 0.0, 1.0])
+    stats = GrowthStats()
+    with stats.activate():
+        val = utils.accept_reject(lambda _: next(proposals), lambda x: x, rng)
+        assert val == 1.0
+        utils.accept_reject(lambda _: 0.0, lambda x: x, rng, max_tries=10)
+    utils.accept_reject(lambda _: 0.0, lambda x: x, rng, max_tries=10)
+
+    assert stats.accept_reject_calls == 2
+    assert stats.accept_reject_tries == 13
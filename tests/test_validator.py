@@ -5,11 +5,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 # pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
 # pylint: disable=redefined-outer-name
 import json
 from pathlib import Path
 
+import numpy as np
 import pytest
+from mock import patch
 
 import neurots.validator as tested
 
@@ -110,3 +113,58 @@ def test_empty_params():
 def test_validate_neuron_distribs(dummy_distribs, interneuron_distribs):
     tested.validate_neuron_distribs(dummy_distribs)
     tested.validate_neuron_distribs(interneuron_distribs)
+
+
+def test_get_validator(dummy_params):
+    validator = tested.get_validator(tested.PARAMS_SCHEMA)
+    assert tested.get_validator(tested.PARAMS_SCHEMA) is validator
+    assert tested.get_validator(tested.DISTRIBS_SCHEMA) is not validator
+
+    # A copy of a schema gets its own validator
+    schema = json.loads(json.dumps(tested.PARAMS_SCHEMA))
+    assert tested.get_validator(schema) is not validator
+    tested.validate(dummy_params, schema)
+
+
+def test_validation_cache(dummy_params, dummy_distribs):
+    tested.set_validation_cache()
+    try:
+        tested.validate_neuron_params(dummy_params)
+        tested.validate_neuron_distribs(dummy_distribs)
+        assert len(tested._VALID_INSTANCES) == 2
+
+        # An object with the same content is not validated again
+        with patch.object(tested, "get_validator", side_effect=RuntimeError):
+            tested.validate_neuron_params(json.loads(json.dumps(dummy_params)))
+            with pytest.raises(RuntimeError):
+                tested.validate_neuron_params(dummy_params, use_cache=False)
+
+        # The hash depends on the schema
+        with patch.object(tested, "get_validator", side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                tested.validate(dummy_params, tested.DISTRIBS_SCHEMA)
+
+        # Invalid objects are not stored
+        dummy_params["grow_types"] = ["UNKNOWN TYPE"]
+        for _ in range(2):
+            with pytest.raises(tested.ValidationError):
+                tested.validate_neuron_params(dummy_params)
+        assert len(tested._VALID_INSTANCES) == 2
+
+        # Objects that can not be serialized are always validated
+        dummy_params["grow_types"] = []
+        dummy_params["unknown_param"] = object()
+        tested.validate_neuron_params(dummy_params)
+        assert len(tested._VALID_INSTANCES) == 2
+        dummy_params["unknown_param"] = np.arange(3)
+        tested.validate_neuron_params(dummy_params)
+        assert len(tested._VALID_INSTANCES) == 3
+
+        # Only the last objects are stored
+        with patch.object(tested, "MAX_CACHED_INSTANCES", 2):
+            dummy_params["unknown_param"] = 1
+            tested.validate_neuron_params(dummy_params)
+        assert len(tested._VALID_INSTANCES) == 2
+    finally:
+        tested.set_validation_cache(False)
+    assert len(tested._VALID_INSTANCES) == 0